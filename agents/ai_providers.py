@@ -6,12 +6,17 @@ Includes rate limiting and token budget management to prevent API quota exhausti
 """
 
 import os
+import re
 import json
 import asyncio
+import hashlib
 import random
 import time
+import weakref
+from urllib.parse import urlsplit, urlunsplit
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Callable, Tuple
 import aiohttp
 
 # Import config for API keys
@@ -21,6 +26,8 @@ try:
 except ImportError:
     HAS_CONFIG = False
 
+from agents.circuit_breaker import get_circuit_breaker
+
 # Import logger for tracking API usage
 try:
     from agents.agent_logger import log_ai_call
@@ -32,6 +39,9 @@ except ImportError:
 # Default timeout configuration for API calls
 DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=120, connect=30, sock_read=90)
 
+# Connection pool size for the shared HTTP session
+MAX_CONNECTIONS = 20
+
 # Retry configuration
 MAX_RETRIES = 3
 BASE_DELAY = 5  # seconds
@@ -119,19 +129,60 @@ class TokenBucketRateLimiter:
 # Global rate limiters (shared across all provider instances)
 _rate_limiters: Dict[str, TokenBucketRateLimiter] = {}
 
+
+def _get_rate_limit_backend() -> str:
+    """Rate limiter backend: 'memory' (per-process) or 'sqlite' (cross-process)"""
+    backend = os.environ.get("RATE_LIMIT_BACKEND")
+    if not backend and HAS_CONFIG:
+        backend = getattr(config, "RATE_LIMIT_BACKEND", None)
+    return (backend or "memory").lower()
+
+
+def _get_base_url_override() -> Optional[str]:
+    """Scheme/host that replaces every provider endpoint (e.g. a local mock server)"""
+    base_url = os.environ.get("LLM_BASE_URL")
+    if not base_url and HAS_CONFIG:
+        base_url = getattr(config, "LLM_BASE_URL", None)
+    return base_url or None
+
+
+def _apply_base_url_override(url: str) -> str:
+    """Point url at LLM_BASE_URL, keeping the provider-specific path"""
+    override = _get_base_url_override()
+    if not override:
+        return url
+    target = urlsplit(override)
+    parts = urlsplit(url)
+    return urlunsplit((target.scheme, target.netloc, parts.path, parts.query, parts.fragment))
+
+
+def _create_rate_limiter(tokens_per_minute: int, name: str):
+    """Create a limiter on the configured backend, falling back to in-memory"""
+    if _get_rate_limit_backend() == "sqlite":
+        db_path = os.environ.get("RATE_LIMIT_DB")
+        if not db_path and HAS_CONFIG:
+            db_path = getattr(config, "RATE_LIMIT_DB", None)
+        try:
+            from agents.shared_rate_limiter import SharedTokenBucketRateLimiter
+            return SharedTokenBucketRateLimiter(tokens_per_minute, name, db_path=db_path)
+        except Exception as e:
+            print(f"  [{name}] Shared rate limiter unavailable ({e}), using in-process limiter")
+    return TokenBucketRateLimiter(tokens_per_minute, name)
+
+
 def get_rate_limiter(provider_name: str) -> TokenBucketRateLimiter:
     """Get or create a rate limiter for a provider"""
     if provider_name not in _rate_limiters:
         if provider_name == "GPT":
-            _rate_limiters[provider_name] = TokenBucketRateLimiter(OPENAI_TPM_LIMIT, "OpenAI")
+            _rate_limiters[provider_name] = _create_rate_limiter(OPENAI_TPM_LIMIT, "OpenAI")
         elif provider_name == "Gemini":
             # Gemini uses RPM, so we use a high token count per "request"
-            _rate_limiters[provider_name] = TokenBucketRateLimiter(GEMINI_RPM_LIMIT * 5000, "Gemini")
+            _rate_limiters[provider_name] = _create_rate_limiter(GEMINI_RPM_LIMIT * 5000, "Gemini")
         elif provider_name == "Grok":
-            _rate_limiters[provider_name] = TokenBucketRateLimiter(GROK_TPM_LIMIT, "Grok")
+            _rate_limiters[provider_name] = _create_rate_limiter(GROK_TPM_LIMIT, "Grok")
         else:
             # Default generous limit for other providers
-            _rate_limiters[provider_name] = TokenBucketRateLimiter(100000, provider_name)
+            _rate_limiters[provider_name] = _create_rate_limiter(100000, provider_name)
     return _rate_limiters[provider_name]
 
 
@@ -148,7 +199,10 @@ def estimate_tokens(prompt: str, system_prompt: str = None, max_output: int = 40
 
 
 async def retry_with_backoff(func, max_retries=MAX_RETRIES, base_delay=BASE_DELAY):
-    """Retry a function with exponential backoff for rate limits"""
+    """
+    Retry a function with exponential backoff for rate limits.
+    Honours "try again in X.Xs" hints in the error message when present.
+    """
     last_exception = None
     for attempt in range(max_retries):
         try:
@@ -159,7 +213,7 @@ async def retry_with_backoff(func, max_retries=MAX_RETRIES, base_delay=BASE_DELA
 
             # Check if it's a rate limit error (retry) or other error (don't retry)
             is_rate_limit = any(x in error_str for x in [
-                'rate_limit', 'resource_exhausted', '429', 'too many requests',
+                'rate_limit', 'rate limit', 'resource_exhausted', '429', 'too many requests',
                 'tokens per min', 'quota', 'timeout'
             ])
 
@@ -168,7 +222,14 @@ async def retry_with_backoff(func, max_retries=MAX_RETRIES, base_delay=BASE_DELA
 
             if attempt < max_retries - 1:
                 # Exponential backoff with jitter
-                delay = min(base_delay * (2 ** attempt) + random.uniform(0, 1), MAX_DELAY)
+                delay = base_delay * (2 ** attempt) + random.uniform(0, 1)
+
+                # Look for "Please try again in X.Xs" pattern
+                retry_match = re.search(r'try again in ([\d.]+)s', error_str)
+                if retry_match:
+                    delay = max(delay, float(retry_match.group(1)) + 0.5)
+
+                delay = min(delay, MAX_DELAY)
                 print(f"  Rate limited, retrying in {delay:.1f}s (attempt {attempt + 1}/{max_retries})...")
                 await asyncio.sleep(delay)
             else:
@@ -176,288 +237,626 @@ async def retry_with_backoff(func, max_retries=MAX_RETRIES, base_delay=BASE_DELA
     raise last_exception
 
 
+# Pooled HTTP sessions, one per event loop (aiohttp sessions are loop-bound)
+_client_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+
+
+def get_client_session() -> aiohttp.ClientSession:
+    """
+    Get the shared aiohttp session for the running event loop.
+
+    Reusing one session keeps TCP/TLS connections alive between calls
+    instead of paying a fresh handshake for every request.
+    """
+    loop = asyncio.get_running_loop()
+    session = _client_sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS, ttl_dns_cache=300)
+        session = aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT, connector=connector)
+        _client_sessions[loop] = session
+    return session
+
+
+async def close_client_sessions():
+    """Close the pooled session for the running event loop (call before the loop exits)"""
+    loop = asyncio.get_running_loop()
+    session = _client_sessions.pop(loop, None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+@dataclass
+class GenerationResult:
+    """Text and usage accounting for a single provider call"""
+    text: str
+    provider: str
+    model: str
+    tokens_in: int = 0
+    tokens_out: int = 0
+    cached_tokens: int = 0            # input tokens served from the provider's prompt cache
+    latency: float = 0.0              # seconds, request sent -> last byte
+    time_to_first_token: float = 0.0  # seconds, request sent -> first content
+    streamed: bool = False
+
+
+@dataclass
+class ProviderUsage:
+    """Cumulative usage for one provider across every caller in this process"""
+    calls: int = 0
+    errors: int = 0
+    tokens_in: int = 0
+    tokens_out: int = 0
+    cached_tokens: int = 0
+    total_latency: float = 0.0
+    total_ttft: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "tokens_in": self.tokens_in,
+            "tokens_out": self.tokens_out,
+            "cached_tokens": self.cached_tokens,
+            "cache_hit_rate": round(self.cached_tokens / self.tokens_in, 3) if self.tokens_in else 0.0,
+            "avg_latency": round(self.total_latency / self.calls, 2) if self.calls else 0.0,
+            "avg_ttft": round(self.total_ttft / self.calls, 2) if self.calls else 0.0
+        }
+
+
+# Global usage accounting (shared across all provider instances)
+_provider_usage: Dict[str, ProviderUsage] = {}
+
+
+def _record_usage(provider_name: str, result: GenerationResult = None):
+    """Add one call (result=None for a failed call) to the usage totals"""
+    usage = _provider_usage.setdefault(provider_name, ProviderUsage())
+    if result is None:
+        usage.errors += 1
+        return
+    usage.calls += 1
+    usage.tokens_in += result.tokens_in
+    usage.tokens_out += result.tokens_out
+    usage.cached_tokens += result.cached_tokens
+    usage.total_latency += result.latency
+    usage.total_ttft += result.time_to_first_token
+
+
+def get_provider_usage() -> Dict[str, Dict[str, Any]]:
+    """Get token and latency totals for every provider used in this process"""
+    return {name: usage.to_dict() for name, usage in _provider_usage.items()}
+
+
+class StreamAccumulator:
+    """
+    Incremental buffer for streamed responses.
+
+    Keeps a running length instead of re-summing fragments, and hands
+    on_delta(delta, total_length, is_final) only the text received since
+    the last emission, once at least emit_interval characters have built
+    up. Consumers never re-join the whole response mid-stream; the full
+    text is joined once, in finish().
+    """
+
+    def __init__(self, on_delta: Callable[[str, int, bool], None] = None, emit_interval: int = 0):
+        self.on_delta = on_delta
+        self.emit_interval = emit_interval
+        self.length = 0
+        self._parts: List[str] = []
+        self._pending_start = 0  # index of the first fragment not yet emitted
+        self._pending_len = 0
+
+    def append(self, fragment: str):
+        """Add a fragment, emitting a delta if enough text has built up"""
+        if not fragment:
+            return
+        self._parts.append(fragment)
+        self.length += len(fragment)
+        self._pending_len += len(fragment)
+        if self.on_delta and self._pending_len >= self.emit_interval:
+            self._emit(is_final=False)
+
+    def _emit(self, is_final: bool):
+        delta = "".join(self._parts[self._pending_start:])
+        self._pending_start = len(self._parts)
+        self._pending_len = 0
+        self.on_delta(delta, self.length, is_final)
+
+    def finish(self) -> str:
+        """Emit the remaining delta (marked final) and return the full text"""
+        if self.on_delta:
+            self._emit(is_final=True)
+        return "".join(self._parts)
+
+
 class AIProvider(ABC):
-    """Base class for AI providers"""
+    """
+    Base class for AI providers.
 
-    def __init__(self, api_key: str):
-        self.api_key = api_key
+    Subclasses only describe their wire format. Rate limiting, retries,
+    pooled HTTP sessions, streaming and usage accounting live here so the
+    YAML workflow and the agent hierarchy share the same controls.
 
-    @abstractmethod
-    async def generate(self, prompt: str, system_prompt: str = None) -> str:
-        pass
+    Requests are laid out as shared_prefix -> system_prompt -> prompt. Keeping
+    context that many calls have in common (e.g. the workflow task prompt) in
+    shared_prefix gives every request a byte-identical start, which is what
+    the automatic prompt caches of OpenAI, Gemini, xAI, DashScope and DeepSeek
+    key on.
+    """
+
+    DEFAULT_MODEL: str = None
+    provider_key = "unknown"   # canonical name (see PROVIDER_ALIASES)
+    log_name = "unknown"       # provider label in agent_logger
+    limiter_name: str = None   # key for get_rate_limiter
+    max_output_tokens = 4096
+
+    def __init__(self, api_key: str, model: str = None):
+        self.api_key = api_key
+        self.model = model or self.DEFAULT_MODEL
+        self.rate_limiter = get_rate_limiter(self.limiter_name or self.name)
 
     @property
     @abstractmethod
     def name(self) -> str:
         pass
 
+    @abstractmethod
+    def _build_request(self, model: str, prompt: str, system_prompt: Optional[str], max_tokens: int,
+                       stream: bool, shared_prefix: Optional[str] = None) -> Tuple[str, Dict, Optional[Dict], Dict]:
+        """Return (url, headers, params, payload) for one call"""
+        pass
 
-class OpenAIProvider(AIProvider):
-    """OpenAI GPT Provider with rate limiting"""
+    @abstractmethod
+    def _parse_response(self, data: Dict) -> str:
+        """Return the text of a non-streaming response"""
+        pass
 
-    def __init__(self, api_key: str, model: str = "gpt-4o"):
-        super().__init__(api_key)
-        self.model = model
-        self.base_url = "https://api.openai.com/v1/chat/completions"
-        self.rate_limiter = get_rate_limiter("GPT")
+    @abstractmethod
+    def _parse_stream_chunk(self, data: Dict) -> str:
+        """Return the text delta carried by one SSE event"""
+        pass
 
-    @property
-    def name(self) -> str:
-        return "GPT"
+    @abstractmethod
+    def _parse_usage(self, data: Dict) -> Tuple[int, int, int]:
+        """Return (tokens_in, tokens_out, cached_tokens) from a response or SSE event (0 = not reported)"""
+        pass
 
-    async def generate(self, prompt: str, system_prompt: str = None, agent_id: str = None, agent_role: str = None, call_type: str = "generate") -> str:
-        # Estimate tokens and wait for rate limit clearance
-        estimated_tokens = estimate_tokens(prompt, system_prompt, max_output=4096)
-        await self.rate_limiter.wait_and_acquire(estimated_tokens)
+    def _models_to_try(self) -> List[str]:
+        """Models to attempt in order (subclasses may add fallbacks)"""
+        return [self.model]
 
-        # Track token usage for logging
-        actual_tokens_in = 0
-        actual_tokens_out = 0
+    def _on_model_used(self, model: str):
+        """Hook called with the model that served the request"""
+        pass
 
-        async def _call():
-            nonlocal actual_tokens_in, actual_tokens_out
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": prompt})
-
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
+    async def generate(self, prompt: str, system_prompt: str = None, agent_id: str = None,
+                       agent_role: str = None, call_type: str = "generate") -> str:
+        result = await self.generate_with_usage(prompt, system_prompt, agent_id=agent_id,
+                                                agent_role=agent_role, call_type=call_type)
+        return result.text
+
+    async def generate_with_usage(
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        agent_id: str = None,
+        agent_role: str = None,
+        call_type: str = "generate",
+        stream: bool = False,
+        on_delta: Callable[[str, int, bool], None] = None,
+        max_tokens: int = None,
+        shared_prefix: str = None,
+        delta_interval: int = 0
+    ) -> GenerationResult:
+        """
+        Generate a completion and return it with usage accounting.
 
-            payload = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": 0.7,
-                "max_tokens": 4096
-            }
+        Args:
+            stream: Use the provider's SSE streaming endpoint
+            on_delta: Called as on_delta(delta, total_length, is_final) while streaming
+                (see StreamAccumulator); the last call has is_final=True
+            max_tokens: Output token cap (defaults to max_output_tokens)
+            shared_prefix: Context common to many calls, sent first so it can be
+                served from the provider's prompt cache
+            delta_interval: Minimum characters between on_delta calls (0 = every fragment)
+        """
+        max_tokens = max_tokens or self.max_output_tokens
+        full_system = "\n\n".join(p for p in (shared_prefix, system_prompt) if p) or None
 
-            async with aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT) as session:
-                async with session.post(self.base_url, headers=headers, json=payload) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        # Report actual token usage if available
-                        if "usage" in data:
-                            actual_tokens_in = data["usage"].get("prompt_tokens", 0)
-                            actual_tokens_out = data["usage"].get("completion_tokens", 0)
-                            actual_tokens = data["usage"].get("total_tokens", estimated_tokens)
-                            self.rate_limiter.report_actual_usage(actual_tokens, estimated_tokens)
-                        return data["choices"][0]["message"]["content"]
-                    else:
-                        error = await resp.text()
-                        raise Exception(f"OpenAI API error: {error}")
+        # Estimate tokens and wait for rate limit clearance
+        estimated_tokens = estimate_tokens(prompt, full_system, max_output=max_tokens)
+        await self.rate_limiter.wait_and_acquire(estimated_tokens)
 
+        async def _call():
+            last_error = None
+            models = self._models_to_try()
+            for i, model in enumerate(models):
+                try:
+                    return await self._request(model, prompt, system_prompt, max_tokens,
+                                               stream, on_delta, shared_prefix, delta_interval)
+                except Exception as e:
+                    last_error = e
+                    if i + 1 < len(models):
+                        print(f"[{self.log_name}] Model {model} failed, falling back to {models[i + 1]}")
+            raise last_error
+
+        breaker = get_circuit_breaker(self.name)
+        breaker.record_start()
         try:
             result = await retry_with_backoff(_call)
-            # Log successful call
-            log_ai_call("openai", self.model, agent_id or "unknown", agent_role or "unknown",
-                       call_type, actual_tokens_in, actual_tokens_out, success=True)
-            return result
+        except asyncio.CancelledError:
+            breaker.record_cancel()
+            raise
         except Exception as e:
-            # Log failed call
-            log_ai_call("openai", self.model, agent_id or "unknown", agent_role or "unknown",
-                       call_type, estimated_tokens // 2, 0, success=False, error=str(e)[:200])
+            breaker.record_failure()
+            _record_usage(self.log_name)
+            log_ai_call(self.log_name, self.model, agent_id or "unknown", agent_role or "unknown",
+                        call_type, estimated_tokens // 2, 0, success=False, error=str(e)[:200])
             raise
 
+        breaker.record_success(result.latency)
+
+        if not (result.tokens_in or result.tokens_out):
+            # Provider did not report usage, fall back to estimates
+            result.tokens_in = estimate_tokens(prompt, full_system, max_output=0)
+            result.tokens_out = len(result.text) // 4
+        self.rate_limiter.report_actual_usage(result.tokens_in + result.tokens_out, estimated_tokens)
+
+        _record_usage(self.log_name, result)
+        log_ai_call(self.log_name, result.model, agent_id or "unknown", agent_role or "unknown",
+                    call_type, result.tokens_in, result.tokens_out, success=True)
+        return result
+
+    async def _request(self, model: str, prompt: str, system_prompt: Optional[str], max_tokens: int,
+                       stream: bool, on_delta: Optional[Callable[[str, int, bool], None]],
+                       shared_prefix: Optional[str] = None, delta_interval: int = 0) -> GenerationResult:
+        """Single HTTP call on the pooled session"""
+        url, headers, params, payload = self._build_request(model, prompt, system_prompt, max_tokens,
+                                                            stream, shared_prefix)
+        url = _apply_base_url_override(url)
+        session = get_client_session()
+        start = time.perf_counter()
+
+        async with session.post(url, headers=headers, params=params, json=payload) as resp:
+            if resp.status != 200:
+                error = await resp.text()
+                raise Exception(f"{self.name} API error ({resp.status}, {model}): {error}")
+
+            if not stream:
+                data = await resp.json()
+                text = self._parse_response(data)
+                tokens_in, tokens_out, cached_tokens = self._parse_usage(data)
+                latency = time.perf_counter() - start
+                self._on_model_used(model)
+                return GenerationResult(text, self.name, model, tokens_in, tokens_out, cached_tokens,
+                                        latency=latency, time_to_first_token=latency)
+
+            accumulator = StreamAccumulator(on_delta, emit_interval=delta_interval)
+            tokens_in = tokens_out = cached_tokens = 0
+            first_token_at = None
+
+            # Server-sent events: "data: {...}" lines, terminated by "data: [DONE]" on OpenAI-style APIs
+            async for raw_line in resp.content:
+                line = raw_line.decode("utf-8", errors="replace").strip()
+                if not line.startswith("data:"):
+                    continue
+                data_str = line[5:].strip()
+                if data_str == "[DONE]":
+                    break
+                try:
+                    chunk = json.loads(data_str)
+                except json.JSONDecodeError:
+                    continue
+
+                delta = self._parse_stream_chunk(chunk)
+                chunk_in, chunk_out, chunk_cached = self._parse_usage(chunk)
+                tokens_in = chunk_in or tokens_in
+                tokens_out = chunk_out or tokens_out
+                cached_tokens = chunk_cached or cached_tokens
+                if delta:
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    accumulator.append(delta)
+
+        end = time.perf_counter()
+        text = accumulator.finish()
+        self._on_model_used(model)
+        return GenerationResult(
+            text, self.name, model, tokens_in, tokens_out, cached_tokens,
+            latency=end - start,
+            time_to_first_token=(first_token_at or end) - start,
+            streamed=True
+        )
+
+
+class OpenAICompatibleProvider(AIProvider):
+    """Base for providers speaking the OpenAI chat/completions format"""
+
+    base_url: str = None
+
+    def _build_request(self, model, prompt, system_prompt, max_tokens, stream, shared_prefix=None):
+        messages = []
+        if shared_prefix:
+            # Separate leading message so the cacheable prefix ends where the node-specific part starts
+            messages.append({"role": "system", "content": shared_prefix})
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": 0.7,
+            "max_tokens": max_tokens
+        }
+        if stream:
+            payload["stream"] = True
+            payload["stream_options"] = {"include_usage": True}
+
+        return self.base_url, headers, None, payload
+
+    def _parse_response(self, data):
+        return data["choices"][0]["message"]["content"]
+
+    def _parse_stream_chunk(self, data):
+        # The final chunk carries usage and an empty choices list
+        choices = data.get("choices") or []
+        delta = (choices[0].get("delta") or {}).get("content") if choices else None
+        return delta or ""
+
+    def _parse_usage(self, data):
+        usage = data.get("usage") or {}
+        details = usage.get("prompt_tokens_details") or {}
+        # OpenAI/xAI/DashScope report prompt_tokens_details.cached_tokens, DeepSeek prompt_cache_hit_tokens
+        cached = details.get("cached_tokens") or usage.get("prompt_cache_hit_tokens") or 0
+        return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0), cached
+
+
+class OpenAIProvider(OpenAICompatibleProvider):
+    """OpenAI GPT Provider"""
+
+    DEFAULT_MODEL = "gpt-4o"
+    provider_key = "openai"
+    base_url = "https://api.openai.com/v1/chat/completions"
+    log_name = "openai"
+    limiter_name = "GPT"
+
+    @property
+    def name(self) -> str:
+        return "GPT"
+
 
 class GeminiProvider(AIProvider):
-    """Google Gemini Provider with rate limiting and model fallback"""
+    """Google Gemini Provider with model fallback"""
 
     # Model priority: try 2.5 first, fallback to 2.0
     MODELS = ["gemini-2.5-flash-preview-05-20", "gemini-2.0-flash"]
+    provider_key = "google"
+    log_name = "gemini"
+    limiter_name = "Gemini"
 
     def __init__(self, api_key: str, model: str = None):
-        super().__init__(api_key)
-        self.primary_model = model or self.MODELS[0]
+        super().__init__(api_key, model or self.MODELS[0])
+        self.primary_model = self.model
         self.fallback_model = self.MODELS[1] if self.primary_model == self.MODELS[0] else None
         self.current_model = self.primary_model
-        self.rate_limiter = get_rate_limiter("Gemini")
 
-    def _get_url(self, model: str) -> str:
-        return f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+    def _get_url(self, model: str, stream: bool = False) -> str:
+        method = "streamGenerateContent" if stream else "generateContent"
+        return f"https://generativelanguage.googleapis.com/v1beta/models/{model}:{method}"
 
     @property
     def name(self) -> str:
         return f"Gemini ({self.current_model})"
 
-    async def generate(self, prompt: str, system_prompt: str = None, agent_id: str = None, agent_role: str = None, call_type: str = "generate") -> str:
-        # Estimate tokens and wait for rate limit clearance
-        estimated_tokens = estimate_tokens(prompt, system_prompt, max_output=4096)
-        await self.rate_limiter.wait_and_acquire(estimated_tokens)
+    def _models_to_try(self) -> List[str]:
+        return [m for m in (self.primary_model, self.fallback_model) if m]
 
-        async def _call_with_model(model: str):
-            full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+    def _on_model_used(self, model: str):
+        self.current_model = model
 
-            headers = {"Content-Type": "application/json"}
-            params = {"key": self.api_key}
+    def _build_request(self, model, prompt, system_prompt, max_tokens, stream, shared_prefix=None):
+        # Implicit caching matches on the leading text, so the shared prefix goes first
+        full_prompt = "\n\n".join(p for p in (shared_prefix, system_prompt, prompt) if p)
 
-            payload = {
-                "contents": [{"parts": [{"text": full_prompt}]}],
-                "generationConfig": {
-                    "temperature": 0.7,
-                    "maxOutputTokens": 4096
-                }
-            }
-
-            url = self._get_url(model)
-            async with aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT) as session:
-                async with session.post(url, headers=headers, params=params, json=payload) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        self.current_model = model
-                        return data["candidates"][0]["content"]["parts"][0]["text"]
-                    else:
-                        error = await resp.text()
-                        raise Exception(f"Gemini API error ({model}): {error}")
+        headers = {"Content-Type": "application/json"}
+        params = {"key": self.api_key}
+        if stream:
+            params["alt"] = "sse"
 
-        async def _call():
-            # Try primary model first
-            try:
-                return await _call_with_model(self.primary_model)
-            except Exception as e:
-                # If primary fails and we have a fallback, try it
-                if self.fallback_model:
-                    print(f"[Gemini] Primary model {self.primary_model} failed, falling back to {self.fallback_model}")
-                    return await _call_with_model(self.fallback_model)
-                raise e
+        payload = {
+            "contents": [{"parts": [{"text": full_prompt}]}],
+            "generationConfig": {
+                "temperature": 0.7,
+                "maxOutputTokens": max_tokens
+            }
+        }
 
-        try:
-            result = await retry_with_backoff(_call)
-            # Log successful call (Gemini doesn't return token counts, estimate)
-            log_ai_call("gemini", self.current_model, agent_id or "unknown", agent_role or "unknown",
-                       call_type, estimated_tokens // 2, len(result) // 4, success=True)
-            return result
-        except Exception as e:
-            log_ai_call("gemini", self.current_model, agent_id or "unknown", agent_role or "unknown",
-                       call_type, estimated_tokens // 2, 0, success=False, error=str(e)[:200])
-            raise
+        return self._get_url(model, stream), headers, params, payload
+
+    @staticmethod
+    def _candidate_text(data: Dict) -> str:
+        candidates = data.get("candidates") or []
+        if not candidates:
+            return ""
+        parts = (candidates[0].get("content") or {}).get("parts") or []
+        return "".join(p.get("text", "") for p in parts)
+
+    def _parse_response(self, data):
+        if not data.get("candidates"):
+            raise Exception(f"Gemini returned no candidates: {str(data)[:200]}")
+        return self._candidate_text(data)
+
+    def _parse_stream_chunk(self, data):
+        return self._candidate_text(data)
+
+    def _parse_usage(self, data):
+        usage = data.get("usageMetadata") or {}
+        return (
+            usage.get("promptTokenCount", 0),
+            usage.get("candidatesTokenCount", 0),
+            usage.get("cachedContentTokenCount", 0)
+        )
 
 
-class GrokProvider(AIProvider):
-    """xAI Grok Provider with rate limiting"""
+class GrokProvider(OpenAICompatibleProvider):
+    """xAI Grok Provider"""
 
-    def __init__(self, api_key: str, model: str = "grok-3"):
-        super().__init__(api_key)
-        self.model = model
-        self.base_url = "https://api.x.ai/v1/chat/completions"
-        self.rate_limiter = get_rate_limiter("Grok")
+    DEFAULT_MODEL = "grok-3"
+    provider_key = "xai"
+    base_url = "https://api.x.ai/v1/chat/completions"
+    log_name = "grok"
+    limiter_name = "Grok"
 
     @property
     def name(self) -> str:
         return "Grok"
 
-    async def generate(self, prompt: str, system_prompt: str = None, agent_id: str = None, agent_role: str = None, call_type: str = "generate") -> str:
-        # Estimate tokens and wait for rate limit clearance
-        estimated_tokens = estimate_tokens(prompt, system_prompt, max_output=4096)
-        await self.rate_limiter.wait_and_acquire(estimated_tokens)
 
-        # Track token usage for logging
-        actual_tokens_in = 0
-        actual_tokens_out = 0
-
-        async def _call():
-            nonlocal actual_tokens_in, actual_tokens_out
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": prompt})
-
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-
-            payload = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": 0.7,
-                "max_tokens": 4096
-            }
+class QwenProvider(OpenAICompatibleProvider):
+    """Alibaba Qwen Provider (via DashScope International)"""
 
-            async with aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT) as session:
-                async with session.post(self.base_url, headers=headers, json=payload) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        # Grok returns OpenAI-compatible usage stats
-                        if "usage" in data:
-                            actual_tokens_in = data["usage"].get("prompt_tokens", 0)
-                            actual_tokens_out = data["usage"].get("completion_tokens", 0)
-                        return data["choices"][0]["message"]["content"]
-                    else:
-                        error = await resp.text()
-                        raise Exception(f"Grok API error: {error}")
+    DEFAULT_MODEL = "qwen-turbo"
+    provider_key = "dashscope"
+    # Use international endpoint for non-China regions
+    base_url = "https://dashscope-intl.aliyuncs.com/compatible-mode/v1/chat/completions"
+    log_name = "qwen"
+    limiter_name = "Qwen"
 
-        try:
-            result = await retry_with_backoff(_call)
-            log_ai_call("grok", self.model, agent_id or "unknown", agent_role or "unknown",
-                       call_type, actual_tokens_in, actual_tokens_out, success=True)
-            return result
-        except Exception as e:
-            log_ai_call("grok", self.model, agent_id or "unknown", agent_role or "unknown",
-                       call_type, estimated_tokens // 2, 0, success=False, error=str(e)[:200])
-            raise
+    @property
+    def name(self) -> str:
+        return "Qwen"
 
 
-class QwenProvider(AIProvider):
-    """Alibaba Qwen Provider (via DashScope International)"""
+class DeepSeekProvider(OpenAICompatibleProvider):
+    """DeepSeek Provider"""
 
-    def __init__(self, api_key: str, model: str = "qwen-turbo"):
-        super().__init__(api_key)
-        self.model = model
-        # Use international endpoint for non-China regions
-        self.base_url = "https://dashscope-intl.aliyuncs.com/compatible-mode/v1/chat/completions"
+    DEFAULT_MODEL = "deepseek-chat"
+    provider_key = "deepseek"
+    base_url = "https://api.deepseek.com/v1/chat/completions"
+    log_name = "deepseek"
+    limiter_name = "DeepSeek"
 
     @property
     def name(self) -> str:
-        return "Qwen"
+        return "DeepSeek"
+
+
+# Provider aliases used by YAML workflow nodes and agent mappings
+PROVIDER_ALIASES = {
+    "openai": "openai",
+    "gpt": "openai",
+    "google": "google",
+    "gemini": "google",
+    "xai": "xai",
+    "grok": "xai",
+    "dashscope": "dashscope",
+    "qwen": "dashscope",
+    "deepseek": "deepseek",
+}
+
+PROVIDER_CLASSES = {
+    "openai": OpenAIProvider,
+    "google": GeminiProvider,
+    "xai": GrokProvider,
+    "dashscope": QwenProvider,
+    "deepseek": DeepSeekProvider,
+}
+
+
+def create_provider(provider: str, api_key: str, model: str = None) -> AIProvider:
+    """
+    Create a provider instance from a workflow/agent provider name.
 
-    async def generate(self, prompt: str, system_prompt: str = None, agent_id: str = None, agent_role: str = None, call_type: str = "generate") -> str:
-        estimated_tokens = estimate_tokens(prompt, system_prompt, max_output=4096)
-        actual_tokens_in = 0
-        actual_tokens_out = 0
+    Args:
+        provider: Provider name or alias (e.g. "openai", "gemini", "xai", "qwen")
+        api_key: API key for the provider
+        model: Model override (provider default if None)
+    """
+    canonical = PROVIDER_ALIASES.get(provider.lower())
+    if not canonical:
+        raise ValueError(f"Unsupported provider: {provider}")
+    return PROVIDER_CLASSES[canonical](api_key, model)
 
-        async def _call():
-            nonlocal actual_tokens_in, actual_tokens_out
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": prompt})
-
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
 
-            # Use OpenAI-compatible format for international endpoint
-            payload = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": 0.7,
-                "max_tokens": 4096
-            }
+class SingleFlight:
+    """
+    Coalesces identical concurrent requests into one upstream call.
 
-            async with aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT) as session:
-                async with session.post(self.base_url, headers=headers, json=payload) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        if "usage" in data:
-                            actual_tokens_in = data["usage"].get("prompt_tokens", 0)
-                            actual_tokens_out = data["usage"].get("completion_tokens", 0)
-                        return data["choices"][0]["message"]["content"]
-                    else:
-                        error = await resp.text()
-                        raise Exception(f"Qwen API error: {error}")
+    The first caller for a key runs the request; callers arriving while it
+    is in flight await the same result (or exception). Nothing is cached -
+    the key is released as soon as the call completes.
+    """
 
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.leaders = 0      # upstream calls made
+        self.coalesced = 0    # callers served by another caller's request
+
+    @staticmethod
+    def make_key(provider_key: str, model: str, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Key on provider, model, system prompt and prompt"""
+        digest = hashlib.sha256()
+        for part in (provider_key, model, system_prompt or "", prompt):
+            digest.update((part or "").encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    async def do(self, key: str, func: Callable):
+        """Run func() once for all concurrent callers with the same key"""
+        while True:
+            future = self._in_flight.get(key)
+            if future is None:
+                break
+            try:
+                result = await asyncio.shield(future)
+                self.coalesced += 1
+                return result
+            except asyncio.CancelledError:
+                # Leader was cancelled - take over the request ourselves
+                if not future.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark the exception retrieved when nobody else was waiting on it
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._in_flight[key] = future
+        self.leaders += 1
         try:
-            result = await retry_with_backoff(_call)
-            log_ai_call("qwen", self.model, agent_id or "unknown", agent_role or "unknown",
-                       call_type, actual_tokens_in, actual_tokens_out, success=True)
-            return result
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
         except Exception as e:
-            log_ai_call("qwen", self.model, agent_id or "unknown", agent_role or "unknown",
-                       call_type, estimated_tokens // 2, 0, success=False, error=str(e)[:200])
+            future.set_exception(e)
             raise
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+        future.set_result(result)
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        total = self.leaders + self.coalesced
+        return {
+            "upstream_calls": self.leaders,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+            "coalesce_rate": round(self.coalesced / total, 3) if total else 0.0
+        }
+
+
+# Global single-flight registry (shared across managers, e.g. one per ticker)
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the process-wide request coalescing layer"""
+    return _single_flight
 
 
 class AIProviderManager:
@@ -468,7 +867,8 @@ class AIProviderManager:
     - Weighted round-robin to ensure diversity (no single provider dominates)
     - Usage tracking to maintain balance across providers
     - Automatic fallback when a provider is rate-limited
-    - Provider health tracking
+    - Provider health tracking via per-provider circuit breakers
+      (agents.circuit_breaker), weighted by error rate and p50/p95 latency
     """
 
     # Target distribution percentages (should sum to 100)
@@ -483,11 +883,11 @@ class AIProviderManager:
     def __init__(self, config: Dict[str, str], weights: Dict[str, int] = None):
         self.providers: List[AIProvider] = []
         self._setup_providers(config)
-        self._provider_index = 0  # For round-robin
-        self._provider_errors: Dict[str, int] = {}  # Track error counts
+        self._provider_errors: Dict[str, int] = {}  # Error counts (stats only - routing uses circuit breakers)
         self._provider_usage: Dict[str, int] = {}  # Track usage counts
         self._total_requests = 0
         self._lock = asyncio.Lock()
+        self.single_flight = get_single_flight()  # Merges identical in-flight prompts
 
         # Set up weights - normalize to available providers
         self._weights = weights or self.DEFAULT_WEIGHTS
@@ -538,22 +938,27 @@ class AIProviderManager:
         """
         Get a diversified list of providers for parallel tasks.
         Ensures different providers are used, not the same one repeated.
+        Providers with an open circuit breaker are only used to fill the count.
         """
         if count >= len(self.providers):
             return self.providers.copy()
 
-        # Sort by usage (least used first) to maintain balance
+        # Sort by availability, then usage (least used first) to maintain balance
         sorted_providers = sorted(
             self.providers,
-            key=lambda p: self._provider_usage.get(self._get_base_name(p.name), 0)
+            key=lambda p: (not get_circuit_breaker(p.name).is_available(),
+                           self._provider_usage.get(self._get_base_name(p.name), 0))
         )
         return sorted_providers[:count]
 
     async def get_next_provider(self) -> Optional[AIProvider]:
         """
-        Get the next provider using BALANCED selection.
+        Get the next provider using BALANCED, health-weighted selection.
 
-        Prioritizes under-utilized providers to maintain target distribution.
+        Prioritizes under-utilized providers to maintain target distribution,
+        with each provider's target scaled by its circuit breaker health score
+        so slow or error-prone providers receive less traffic. Providers with
+        an open breaker are skipped.
         """
         async with self._lock:
             if not self.providers:
@@ -574,12 +979,13 @@ class AIProviderManager:
 
             for provider in self.providers:
                 base_name = self._get_base_name(provider.name)
+                breaker = get_circuit_breaker(provider.name)
 
-                # Skip providers with too many errors
-                if self._provider_errors.get(base_name, 0) >= 3:
+                # Skip providers whose circuit is open (or half-open with a probe in flight)
+                if not breaker.is_available():
                     continue
 
-                target = self._normalized_weights.get(base_name, 0.25)
+                target = self._normalized_weights.get(base_name, 0.25) * breaker.health_score()
                 current = usage_pct.get(base_name, 0)
                 deficit = target - current  # Positive = under-utilized
 
@@ -587,11 +993,9 @@ class AIProviderManager:
                     best_deficit = deficit
                     best_provider = provider
 
-            # Fallback to round-robin if all have errors
+            # All circuits open - use the one that recovers soonest
             if best_provider is None:
-                self._provider_errors.clear()
-                best_provider = self.providers[self._provider_index]
-                self._provider_index = (self._provider_index + 1) % len(self.providers)
+                best_provider = min(self.providers, key=lambda p: get_circuit_breaker(p.name).retry_in())
 
             # Track usage
             base_name = self._get_base_name(best_provider.name)
@@ -618,6 +1022,7 @@ class AIProviderManager:
 
         stats = {
             "total_requests": self._total_requests,
+            "coalescing": self.single_flight.to_dict(),
             "providers": {}
         }
         for provider in self.providers:
@@ -628,16 +1033,27 @@ class AIProviderManager:
                 "requests": usage,
                 "actual_pct": round(usage / self._total_requests * 100, 1),
                 "target_pct": round(target, 1),
-                "errors": self._provider_errors.get(base_name, 0)
+                "errors": self._provider_errors.get(base_name, 0),
+                "health": get_circuit_breaker(provider.name).to_dict()
             }
         return stats
 
+    def get_provider_health(self) -> Dict[str, Dict[str, Any]]:
+        """Circuit breaker state, error rate and latency percentiles per provider"""
+        return {self._get_base_name(p.name): get_circuit_breaker(p.name).to_dict() for p in self.providers}
+
     async def generate_with_fallback(self, prompt: str, system_prompt: str = None) -> str:
         """
         Generate using load balancing with automatic fallback.
 
         Tries providers in round-robin order, falling back on errors.
+        Identical concurrent calls share one routed request, whichever
+        provider ends up serving it.
         """
+        key = SingleFlight.make_key("balanced", "", prompt, system_prompt)
+        return await self.single_flight.do(key, lambda: self._generate_with_fallback(prompt, system_prompt))
+
+    async def _generate_with_fallback(self, prompt: str, system_prompt: str = None) -> str:
         last_error = None
         tried_providers = set()
 
@@ -671,11 +1087,19 @@ class AIProviderManager:
     async def _safe_generate(self, provider: AIProvider, prompt: str, system_prompt: str = None) -> Optional[str]:
         """Safely generate with error handling"""
         try:
-            return await provider.generate(prompt, system_prompt)
+            return await self.generate_coalesced(provider, prompt, system_prompt)
         except Exception as e:
             print(f"Error with {provider.name}: {e}")
             return None
 
+    async def generate_coalesced(self, provider: AIProvider, prompt: str, system_prompt: str = None) -> str:
+        """
+        Generate on a specific provider, sharing one upstream call between
+        identical concurrent requests (same provider, model, system prompt and prompt).
+        """
+        key = SingleFlight.make_key(provider.provider_key, provider.model, prompt, system_prompt)
+        return await self.single_flight.do(key, lambda: provider.generate(prompt, system_prompt))
+
     def get_rate_limit_status(self) -> Dict[str, Dict]:
         """Get current rate limit status for all providers"""
         status = {}
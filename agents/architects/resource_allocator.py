@@ -13,14 +13,17 @@ from datetime import datetime, timedelta
 
 from agents.core.spawnable_agent import SpawnableAgent
 from agents.base_agent import ResearchContext
+from agents.circuit_breaker import get_circuit_breaker
 
 
 class ResourceAllocatorAgent(SpawnableAgent):
     """
     Manages AI provider allocation and load balancing (Tier 0).
 
-    Tracks usage patterns, errors, and health of each AI provider
-    to make intelligent allocation decisions.
+    Tracks usage patterns and errors of each AI provider to make
+    intelligent allocation decisions. Health comes from the shared
+    per-provider circuit breakers (agents.circuit_breaker), the same
+    ones AIProviderManager routes on.
 
     Usage:
         allocator = ResourceAllocatorAgent(ai_provider, ai_manager)
@@ -68,12 +71,6 @@ class ResourceAllocatorAgent(SpawnableAgent):
         # Last error time: provider_name -> datetime
         self.provider_last_error: Dict[str, datetime] = {}
 
-        # Error recovery window (seconds)
-        self.error_recovery_window = config.get('error_recovery_window', 300) if config else 300
-
-        # Max errors before marking unhealthy
-        self.max_provider_errors = config.get('max_provider_errors', 5) if config else 5
-
         # Round-robin state for diversity
         self._round_robin_index = 0
 
@@ -171,6 +168,9 @@ Track usage and errors to maintain system health."""
         providers = self.ai_manager.get_all_providers()
         healthy = [p for p in providers if self._is_provider_healthy(p.name)]
 
+        # Healthiest first (error rate, p50/p95 latency, in-flight load)
+        healthy.sort(key=lambda p: get_circuit_breaker(p.name).health_score(), reverse=True)
+
         # If we have enough healthy providers, use them
         if len(healthy) >= count:
             selected = healthy[:count]
@@ -195,27 +195,12 @@ Track usage and errors to maintain system health."""
 
     def _is_provider_healthy(self, provider_name: str) -> bool:
         """
-        Check if provider is healthy based on error rate.
+        Check if provider is healthy.
 
-        Provider is healthy if:
-        - Error count < max_provider_errors, OR
-        - Last error was more than recovery_window ago
+        Healthy means its circuit breaker is closed, or half-open with the
+        recovery probe slot free.
         """
-        errors = self.provider_errors.get(provider_name, 0)
-
-        if errors < self.max_provider_errors:
-            return True
-
-        # Check if enough time has passed for recovery
-        last_error = self.provider_last_error.get(provider_name)
-        if last_error:
-            elapsed = (datetime.now() - last_error).total_seconds()
-            if elapsed > self.error_recovery_window:
-                # Reset error count after recovery window
-                self.provider_errors[provider_name] = 0
-                return True
-
-        return False
+        return get_circuit_breaker(provider_name).is_available()
 
     def _track_usage(self, provider_name: str):
         """Track provider usage"""
@@ -229,7 +214,8 @@ Track usage and errors to maintain system health."""
         """
         Report a provider error.
 
-        Called when a provider fails (rate limit, timeout, etc.)
+        Called for failures the provider layer cannot see itself (e.g. an
+        unusable response). API errors are already recorded by AIProvider.
 
         Args:
             provider_name: Name of the failing provider
@@ -237,6 +223,9 @@ Track usage and errors to maintain system health."""
         """
         self.provider_errors[provider_name] = self.provider_errors.get(provider_name, 0) + 1
         self.provider_last_error[provider_name] = datetime.now()
+        breaker = get_circuit_breaker(provider_name)
+        breaker.record_start()
+        breaker.record_failure()
 
     def report_success(self, provider_name: str):
         """
@@ -276,6 +265,7 @@ Track usage and errors to maintain system health."""
             name = provider.name
             health[name] = {
                 'healthy': self._is_provider_healthy(name),
+                'circuit': get_circuit_breaker(name).to_dict(),
                 'usage_count': self.provider_usage.get(name, 0),
                 'error_count': self.provider_errors.get(name, 0),
                 'last_error': self.provider_last_error.get(name, None)
@@ -0,0 +1,446 @@
+"""
+Batch Backend - Offline batch submission for non-interactive runs
+
+Overnight refreshes don't need interactive latency, but running them through
+the normal chat endpoints pays full price and competes with interactive work
+for the same TPM budget. Batch APIs (OpenAI, DashScope compatible-mode) take a
+JSONL file of requests, run it asynchronously at a discount and return a JSONL
+file of results.
+
+Components:
+- BatchRequest: one chat request destined for a batch job
+- OpenAIBatchBackend: OpenAI-compatible /files + /batches client
+- FileBatchBackend: local file-based stand-in for tests and dry runs
+- BatchCollector: gathers independent requests (e.g. every ticker's
+  Industry Deep Dive) into batch jobs, polls them and resolves each caller's
+  future with a GenerationResult
+
+Usage:
+    collector = BatchCollector({"openai": OpenAIBatchBackend(api_key)})
+    result = await collector.submit(BatchRequest(provider="openai", model="gpt-4o", prompt=...))
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+import aiohttp
+
+from agents.ai_providers import GenerationResult, get_client_session, log_ai_call
+
+# Polling configuration
+DEFAULT_POLL_INTERVAL = 30.0   # seconds between status checks
+DEFAULT_COLLECT_WINDOW = 5.0   # seconds of quiet before a partial batch is submitted
+DEFAULT_MAX_BATCH_SIZE = 500   # requests per batch job
+
+# Batch job states (OpenAI naming)
+TERMINAL_STATES = {"completed", "failed", "expired", "cancelled"}
+
+
+@dataclass
+class BatchRequest:
+    """A single chat request destined for a batch job"""
+    provider: str                    # canonical provider name ("openai", "dashscope", ...)
+    model: str
+    prompt: str
+    system_prompt: Optional[str] = None
+    shared_prefix: Optional[str] = None
+    max_tokens: int = 4096
+    temperature: float = 0.7
+    custom_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    agent_id: str = "unknown"
+
+    def to_messages(self) -> List[Dict[str, str]]:
+        """Chat messages in the same order as the interactive providers use"""
+        messages = []
+        if self.shared_prefix:
+            messages.append({"role": "system", "content": self.shared_prefix})
+        if self.system_prompt:
+            messages.append({"role": "system", "content": self.system_prompt})
+        messages.append({"role": "user", "content": self.prompt})
+        return messages
+
+    def to_jsonl_line(self) -> str:
+        """Request line in the OpenAI batch input format"""
+        return json.dumps({
+            "custom_id": self.custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": self.model,
+                "messages": self.to_messages(),
+                "temperature": self.temperature,
+                "max_tokens": self.max_tokens
+            }
+        }, ensure_ascii=False)
+
+
+def parse_batch_output_line(line: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Parse one line of an OpenAI-format batch output file.
+
+    Returns:
+        (custom_id, {"text", "tokens_in", "tokens_out", "cached_tokens"} or {"error"})
+    """
+    record = json.loads(line)
+    custom_id = record.get("custom_id", "")
+
+    if record.get("error"):
+        return custom_id, {"error": str(record["error"])}
+
+    response = record.get("response") or {}
+    if response.get("status_code", 200) != 200:
+        return custom_id, {"error": f"status {response.get('status_code')}: {response.get('body')}"}
+
+    body = response.get("body") or {}
+    usage = body.get("usage") or {}
+    details = usage.get("prompt_tokens_details") or {}
+    return custom_id, {
+        "text": body["choices"][0]["message"]["content"],
+        "tokens_in": usage.get("prompt_tokens", 0),
+        "tokens_out": usage.get("completion_tokens", 0),
+        "cached_tokens": details.get("cached_tokens", 0)
+    }
+
+
+class BatchBackend(ABC):
+    """Submits a list of requests as one job and fetches its results"""
+
+    @abstractmethod
+    async def submit(self, requests: List[BatchRequest]) -> str:
+        """Submit requests, returning the job id"""
+        pass
+
+    @abstractmethod
+    async def status(self, job_id: str) -> str:
+        """Current job state (see TERMINAL_STATES)"""
+        pass
+
+    @abstractmethod
+    async def results(self, job_id: str) -> Dict[str, Dict[str, Any]]:
+        """Map of custom_id -> parsed result (see parse_batch_output_line)"""
+        pass
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """
+    OpenAI Batch API client.
+
+    Also works against other OpenAI-compatible batch endpoints such as
+    DashScope compatible-mode by passing base_url.
+    """
+
+    def __init__(self, api_key: str, base_url: str = "https://api.openai.com/v1",
+                 completion_window: str = "24h"):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.completion_window = completion_window
+        self._output_files: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+
+    @property
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+    async def submit(self, requests: List[BatchRequest]) -> str:
+        session = get_client_session()
+        jsonl = "\n".join(r.to_jsonl_line() for r in requests) + "\n"
+
+        # Upload the input file
+        form = aiohttp.FormData()
+        form.add_field("purpose", "batch")
+        form.add_field("file", jsonl.encode("utf-8"), filename="batch_input.jsonl",
+                       content_type="application/jsonl")
+        async with session.post(f"{self.base_url}/files", headers=self._headers, data=form) as resp:
+            if resp.status != 200:
+                raise Exception(f"Batch file upload error ({resp.status}): {await resp.text()}")
+            input_file_id = (await resp.json())["id"]
+
+        # Create the batch job
+        payload = {
+            "input_file_id": input_file_id,
+            "endpoint": "/v1/chat/completions",
+            "completion_window": self.completion_window
+        }
+        async with session.post(f"{self.base_url}/batches", headers=self._headers, json=payload) as resp:
+            if resp.status != 200:
+                raise Exception(f"Batch create error ({resp.status}): {await resp.text()}")
+            return (await resp.json())["id"]
+
+    async def status(self, job_id: str) -> str:
+        session = get_client_session()
+        async with session.get(f"{self.base_url}/batches/{job_id}", headers=self._headers) as resp:
+            if resp.status != 200:
+                raise Exception(f"Batch status error ({resp.status}): {await resp.text()}")
+            data = await resp.json()
+        self._output_files[job_id] = (data.get("output_file_id"), data.get("error_file_id"))
+        return data.get("status", "unknown")
+
+    async def results(self, job_id: str) -> Dict[str, Dict[str, Any]]:
+        session = get_client_session()
+        results = {}
+        # Successful requests land in output_file_id, failed ones in error_file_id
+        for file_id in self._output_files.get(job_id, (None, None)):
+            if not file_id:
+                continue
+            async with session.get(f"{self.base_url}/files/{file_id}/content", headers=self._headers) as resp:
+                if resp.status != 200:
+                    raise Exception(f"Batch download error ({resp.status}): {await resp.text()}")
+                content = await resp.text()
+            for line in content.splitlines():
+                if line.strip():
+                    custom_id, result = parse_batch_output_line(line)
+                    results[custom_id] = result
+        return results
+
+
+class FileBatchBackend(BatchBackend):
+    """
+    Local file-based batch backend.
+
+    Writes <job_id>.input.jsonl to batch_dir and treats the job as complete
+    once <job_id>.output.jsonl exists (OpenAI output format). With a
+    responder, the output file is produced on the first status check, so
+    the whole batch path can run in tests without network access. Without
+    one, the output file must be dropped in by hand or by another tool, so
+    the collector needs a job_timeout (see create_batch_collector).
+    """
+
+    def __init__(self, batch_dir: str = "context/batches",
+                 responder: Optional[Callable[[BatchRequest], str]] = None):
+        self.batch_dir = Path(batch_dir)
+        self.batch_dir.mkdir(parents=True, exist_ok=True)
+        self.responder = responder
+
+    def _input_path(self, job_id: str) -> Path:
+        return self.batch_dir / f"{job_id}.input.jsonl"
+
+    def _output_path(self, job_id: str) -> Path:
+        return self.batch_dir / f"{job_id}.output.jsonl"
+
+    async def submit(self, requests: List[BatchRequest]) -> str:
+        job_id = f"filebatch_{int(time.time())}_{uuid.uuid4().hex[:8]}"
+        with open(self._input_path(job_id), 'w', encoding='utf-8') as f:
+            for r in requests:
+                f.write(r.to_jsonl_line() + "\n")
+        return job_id
+
+    async def status(self, job_id: str) -> str:
+        if self._output_path(job_id).exists():
+            return "completed"
+        if self.responder:
+            self._respond(job_id)
+            return "completed"
+        return "in_progress"
+
+    def _respond(self, job_id: str):
+        """Answer every request in the input file with the responder"""
+        lines = []
+        with open(self._input_path(job_id), 'r', encoding='utf-8') as f:
+            for raw in f:
+                if not raw.strip():
+                    continue
+                record = json.loads(raw)
+                body = record["body"]
+                messages = body["messages"]
+                request = BatchRequest(
+                    provider="file",
+                    model=body["model"],
+                    prompt=messages[-1]["content"],
+                    system_prompt="\n\n".join(m["content"] for m in messages[:-1]) or None,
+                    max_tokens=body.get("max_tokens", 4096),
+                    custom_id=record["custom_id"]
+                )
+                text = self.responder(request)
+                lines.append(json.dumps({
+                    "custom_id": record["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": {
+                            "model": body["model"],
+                            "choices": [{"message": {"role": "assistant", "content": text}}],
+                            "usage": {
+                                "prompt_tokens": sum(len(m["content"]) for m in messages) // 4,
+                                "completion_tokens": len(text) // 4
+                            }
+                        }
+                    }
+                }, ensure_ascii=False))
+
+        with open(self._output_path(job_id), 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+    async def results(self, job_id: str) -> Dict[str, Dict[str, Any]]:
+        results = {}
+        with open(self._output_path(job_id), 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    custom_id, result = parse_batch_output_line(line)
+                    results[custom_id] = result
+        return results
+
+
+class BatchCollector:
+    """
+    Collects independent requests into batch jobs and resolves them.
+
+    Callers await submit() as if it were a normal provider call. Requests
+    for the same provider are held until max_batch_size is reached or no
+    new request has arrived for collect_window seconds, then submitted as
+    one job that is polled every poll_interval seconds. A job still running
+    after job_timeout seconds (None = wait for the backend's own expiry)
+    fails all of its requests.
+    """
+
+    def __init__(
+        self,
+        backends: Dict[str, BatchBackend],
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        collect_window: float = DEFAULT_COLLECT_WINDOW,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        job_timeout: Optional[float] = None
+    ):
+        self.backends = backends
+        self.max_batch_size = max_batch_size
+        self.collect_window = collect_window
+        self.poll_interval = poll_interval
+        self.job_timeout = job_timeout
+
+        self._pending: Dict[str, List[Tuple[BatchRequest, asyncio.Future]]] = {}
+        self._flush_timers: Dict[str, asyncio.TimerHandle] = {}
+        self._jobs: List[asyncio.Task] = []
+
+    def supports(self, provider: str) -> bool:
+        """Whether requests for this provider can be batched"""
+        return provider in self.backends
+
+    async def submit(self, request: BatchRequest) -> GenerationResult:
+        """Queue a request and wait for its batch to complete"""
+        if not self.supports(request.provider):
+            raise ValueError(f"No batch backend for provider: {request.provider}")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(request.provider, [])
+        pending.append((request, future))
+
+        # Restart the quiet-period timer on every new request
+        timer = self._flush_timers.pop(request.provider, None)
+        if timer:
+            timer.cancel()
+        if len(pending) >= self.max_batch_size:
+            self._flush(request.provider)
+        else:
+            self._flush_timers[request.provider] = loop.call_later(
+                self.collect_window, self._flush, request.provider
+            )
+
+        return await future
+
+    async def flush(self):
+        """Submit everything pending now and wait for all jobs to finish"""
+        for provider in list(self._pending):
+            timer = self._flush_timers.pop(provider, None)
+            if timer:
+                timer.cancel()
+            self._flush(provider)
+        if self._jobs:
+            await asyncio.gather(*self._jobs, return_exceptions=True)
+
+    def _flush(self, provider: str):
+        self._flush_timers.pop(provider, None)
+        batch = self._pending.pop(provider, [])
+        if batch:
+            task = asyncio.ensure_future(self._run_job(provider, batch))
+            self._jobs.append(task)
+            task.add_done_callback(self._jobs.remove)
+
+    async def _run_job(self, provider: str, batch: List[Tuple[BatchRequest, asyncio.Future]]):
+        backend = self.backends[provider]
+        futures = {request.custom_id: (request, future) for request, future in batch}
+        start = time.perf_counter()
+
+        try:
+            job_id = await backend.submit([request for request, _ in batch])
+            print(f"  [Batch] Submitted {len(batch)} {provider} requests as job {job_id}")
+
+            state = await backend.status(job_id)
+            while state not in TERMINAL_STATES:
+                if self.job_timeout is not None and time.perf_counter() - start > self.job_timeout:
+                    raise TimeoutError(f"Batch job {job_id} still {state} after {self.job_timeout:.0f}s")
+                await asyncio.sleep(self.poll_interval)
+                state = await backend.status(job_id)
+
+            print(f"  [Batch] Job {job_id} {state} after {time.perf_counter() - start:.0f}s")
+            results = await backend.results(job_id) if state == "completed" else {}
+        except asyncio.CancelledError:
+            # Callers awaiting submit() would otherwise wait forever
+            for _, future in futures.values():
+                if not future.done():
+                    future.set_exception(Exception(f"Batch job for {len(batch)} {provider} requests cancelled"))
+            raise
+        except Exception as e:
+            for _, future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        latency = time.perf_counter() - start
+        for custom_id, (request, future) in futures.items():
+            if future.done():
+                continue
+            result = results.get(custom_id)
+            if result is None:
+                future.set_exception(Exception(f"Batch job {job_id} {state}: no result for {custom_id}"))
+            elif "error" in result:
+                log_ai_call(provider, request.model, request.agent_id, "batch", "batch",
+                            0, 0, success=False, error=result["error"][:200])
+                future.set_exception(Exception(f"Batch request failed: {result['error']}"))
+            else:
+                log_ai_call(provider, request.model, request.agent_id, "batch", "batch",
+                            result["tokens_in"], result["tokens_out"], success=True)
+                future.set_result(GenerationResult(
+                    text=result["text"],
+                    provider=provider,
+                    model=request.model,
+                    tokens_in=result["tokens_in"],
+                    tokens_out=result["tokens_out"],
+                    cached_tokens=result["cached_tokens"],
+                    latency=latency,
+                    time_to_first_token=latency
+                ))
+
+
+def create_batch_collector(api_keys: Dict[str, str], backend: str = "openai",
+                           batch_dir: str = "context/batches", **kwargs) -> BatchCollector:
+    """
+    Build a collector for the providers that offer a batch API.
+
+    Args:
+        api_keys: Provider API keys (config.API_KEYS format)
+        backend: "openai" for the real batch endpoints, "file" for the local stub
+        batch_dir: Directory used by the file backend
+        **kwargs: BatchCollector options; responder= for the file backend
+
+    The file backend needs a responder or a job_timeout: without either,
+    nothing ever writes its output files and the run would poll forever.
+    """
+    backends: Dict[str, BatchBackend] = {}
+    if backend == "file":
+        if kwargs.get("responder") is None and kwargs.get("job_timeout") is None:
+            raise ValueError("File batch backend needs a responder or a job_timeout")
+        stub = FileBatchBackend(batch_dir, responder=kwargs.pop("responder", None))
+        backends = {"openai": stub, "dashscope": stub}
+    else:
+        if api_keys.get("openai"):
+            backends["openai"] = OpenAIBatchBackend(api_keys["openai"])
+        if api_keys.get("dashscope"):
+            backends["dashscope"] = OpenAIBatchBackend(
+                api_keys["dashscope"],
+                base_url="https://dashscope-intl.aliyuncs.com/compatible-mode/v1"
+            )
+    return BatchCollector(backends, **kwargs)
@@ -0,0 +1,244 @@
+"""
+Circuit Breaker - Per-provider health tracking for AI provider routing
+
+Every AIProvider call is recorded against the breaker for its provider, so
+AIProviderManager and ResourceAllocatorAgent route on the same view of
+health:
+
+- CLOSED: normal operation
+- OPEN: too many recent failures; routers skip the provider until the
+  recovery timeout passes (the timeout doubles on repeated trips)
+- HALF_OPEN: recovery timeout passed; a single probe request is allowed
+  through, and its outcome closes or re-opens the breaker
+
+Alongside the state, each breaker keeps an EWMA of latency and error rate,
+a window of recent latencies for p50/p95 and the number of in-flight
+requests. health_score() folds these into one routing weight, so slow or
+degraded providers stop soaking up new requests before they fail outright.
+"""
+
+import time
+from collections import deque
+from enum import Enum
+from typing import Dict, Any, Optional
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+# Breaker configuration
+FAILURE_THRESHOLD = 3          # consecutive failures that trip the breaker
+ERROR_RATE_THRESHOLD = 0.5     # EWMA error rate that trips the breaker
+MIN_CALLS_FOR_RATE = 5         # calls before the error rate is trusted
+RECOVERY_TIMEOUT = 30.0        # seconds open before the first probe
+MAX_RECOVERY_TIMEOUT = 300.0   # cap for the doubling timeout
+EWMA_ALPHA = 0.2               # weight of the newest observation
+LATENCY_WINDOW = 100           # recent latencies kept for percentiles
+
+# Health scoring references
+LATENCY_REFERENCE = 30.0       # seconds; a p50/p95 blend this slow halves the score
+IN_FLIGHT_REFERENCE = 4        # concurrent requests that halve the score
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker with latency-aware health scoring for one provider.
+
+    Usage:
+        breaker = get_circuit_breaker("GPT")
+        if breaker.is_available():
+            breaker.record_start()
+            try:
+                ... call provider ...
+                breaker.record_success(latency)
+            except asyncio.CancelledError:
+                breaker.record_cancel()
+                raise
+            except Exception:
+                breaker.record_failure()
+                raise
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.calls = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.ewma_latency: Optional[float] = None
+        self.ewma_error_rate = 0.0
+        self.recovery_timeout = RECOVERY_TIMEOUT
+        self.opened_at: Optional[float] = None
+        self._latencies: deque = deque(maxlen=LATENCY_WINDOW)
+        self._probe_in_flight = False
+
+    # ==========================================
+    # State
+    # ==========================================
+
+    def _refresh_state(self):
+        """Move OPEN -> HALF_OPEN once the recovery timeout has passed"""
+        if self.state == CircuitState.OPEN and time.monotonic() - self.opened_at >= self.recovery_timeout:
+            self.state = CircuitState.HALF_OPEN
+            self._probe_in_flight = False
+
+    def is_available(self) -> bool:
+        """Whether a router may send a new request to this provider"""
+        self._refresh_state()
+        if self.state == CircuitState.CLOSED:
+            return True
+        if self.state == CircuitState.HALF_OPEN:
+            return not self._probe_in_flight
+        return False
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a probe through (0 if available)"""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+
+    def _trip(self):
+        if self.state == CircuitState.HALF_OPEN:
+            # Failed probe - back off harder
+            self.recovery_timeout = min(self.recovery_timeout * 2, MAX_RECOVERY_TIMEOUT)
+        self.state = CircuitState.OPEN
+        self.opened_at = time.monotonic()
+        self._probe_in_flight = False
+        print(f"  [CircuitBreaker] {self.name} OPEN for {self.recovery_timeout:.0f}s "
+              f"({self.consecutive_failures} consecutive failures, "
+              f"error rate {self.ewma_error_rate:.0%})")
+
+    def _close(self):
+        if self.state != CircuitState.CLOSED:
+            print(f"  [CircuitBreaker] {self.name} CLOSED (probe succeeded)")
+        self.state = CircuitState.CLOSED
+        self.recovery_timeout = RECOVERY_TIMEOUT
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    # ==========================================
+    # Recording
+    # ==========================================
+
+    def record_start(self):
+        """A request is being sent to the provider"""
+        self._refresh_state()
+        self.in_flight += 1
+        if self.state == CircuitState.HALF_OPEN:
+            self._probe_in_flight = True
+
+    def record_success(self, latency: float):
+        """The request completed in latency seconds"""
+        self.in_flight = max(0, self.in_flight - 1)
+        self.calls += 1
+        self.consecutive_failures = 0
+        self._latencies.append(latency)
+        self.ewma_latency = latency if self.ewma_latency is None else (
+            EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.ewma_latency
+        )
+        self.ewma_error_rate = (1 - EWMA_ALPHA) * self.ewma_error_rate
+        if self.state == CircuitState.HALF_OPEN:
+            self._close()
+
+    def record_cancel(self):
+        """
+        The request was cancelled before completing (timeout, task cancel).
+
+        Says nothing about the provider's health, so only the in-flight slot
+        is released. A cancelled probe frees the half-open breaker for the
+        next probe instead of holding it unavailable forever.
+        """
+        self.in_flight = max(0, self.in_flight - 1)
+        if self.state == CircuitState.HALF_OPEN:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        """The request failed (after retries)"""
+        self.in_flight = max(0, self.in_flight - 1)
+        self.calls += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.ewma_error_rate = EWMA_ALPHA + (1 - EWMA_ALPHA) * self.ewma_error_rate
+
+        if self.state == CircuitState.HALF_OPEN:
+            self._trip()
+        elif self.state == CircuitState.CLOSED and (
+            self.consecutive_failures >= FAILURE_THRESHOLD or
+            (self.calls >= MIN_CALLS_FOR_RATE and self.ewma_error_rate >= ERROR_RATE_THRESHOLD)
+        ):
+            self._trip()
+
+    # ==========================================
+    # Scoring
+    # ==========================================
+
+    def latency_percentile(self, pct: float) -> Optional[float]:
+        """Latency percentile (0-100) over the recent window, None without data"""
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def health_score(self) -> float:
+        """
+        Routing weight in [0, 1] - 1.0 for a fast, error-free, idle provider.
+
+        Penalises error rate, a blend of p50 and p95 latency (tail latency
+        matters when nodes wait on the slowest call) and current in-flight
+        load. Unavailable providers score 0.
+        """
+        if not self.is_available():
+            return 0.0
+
+        p50 = self.latency_percentile(50)
+        p95 = self.latency_percentile(95)
+        latency = 0.5 * p50 + 0.5 * p95 if p50 is not None else 0.0
+
+        return (
+            (1 - self.ewma_error_rate)
+            / (1 + latency / LATENCY_REFERENCE)
+            / (1 + self.in_flight / IN_FLIGHT_REFERENCE)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        p50 = self.latency_percentile(50)
+        p95 = self.latency_percentile(95)
+        return {
+            "state": self.state.value,
+            "health_score": round(self.health_score(), 3),
+            "calls": self.calls,
+            "failures": self.failures,
+            "in_flight": self.in_flight,
+            "error_rate": round(self.ewma_error_rate, 3),
+            "latency_ewma": round(self.ewma_latency, 2) if self.ewma_latency is not None else None,
+            "latency_p50": round(p50, 2) if p50 is not None else None,
+            "latency_p95": round(p95, 2) if p95 is not None else None,
+            "retry_in": round(self.retry_in(), 1)
+        }
+
+
+# Global circuit breakers (shared across all provider instances and routers)
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def _base_name(provider_name: str) -> str:
+    """'Gemini (gemini-2.5...)' -> 'Gemini'"""
+    return provider_name.split('(')[0].strip()
+
+
+def get_circuit_breaker(provider_name: str) -> CircuitBreaker:
+    """Get or create the circuit breaker for a provider"""
+    name = _base_name(provider_name)
+    if name not in _circuit_breakers:
+        _circuit_breakers[name] = CircuitBreaker(name)
+    return _circuit_breakers[name]
+
+
+def get_circuit_status() -> Dict[str, Dict[str, Any]]:
+    """Health snapshot for every provider seen in this process"""
+    return {name: breaker.to_dict() for name, breaker in _circuit_breakers.items()}
@@ -0,0 +1,283 @@
+"""
+Debate Scheduler - Global, provider-aware scheduling of debate LLM calls
+
+Running debates for many tickers with a plain per-ticker semaphore leaves
+the providers unevenly loaded: every ticker's round assigns its roles to the
+same four providers, so one provider queues up behind its rate limiter while
+another sits idle.
+
+DebateScheduler treats every (ticker, round, role) call as a job and packs
+jobs from all debates against per-provider capacity (concurrent calls):
+
+- jobs are dispatched earliest round first, so tickers progress evenly
+- a job runs on the provider its round assigned when that provider has a
+  free slot; otherwise it moves to the free provider with the most spare,
+  health-weighted capacity (preferring one not already used for the same
+  ticker and round, to keep roles on different LLMs)
+- providers with an open circuit breaker receive no new jobs
+
+utilisation() reports busy slot-time per provider over the run.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Tuple
+
+from agents.ai_providers import AIProviderManager, AIProvider
+from agents.circuit_breaker import get_circuit_breaker
+
+# Concurrent calls per provider - rate limiters still enforce TPM underneath
+DEFAULT_PROVIDER_CAPACITY = 4
+
+
+@dataclass(order=True)
+class DebateJob:
+    """One debate LLM call"""
+    round_num: int
+    seq: int
+    ticker: str = field(compare=False)
+    role: str = field(compare=False)
+    prompt: str = field(compare=False)
+    system_prompt: Optional[str] = field(compare=False, default=None)
+    preferred: Optional[str] = field(compare=False, default=None)
+    submitted_at: float = field(compare=False, default_factory=time.monotonic)
+    future: Optional[asyncio.Future] = field(compare=False, default=None)
+
+
+class DebateScheduler:
+    """
+    Packs debate calls from all tickers onto provider capacity.
+
+    Usage:
+        scheduler = DebateScheduler(provider_manager)
+        provider_name, text = await scheduler.run("9660 HK", 3, "bull", prompt, system_prompt,
+                                                  preferred="Grok")
+        print(scheduler.utilisation())
+    """
+
+    def __init__(self, provider_manager: AIProviderManager, capacity: Dict[str, int] = None,
+                 reassign: bool = True):
+        self.provider_manager = provider_manager
+        self.reassign = reassign  # Move jobs off busy providers onto free ones
+
+        self._providers: Dict[str, AIProvider] = {
+            self._base_name(p.name): p for p in provider_manager.get_all_providers()
+        }
+        capacity = capacity or {}
+        self.capacity = {name: capacity.get(name, DEFAULT_PROVIDER_CAPACITY) for name in self._providers}
+
+        self._queue: list = []
+        self._seq = itertools.count()
+        self._running: Dict[str, int] = {name: 0 for name in self._providers}
+        self._round_providers: Dict[Tuple[str, int], set] = {}
+
+        # Utilisation accounting
+        self._busy_time: Dict[str, float] = {name: 0.0 for name in self._providers}
+        self._jobs: Dict[str, int] = {name: 0 for name in self._providers}
+        self._peak_running: Dict[str, int] = {name: 0 for name in self._providers}
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._total_wait = 0.0
+        self._completed = 0
+        self._failed = 0
+        self._reassigned = 0
+
+    @staticmethod
+    def _base_name(provider_name: str) -> str:
+        return provider_name.split('(')[0].strip()
+
+    # ==========================================
+    # Submission
+    # ==========================================
+
+    async def run(self, ticker: str, round_num: int, role: str, prompt: str,
+                  system_prompt: str = None, preferred: str = None) -> Tuple[str, str]:
+        """
+        Queue one debate call and wait for it.
+
+        Returns:
+            (provider name that served the call, response text)
+        """
+        if not self._providers:
+            raise Exception("No providers available")
+
+        job = DebateJob(
+            round_num=round_num,
+            seq=next(self._seq),
+            ticker=ticker,
+            role=role,
+            prompt=prompt,
+            system_prompt=system_prompt,
+            preferred=self._base_name(preferred) if preferred else None,
+            future=asyncio.get_running_loop().create_future()
+        )
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+
+        heapq.heappush(self._queue, job)
+        self._dispatch()
+        return await job.future
+
+    # ==========================================
+    # Dispatch
+    # ==========================================
+
+    def _free_providers(self):
+        return [
+            name for name, provider in self._providers.items()
+            if self._running[name] < self.capacity[name] and get_circuit_breaker(provider.name).is_available()
+        ]
+
+    def _pick_provider(self, job: DebateJob, free: list) -> Optional[str]:
+        if job.preferred in free:
+            return job.preferred
+
+        preferred_usable = (
+            job.preferred in self._providers and
+            get_circuit_breaker(self._providers[job.preferred].name).is_available()
+        )
+        if not self.reassign and preferred_usable:
+            return None  # wait for the assigned provider
+
+        # Prefer providers not already serving another role in this ticker/round
+        used = self._round_providers.get((job.ticker, job.round_num), set())
+        candidates = [name for name in free if name not in used] or free
+
+        def spare(name):
+            headroom = (self.capacity[name] - self._running[name]) / self.capacity[name]
+            return headroom * get_circuit_breaker(self._providers[name].name).health_score()
+
+        return max(candidates, key=spare)
+
+    def _dispatch(self):
+        """Start queued jobs on free provider slots, earliest round first"""
+        if not self._queue:
+            return
+
+        # All breakers open - run the oldest job on whichever recovers soonest
+        if not any(get_circuit_breaker(p.name).is_available() for p in self._providers.values()):
+            if not any(self._running.values()):
+                name = min(self._providers, key=lambda n: get_circuit_breaker(self._providers[n].name).retry_in())
+                self._start(heapq.heappop(self._queue), name)
+            return
+
+        waiting = []
+        while self._queue:
+            free = self._free_providers()
+            if not free:
+                break
+            job = heapq.heappop(self._queue)
+            name = self._pick_provider(job, free)
+            if name is None:
+                waiting.append(job)
+                continue
+            self._start(job, name)
+
+        for job in waiting:
+            heapq.heappush(self._queue, job)
+
+    def _start(self, job: DebateJob, name: str):
+        if job.preferred and name != job.preferred:
+            self._reassigned += 1
+        self._running[name] += 1
+        self._peak_running[name] = max(self._peak_running[name], self._running[name])
+        self._round_providers.setdefault((job.ticker, job.round_num), set()).add(name)
+        self._total_wait += time.monotonic() - job.submitted_at
+        asyncio.create_task(self._execute(job, name))
+
+    async def _execute(self, job: DebateJob, name: str):
+        provider = self._providers[name]
+        start = time.monotonic()
+        try:
+            text = await self.provider_manager.generate_coalesced(provider, job.prompt, job.system_prompt)
+            self._completed += 1
+            if not job.future.done():
+                job.future.set_result((provider.name, text))
+        except Exception as e:
+            self._failed += 1
+            if not job.future.done():
+                job.future.set_exception(e)
+        finally:
+            end = time.monotonic()
+            self._busy_time[name] += end - start
+            self._jobs[name] += 1
+            self._running[name] -= 1
+            self._finished_at = end
+            self._dispatch()
+
+    # ==========================================
+    # Reporting
+    # ==========================================
+
+    def utilisation(self) -> Dict[str, Any]:
+        """Busy slot-time per provider as a share of its capacity over the run"""
+        if self._started_at is None:
+            return {"jobs": 0, "providers": {}}
+
+        end = time.monotonic() if any(self._running.values()) or self._queue else (self._finished_at or time.monotonic())
+        elapsed = max(end - self._started_at, 1e-9)
+        started = self._completed + self._failed
+
+        providers = {}
+        for name in self._providers:
+            providers[name] = {
+                "jobs": self._jobs[name],
+                "capacity": self.capacity[name],
+                "peak_concurrency": self._peak_running[name],
+                "busy_seconds": round(self._busy_time[name], 1),
+                "utilisation": round(self._busy_time[name] / (self.capacity[name] * elapsed), 3)
+            }
+
+        total_capacity = sum(self.capacity.values())
+        return {
+            "jobs": started,
+            "failed": self._failed,
+            "queued": len(self._queue),
+            "reassigned": self._reassigned,
+            "elapsed_seconds": round(elapsed, 1),
+            "avg_queue_wait": round(self._total_wait / started, 2) if started else 0.0,
+            "overall_utilisation": round(sum(self._busy_time.values()) / (total_capacity * elapsed), 3)
+            if total_capacity else 0.0,
+            "providers": providers
+        }
+
+    def print_utilisation(self):
+        report = self.utilisation()
+        print(f"\n  Debate Scheduler: {report['jobs']} calls in {report.get('elapsed_seconds', 0)}s, "
+              f"{report.get('overall_utilisation', 0):.0%} of provider capacity, "
+              f"{report.get('reassigned', 0)} reassigned, avg queue wait {report.get('avg_queue_wait', 0)}s")
+        for name, data in report["providers"].items():
+            print(f"    {name}: {data['utilisation']:.0%} busy ({data['jobs']} calls, "
+                  f"peak {data['peak_concurrency']}/{data['capacity']})")
+
+
+class ScheduledProvider:
+    """
+    AIProvider stand-in that routes generate() through a DebateScheduler.
+
+    Lets agent classes that hold a provider (BaseAgent.ai_provider) join the
+    global schedule without changes; set round_num as the debate advances.
+    provider is only the preference (swap it to rotate providers), the
+    scheduler may serve the call elsewhere - last_provider records which
+    provider actually answered.
+    """
+
+    def __init__(self, scheduler: DebateScheduler, provider: AIProvider, ticker: str, role: str):
+        self.scheduler = scheduler
+        self.provider = provider
+        self.ticker = ticker
+        self.role = role
+        self.round_num = 0
+        self.last_provider: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return self.provider.name
+
+    async def generate(self, prompt: str, system_prompt: str = None, **kwargs) -> str:
+        self.last_provider, text = await self.scheduler.run(self.ticker, self.round_num, self.role, prompt,
+                                                            system_prompt, preferred=self.provider.name)
+        return text
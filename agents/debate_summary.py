@@ -0,0 +1,202 @@
+"""
+Rolling Debate Summary - Bounded debate context that is compressed once per round
+
+Debate prompts used to carry either the last few messages cut to a few
+hundred characters (losing everything older and most of each argument) or a
+fresh re-summary of the whole log (recomputed every time it was needed).
+
+RollingDebateSummary keeps two things per debate:
+
+- a digest of each completed round: the highest-signal sentences of every
+  message (figures, assumptions, challenges) rather than its first N chars
+- a running summary: when a round completes, one summariser call folds that
+  round into the previous running summary in the background
+
+Prompts for round N get the running summary through round N-2 plus the
+round N-1 digest, so the prompt size stays bounded however long the debate
+runs, and each round is compressed exactly once. The fold for a round
+overlaps the next round, so it is normally ready before anyone needs it.
+"""
+
+import asyncio
+import re
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+SUMMARY_CHARS = 1800       # cap for the running summary
+DIGEST_CHARS = 450         # cap per message in a round digest
+FOLD_INPUT_CHARS = 2500    # cap per message sent to the summariser
+MAX_PENDING_DIGESTS = 2    # unsummarised round digests shown while folds catch up
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain the running summary of a multi-analyst equity research debate. "
+    "Keep every figure, assumption and price target that is still in play, each "
+    "role's current position, and the open disagreements. Drop repetition and rhetoric."
+)
+
+# Sentences mentioning these carry the substance of a debate message
+KEY_TERMS = (
+    "growth", "margin", "wacc", "discount", "terminal", "valuation", "target",
+    "risk", "catalyst", "assum", "disagree", "challenge", "overestimat",
+    "underestimat", "probability", "scenario", "multiple", "cash flow"
+)
+
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+|\n+')
+_HAS_FIGURE = re.compile(r'\d')
+
+# (speaker label, content) - works for DebateMessage and AgentMessage alike
+DebateEntry = Tuple[str, str]
+
+
+def extract_key_points(text: str, max_chars: int) -> str:
+    """
+    Keep the highest-signal sentences of text within max_chars.
+
+    Sentences with figures or debate key terms are preferred; the kept
+    sentences stay in their original order.
+    """
+    text = (text or "").strip()
+    if len(text) <= max_chars:
+        return text
+
+    sentences = [s.strip(" -*#\t") for s in _SENTENCE_SPLIT.split(text)]
+    sentences = [s for s in sentences if len(s) > 20]
+
+    def score(item):
+        index, sentence = item
+        lower = sentence.lower()
+        value = 2 if _HAS_FIGURE.search(sentence) else 0
+        value += sum(1 for term in KEY_TERMS if term in lower)
+        return (-value, index)  # earlier sentences win ties
+
+    kept = []
+    used = 0
+    for index, sentence in sorted(enumerate(sentences), key=score):
+        if used + len(sentence) + 1 > max_chars:
+            continue
+        kept.append((index, sentence))
+        used += len(sentence) + 1
+
+    return " ".join(sentence for _, sentence in sorted(kept)) or text[:max_chars]
+
+
+class RollingDebateSummary:
+    """
+    Per-debate store of round digests and a running summary.
+
+    Usage:
+        store = RollingDebateSummary(ai_manager.generate_with_fallback)
+        ...
+        prompt_context = await store.render(round_num)
+        ... run the round ...
+        store.add_round(round_num, [(f"{m.ai_provider}/{m.role}", m.content) for m in messages])
+
+    Rounds must be added in order. Without a summarise callable (or when it
+    fails) the running summary is built extractively instead.
+    """
+
+    def __init__(self, summarize: Optional[Callable[[str, str], Awaitable[str]]] = None,
+                 summary_chars: int = SUMMARY_CHARS, digest_chars: int = DIGEST_CHARS):
+        self.summarize = summarize
+        self.summary_chars = summary_chars
+        self.digest_chars = digest_chars
+        self._digests: Dict[int, str] = {}
+        self._folds: Dict[int, asyncio.Task] = {}
+        self._last_round = 0
+        self.summarizer_calls = 0
+
+    # ==========================================
+    # Recording
+    # ==========================================
+
+    def digest(self, entries: List[DebateEntry], title: str) -> str:
+        """Digest of a set of debate messages"""
+        lines = [f"[{title}]"]
+        for speaker, content in entries:
+            lines.append(f"- {speaker}: {extract_key_points(content, self.digest_chars)}")
+        return "\n".join(lines)
+
+    def add_round(self, round_num: int, entries: List[DebateEntry]):
+        """Record a completed round and start folding it into the running summary"""
+        if round_num in self._digests:
+            return  # each round is compressed once
+
+        self._digests[round_num] = self.digest(entries, f"Round {round_num} highlights")
+        previous = self._folds.get(self._last_round)
+        self._folds[round_num] = asyncio.create_task(self._fold(round_num, previous, entries))
+        self._last_round = round_num
+
+    async def _fold(self, round_num: int, previous: Optional[asyncio.Task],
+                    entries: List[DebateEntry]) -> str:
+        """Running summary through round_num"""
+        running = await previous if previous else ""
+
+        if self.summarize:
+            transcript = "\n\n".join(f"[{speaker}]: {content[:FOLD_INPUT_CHARS]}" for speaker, content in entries)
+            prompt = f"""RUNNING SUMMARY (through round {round_num - 1}):
+{running or 'None yet - this is the first round.'}
+
+ROUND {round_num} MESSAGES:
+{transcript}
+
+Rewrite the running summary so it also covers round {round_num}.
+Stay under {self.summary_chars // 6} words. Return only the summary."""
+            try:
+                self.summarizer_calls += 1
+                summary = await self.summarize(prompt, SUMMARY_SYSTEM_PROMPT)
+                if summary and summary.strip():
+                    return extract_key_points(summary, self.summary_chars)
+            except Exception as e:
+                print(f"  [DebateSummary] Round {round_num} summariser failed, using extractive summary: {str(e)[:100]}")
+
+        # Extractive fallback: older rounds get less room as the debate grows
+        combined = f"{running}\n{self._digests[round_num]}".strip()
+        return extract_key_points(combined, self.summary_chars) if len(combined) > self.summary_chars else combined
+
+    # ==========================================
+    # Rendering
+    # ==========================================
+
+    def _format(self, summary: str, through_round: int, digests: List[str]) -> str:
+        parts = []
+        if summary:
+            parts.append(f"[Debate summary, rounds 1-{through_round}]\n{summary}")
+        parts.extend(digests)
+        if not parts:
+            return ""
+        return "\n\nPREVIOUS DEBATE:\n" + "\n\n".join(parts) + "\n"
+
+    async def render(self, round_num: int) -> str:
+        """
+        Context for round round_num: running summary through round_num - 2
+        plus the round_num - 1 digest. Waits for that fold if still running.
+        """
+        summary_round = round_num - 2
+        summary = await self._folds[summary_round] if summary_round in self._folds else ""
+        latest = [self._digests[round_num - 1]] if round_num - 1 in self._digests else []
+        return self._format(summary, summary_round, latest)
+
+    def render_available(self, round_num: int) -> str:
+        """
+        Non-blocking context for round round_num from rounds before round_num - 1:
+        the newest finished running summary plus digests of any later rounds.
+        Used by pipelined debates, where round N-1 messages are passed separately.
+        If folds fall behind, only the newest MAX_PENDING_DIGESTS digests are kept
+        so the prompt stays bounded.
+        """
+        through = 0
+        summary = ""
+        for folded_round in sorted(self._folds, reverse=True):
+            task = self._folds[folded_round]
+            if folded_round < round_num - 1 and task.done() and not task.cancelled():
+                through, summary = folded_round, task.result()
+                break
+
+        digests = [self._digests[r] for r in sorted(self._digests) if through < r < round_num - 1]
+        digests = digests[-MAX_PENDING_DIGESTS:]
+        return self._format(summary, through, digests)
+
+    async def final(self) -> str:
+        """Running summary of the whole debate"""
+        if not self._last_round:
+            return ""
+        return await self._folds[self._last_round]
@@ -10,6 +10,8 @@ from .base_agent import BaseAgent, ResearchContext, AgentMessage
 from .analyst_agent import AnalystAgent, BullAgent, BearAgent
 from .critic_agent import CriticAgent, SynthesizerAgent
 from .ai_providers import AIProviderManager
+from .debate_summary import RollingDebateSummary
+from .debate_scheduler import DebateScheduler, ScheduledProvider
 
 # Import visualizer bridge for real-time updates
 try:
@@ -23,9 +25,11 @@ except ImportError:
 class DebateSystem:
     """Orchestrates multi-agent debates for thorough equity research"""
 
-    def __init__(self, ai_manager: AIProviderManager, debate_rounds: int = 10, visualizer=None):
+    def __init__(self, ai_manager: AIProviderManager, debate_rounds: int = 10, visualizer=None,
+                 scheduler: DebateScheduler = None):
         self.ai_manager = ai_manager
         self.debate_rounds = debate_rounds
+        self.scheduler = scheduler  # Global scheduler shared by parallel debates (optional)
 
         # Auto-create visualizer if not provided
         if visualizer is None and VISUALIZER_AVAILABLE:
@@ -56,6 +60,9 @@ class DebateSystem:
         # Store manager for dynamic provider rotation in debates
         self._rotate_providers_each_round = True
 
+        # Rolling debate summaries per ticker (built once per round during phase 2)
+        self._summary_stores: Dict[str, RollingDebateSummary] = {}
+
     async def run_full_research(self, context: ResearchContext,
                                  progress_callback=None) -> ResearchContext:
         """Run complete research process with multi-agent debate"""
@@ -63,6 +70,9 @@ class DebateSystem:
         ticker = context.ticker
         company = context.company_name
 
+        if self.scheduler:
+            self._bind_scheduler(ticker)
+
         # Start visualizer tracking
         if self.visualizer:
             self.visualizer.start_research(ticker, company)
@@ -108,6 +118,39 @@ class DebateSystem:
 
         return context
 
+    def _agents(self) -> List[BaseAgent]:
+        return [self.analyst, self.bull, self.bear, self.critic, self.synthesizer]
+
+    def _bind_scheduler(self, ticker: str):
+        """Route every agent's calls for this ticker through the global scheduler"""
+        for agent in self._agents():
+            provider = agent.ai_provider
+            if isinstance(provider, ScheduledProvider):
+                provider = provider.provider
+            if provider is not None:
+                agent.ai_provider = ScheduledProvider(self.scheduler, provider, ticker, agent.role)
+
+    @staticmethod
+    def _assign_provider(agent: BaseAgent, provider):
+        """Point an agent at provider, keeping its scheduler binding"""
+        if isinstance(agent.ai_provider, ScheduledProvider):
+            agent.ai_provider.provider = provider
+        else:
+            agent.ai_provider = provider
+
+    @staticmethod
+    def _served_by(agent: BaseAgent) -> str:
+        """Name of the provider that answered the agent's last call"""
+        provider = agent.ai_provider
+        if provider is None:
+            return "N/A"
+        return getattr(provider, 'last_provider', None) or provider.name
+
+    def _set_scheduler_round(self, round_num: int):
+        for agent in self._agents():
+            if isinstance(agent.ai_provider, ScheduledProvider):
+                agent.ai_provider.round_num = round_num
+
     async def _phase1_initial_research(self, context: ResearchContext):
         """
         Phase 1: Analyst performs initial research
@@ -166,6 +209,8 @@ class DebateSystem:
         """Phase 2: Multi-agent debate with ROTATING providers for diversity"""
 
         ticker = context.ticker
+        summary_store = RollingDebateSummary(self.ai_manager.generate_with_fallback)
+        self._summary_stores[ticker] = summary_store
 
         for round_num in range(1, self.debate_rounds + 1):
             if progress_callback:
@@ -175,15 +220,17 @@ class DebateSystem:
             if self.visualizer:
                 self.visualizer.update_debate_round(ticker, round_num, self.debate_rounds)
 
+            self._set_scheduler_round(round_num)
+
             # ROTATE PROVIDERS each round to ensure diversity
             # This prevents any single LLM from dominating the debate
             if self._rotate_providers_each_round and len(self.ai_manager.providers) >= 3:
                 providers = self.ai_manager.get_diversified_providers(4)
                 # Rotate based on round number for variety
                 offset = (round_num - 1) % len(providers)
-                self.bull.provider = providers[(0 + offset) % len(providers)]
-                self.bear.provider = providers[(1 + offset) % len(providers)]
-                self.critic.provider = providers[(2 + offset) % len(providers)]
+                self._assign_provider(self.bull, providers[(0 + offset) % len(providers)])
+                self._assign_provider(self.bear, providers[(1 + offset) % len(providers)])
+                self._assign_provider(self.critic, providers[(2 + offset) % len(providers)])
 
             # Get the latest analyst/synthesizer view
             latest_view = self._get_latest_view(context)
@@ -196,10 +243,10 @@ class DebateSystem:
 
             # Include provider info in metadata for tracking
             context.debate_log.append(self.bull.create_message(
-                bull_result, {"round": round_num, "provider": self.bull.provider.name if self.bull.provider else "N/A"}
+                bull_result, {"round": round_num, "provider": self._served_by(self.bull)}
             ))
             context.debate_log.append(self.bear.create_message(
-                bear_result, {"round": round_num, "provider": self.bear.provider.name if self.bear.provider else "N/A"}
+                bear_result, {"round": round_num, "provider": self._served_by(self.bear)}
             ))
 
             # Critic evaluates the debate
@@ -213,9 +260,17 @@ class DebateSystem:
                 critic_result, {"round": round_num}
             ))
 
+            # Compress the round once; agents read the rolling summary instead of truncated messages
+            summary_store.add_round(round_num, [
+                (f"bull/{self._served_by(self.bull)}", bull_result),
+                (f"bear/{self._served_by(self.bear)}", bear_result),
+                ("critic", critic_result)
+            ])
+
             # Every 3 rounds, synthesizer provides interim summary
             if round_num % 3 == 0:
-                interim_synthesis = await self.synthesizer.analyze(context)
+                context.debate_summary = await summary_store.render(round_num + 1)
+                interim_synthesis = await self.synthesizer.analyze(context, use_summary=True)
                 context.debate_log.append(self.synthesizer.create_message(
                     f"Interim Synthesis (Round {round_num}):\n{interim_synthesis}",
                     {"round": round_num, "type": "interim"}
@@ -223,6 +278,7 @@ class DebateSystem:
 
     async def _phase3_external_research(self, context: ResearchContext):
         """Phase 3: Compare with external research sources"""
+        self._set_scheduler_round(self.debate_rounds + 1)
 
         prompt = f"""For {context.company_name} ({context.ticker}), search for and analyze:
 
@@ -271,6 +327,24 @@ Identify:
     async def _summarize_debate(self, context: ResearchContext) -> str:
         """Summarize the debate log to reduce tokens for final synthesis"""
 
+        initial_summary = f"""
+INITIAL ANALYSIS SUMMARY:
+- Industry: {context.industry_analysis[:400] if context.industry_analysis else 'N/A'}...
+- Company: {context.company_analysis[:400] if context.company_analysis else 'N/A'}...
+- Governance: {context.governance_analysis[:300] if context.governance_analysis else 'N/A'}...
+"""
+
+        # Rolling summary from phase 2 - already compressed round by round
+        summary_store = self._summary_stores.pop(context.ticker, None)
+        if summary_store:
+            rolling_summary = await summary_store.final()
+            if rolling_summary:
+                return f"""
+DEBATE SUMMARY for {context.ticker}:
+
+{rolling_summary}
+{initial_summary}"""
+
         # Collect key points from each round
         bull_points = []
         bear_points = []
@@ -296,12 +370,7 @@ KEY BEAR ARGUMENTS:
 
 CRITIC OBSERVATIONS:
 {chr(10).join(f'- {p[:250]}...' for p in critic_points[:2])}
-
-INITIAL ANALYSIS SUMMARY:
-- Industry: {context.industry_analysis[:400] if context.industry_analysis else 'N/A'}...
-- Company: {context.company_analysis[:400] if context.company_analysis else 'N/A'}...
-- Governance: {context.governance_analysis[:300] if context.governance_analysis else 'N/A'}...
-"""
+{initial_summary}"""
         return summary
 
     def _get_latest_view(self, context: ResearchContext) -> str:
@@ -322,16 +391,19 @@ Governance: {context.governance_analysis[:500]}
 class ParallelDebateRunner:
     """Runs debates for multiple equities in parallel"""
 
-    def __init__(self, ai_manager: AIProviderManager, max_concurrent: int = 3):
+    def __init__(self, ai_manager: AIProviderManager, max_concurrent: int = 3,
+                 scheduler: DebateScheduler = None):
         self.ai_manager = ai_manager
         self.max_concurrent = max_concurrent
+        # With a scheduler every equity runs at once and calls are packed per provider
+        self.scheduler = scheduler
 
     async def run_all(self, equities: Dict[str, Dict[str, str]],
                       progress_callback=None) -> Dict[str, ResearchContext]:
         """Run research for all equities with controlled concurrency"""
 
         results = {}
-        semaphore = asyncio.Semaphore(self.max_concurrent)
+        semaphore = asyncio.Semaphore(max(1, len(equities)) if self.scheduler else self.max_concurrent)
 
         async def research_with_semaphore(ticker: str, info: Dict[str, str]):
             async with semaphore:
@@ -342,7 +414,7 @@ class ParallelDebateRunner:
                     industry=info["industry"]
                 )
 
-                debate_system = DebateSystem(self.ai_manager)
+                debate_system = DebateSystem(self.ai_manager, scheduler=self.scheduler)
 
                 def callback(msg):
                     if progress_callback:
@@ -366,4 +438,7 @@ class ParallelDebateRunner:
             else:
                 results[ticker] = ctx
 
+        if self.scheduler:
+            self.scheduler.print_utilisation()
+
         return results
@@ -117,8 +117,7 @@ class HierarchicalDebateSystem:
         # Create resource allocator (manages AI providers)
         self.resource_allocator = ResourceAllocatorAgent(
             ai_provider=self.primary_provider,
-            ai_manager=self.ai_manager,
-            config={'max_provider_errors': 5}
+            ai_manager=self.ai_manager
         )
         await self.resource_allocator.activate()
 
@@ -285,7 +284,13 @@ class HierarchicalDebateSystem:
         try:
             # Run all quality gates
             result = await gatekeeper.run_all_gates(context)
+            self.resource_allocator.report_success(provider.name)
             return result
+        except Exception as e:
+            # Gate API errors are absorbed inside the gatekeeper (and already on
+            # the provider's breaker) - whatever escapes is a failed gate run
+            self.resource_allocator.report_error(provider.name, str(e))
+            raise
         finally:
             await gatekeeper.terminate()
 
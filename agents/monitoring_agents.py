@@ -12,6 +12,8 @@ from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+from agents.peer_index import get_peer_index
+
 # Visualizer integration
 try:
     from visualizer.visualizer_bridge import VisualizerBridge
@@ -341,6 +343,8 @@ class ListMonitorAgent:
             print(f"  [ListMonitor] New companies detected: {new_tickers}")
         if removed_tickers:
             print(f"  [ListMonitor] Companies removed: {removed_tickers}")
+        if has_changes:
+            get_peer_index()  # syncs with list.txt, loading only the new tickers
 
         return new_tickers, removed_tickers, has_changes
 
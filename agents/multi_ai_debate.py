@@ -8,12 +8,13 @@ import asyncio
 import json
 import os
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 
 # Import AI providers
 from agents.ai_providers import AIProviderManager
+from agents.debate_summary import RollingDebateSummary
 
 class DebateRole(Enum):
     ANALYST = "analyst"      # Primary research and valuation
@@ -22,6 +23,16 @@ class DebateRole(Enum):
     CRITIC = "critic"        # Challenges all assumptions
     SYNTHESIZER = "synthesizer"  # Reconciles views into final thesis
 
+# Previous-round messages each role responds to in pipelined debates.
+# Every role also waits for its own previous round, so the critic (which
+# reads everyone) stays one step behind and the advocates answer each other.
+ROLE_DEPENDENCIES = {
+    DebateRole.ANALYST: [DebateRole.BEAR, DebateRole.CRITIC],
+    DebateRole.BULL: [DebateRole.BEAR, DebateRole.CRITIC],
+    DebateRole.BEAR: [DebateRole.BULL, DebateRole.CRITIC],
+    DebateRole.CRITIC: [DebateRole.ANALYST, DebateRole.BULL, DebateRole.BEAR],
+}
+
 @dataclass
 class DebateMessage:
     """Single message in a debate round"""
@@ -90,9 +101,13 @@ class MultiAIDebateOrchestrator:
     Each AI takes on different roles and challenges others' assumptions.
     """
 
-    def __init__(self, api_keys: Dict[str, str], num_rounds: int = 10):
+    def __init__(self, api_keys: Dict[str, str], num_rounds: int = 10, pipelined: bool = False,
+                 rolling_summary: bool = True, scheduler=None):
         self.provider_manager = AIProviderManager(api_keys)
+        self.scheduler = scheduler  # agents.debate_scheduler.DebateScheduler shared across tickers
         self.num_rounds = num_rounds
+        self.pipelined = pipelined  # Start each role's next round as soon as its inputs exist
+        self.rolling_summary = rolling_summary  # Summarise rounds once instead of truncating messages
         self.debate_log: List[DebateRound] = []
 
     def _get_role_system_prompt(self, role: DebateRole, equity_context: str) -> str:
@@ -156,28 +171,34 @@ YOUR ROLE: SYNTHESIZER
 
         return role_prompts[role]
 
-    async def _get_ai_response(self, provider_name: str, role: DebateRole,
-                                prompt: str, equity_context: str) -> Optional[str]:
-        """Get response from specific AI provider with role"""
-        provider = self.provider_manager.get_provider(provider_name)
-        if not provider:
-            return None
+    async def _get_ai_response(self, provider_name: str, role: DebateRole, prompt: str, equity_context: str,
+                               ticker: str = "", round_num: int = 0) -> Tuple[str, Optional[str]]:
+        """
+        Get response from specific AI provider with role.
 
+        Returns (provider that answered, response). With a scheduler the call
+        may be served by another provider when the assigned one is saturated.
+        """
         system_prompt = self._get_role_system_prompt(role, equity_context)
 
         try:
-            response = await provider.generate(prompt, system_prompt)
-            return response
+            if self.scheduler:
+                return await self.scheduler.run(ticker, round_num, role.value, prompt, system_prompt,
+                                                preferred=provider_name)
+
+            provider = self.provider_manager.get_provider(provider_name)
+            if not provider:
+                return provider_name, None
+            response = await self.provider_manager.generate_coalesced(provider, prompt, system_prompt)
+            return provider_name, response
         except Exception as e:
             print(f"Error from {provider_name}: {e}")
-            return None
-
-    async def run_debate_round(self, round_num: int, equity_data: Dict,
-                               previous_messages: List[DebateMessage]) -> DebateRound:
-        """Run a single round of debate across all AIs"""
+            return provider_name, None
 
+    def _build_equity_context(self, equity_data: Dict) -> str:
+        """Equity context shared by every role's system prompt"""
         # Reduced context size to avoid token limits (30K TPM for OpenAI)
-        equity_context = f"""
+        return f"""
 Ticker: {equity_data.get('ticker')}
 Company: {equity_data.get('company')}
 Sector: {equity_data.get('sector')}
@@ -185,15 +206,28 @@ Research Summary: {json.dumps(equity_data.get('executive_summary', ''), indent=2
 Key Financials: {json.dumps(equity_data.get('financial_data', {}), indent=2)[:400]}
 """
 
-        # Build context from previous messages (reduced from 10 to 5, 500 to 300 chars)
+    def _new_summary_store(self) -> Optional[RollingDebateSummary]:
+        """Rolling summary for one debate (None = truncate previous messages instead)"""
+        if not self.rolling_summary:
+            return None
+        return RollingDebateSummary(self.provider_manager.generate_with_fallback)
+
+    @staticmethod
+    def _summary_entries(messages: List[DebateMessage]):
+        return [(f"{m.ai_provider}/{m.role}", m.content) for m in messages]
+
+    def _format_prev_context(self, previous_messages: List[DebateMessage]) -> str:
+        """Prior debate messages a role responds to"""
+        # Reduced from 10 to 5 messages, 500 to 300 chars
         prev_context = ""
         if previous_messages:
             prev_context = "\n\nPREVIOUS DEBATE:\n"
             for msg in previous_messages[-5:]:  # Last 5 messages only
                 prev_context += f"\n[{msg.ai_provider}/{msg.role}]: {msg.content[:300]}...\n"
+        return prev_context
 
-        messages = []
-
+    def _assign_roles(self, round_num: int) -> Dict[DebateRole, str]:
+        """Assign each debate role a provider for this round"""
         # Assign roles to different AIs for this round using BALANCED distribution
         # Use get_diversified_providers to ensure no single LLM dominates
         providers = self.provider_manager.get_diversified_providers(4)
@@ -204,22 +238,23 @@ Key Financials: {json.dumps(equity_data.get('financial_data', {}), indent=2)[:40
         if len(provider_names) >= 4:
             # Full diversity: each role gets unique provider
             offset = (round_num - 1) % len(provider_names)
-            role_assignments = {
+            return {
                 DebateRole.ANALYST: provider_names[(0 + offset) % len(provider_names)],
                 DebateRole.BULL: provider_names[(1 + offset) % len(provider_names)],
                 DebateRole.BEAR: provider_names[(2 + offset) % len(provider_names)],
                 DebateRole.CRITIC: provider_names[(3 + offset) % len(provider_names)],
             }
-        else:
-            # Fallback for fewer providers - still rotate
-            role_assignments = {
-                DebateRole.ANALYST: provider_names[round_num % len(provider_names)] if provider_names else "GPT",
-                DebateRole.BULL: provider_names[(round_num + 1) % len(provider_names)] if provider_names else "Gemini",
-                DebateRole.BEAR: provider_names[(round_num + 2) % len(provider_names)] if provider_names else "Grok",
-                DebateRole.CRITIC: provider_names[(round_num + 3) % len(provider_names)] if provider_names else "Qwen",
-            }
 
-        # Phase-specific prompts
+        # Fallback for fewer providers - still rotate
+        return {
+            DebateRole.ANALYST: provider_names[round_num % len(provider_names)] if provider_names else "GPT",
+            DebateRole.BULL: provider_names[(round_num + 1) % len(provider_names)] if provider_names else "Gemini",
+            DebateRole.BEAR: provider_names[(round_num + 2) % len(provider_names)] if provider_names else "Grok",
+            DebateRole.CRITIC: provider_names[(round_num + 3) % len(provider_names)] if provider_names else "Qwen",
+        }
+
+    def _build_round_prompt(self, round_num: int, role: DebateRole, prev_context: str) -> str:
+        """Phase-specific prompt for one role in one round"""
         if round_num <= 3:
             phase = "INITIAL POSITIONS"
             phase_instruction = "Establish your initial position with clear arguments and evidence."
@@ -233,12 +268,7 @@ Key Financials: {json.dumps(equity_data.get('financial_data', {}), indent=2)[:40
             phase = "FINAL SYNTHESIS"
             phase_instruction = "Provide your final view incorporating all debate insights."
 
-        # Get responses from each AI in their roles (in parallel)
-        tasks = []
-        role_provider_pairs = []
-
-        for role, provider_name in role_assignments.items():
-            prompt = f"""
+        return f"""
 DEBATE ROUND {round_num}/10 - PHASE: {phase}
 
 {phase_instruction}
@@ -248,14 +278,43 @@ DEBATE ROUND {round_num}/10 - PHASE: {phase}
 As the {role.value.upper()}, provide your analysis and arguments.
 Be specific, quantitative, and challenge weak assumptions.
 """
-            tasks.append(self._get_ai_response(provider_name, role, prompt, equity_context))
-            role_provider_pairs.append((role, provider_name))
+
+    def _build_round(self, round_num: int, messages: List[DebateMessage]) -> DebateRound:
+        """Wrap a round's messages with its disagreements and consensus"""
+        return DebateRound(
+            round_num=round_num,
+            messages=messages,
+            key_disagreements=self._extract_disagreements(messages),
+            consensus_points=self._extract_consensus(messages)
+        )
+
+    async def run_debate_round(self, round_num: int, equity_data: Dict,
+                               previous_messages: List[DebateMessage],
+                               summary_store: RollingDebateSummary = None) -> DebateRound:
+        """Run a single round of debate across all AIs"""
+        equity_context = self._build_equity_context(equity_data)
+        if summary_store:
+            prev_context = await summary_store.render(round_num)
+        else:
+            prev_context = self._format_prev_context(previous_messages)
+        role_assignments = self._assign_roles(round_num)
+
+        # Get responses from each AI in their roles (in parallel)
+        tasks = []
+        roles = []
+
+        for role, provider_name in role_assignments.items():
+            prompt = self._build_round_prompt(round_num, role, prev_context)
+            tasks.append(self._get_ai_response(provider_name, role, prompt, equity_context,
+                                               equity_data.get('ticker', ''), round_num))
+            roles.append(role)
 
         # Run all AI calls in parallel
         responses = await asyncio.gather(*tasks)
 
         # Collect messages
-        for (role, provider_name), response in zip(role_provider_pairs, responses):
+        messages = []
+        for role, (provider_name, response) in zip(roles, responses):
             if response:
                 messages.append(DebateMessage(
                     round_num=round_num,
@@ -266,16 +325,92 @@ Be specific, quantitative, and challenge weak assumptions.
                     challenges=[]
                 ))
 
-        # Identify disagreements and consensus
-        disagreements = self._extract_disagreements(messages)
-        consensus = self._extract_consensus(messages)
+        return self._build_round(round_num, messages)
 
-        return DebateRound(
-            round_num=round_num,
-            messages=messages,
-            key_disagreements=disagreements,
-            consensus_points=consensus
-        )
+    async def run_pipelined_rounds(self, equity_data: Dict, progress_callback=None,
+                                   summary_store: RollingDebateSummary = None) -> List[DebateRound]:
+        """
+        Run all rounds without a barrier between them.
+
+        Each role works through its rounds in order, and its round-N call
+        starts as soon as the round N-1 messages it responds to (see
+        ROLE_DEPENDENCIES) exist, rather than when all of round N-1 is done.
+        Slow calls only hold up the roles that read them. With a summary
+        store, older rounds come from whatever running summary is ready.
+        """
+        ticker = equity_data.get('ticker', '')
+        equity_context = self._build_equity_context(equity_data)
+        roles = list(ROLE_DEPENDENCIES)
+        loop = asyncio.get_running_loop()
+
+        # One future per (round, role), resolved with its DebateMessage (None on failure)
+        outputs = {
+            (round_num, role): loop.create_future()
+            for round_num in range(1, self.num_rounds + 1) for role in roles
+        }
+        assignments: Dict[int, Dict[DebateRole, str]] = {}
+
+        def record_if_complete(round_num: int):
+            # Rounds complete in order (the critic reads every role), so folds stay ordered
+            round_outputs = [outputs[(round_num, role)] for role in roles]
+            if summary_store and all(f.done() for f in round_outputs):
+                messages = [f.result() for f in round_outputs if f.result()]
+                summary_store.add_round(round_num, self._summary_entries(messages))
+
+        async def run_role(role: DebateRole):
+            round_num = 0
+            try:
+                for round_num in range(1, self.num_rounds + 1):
+                    previous = []
+                    if round_num > 1:
+                        previous = await asyncio.gather(
+                            *(outputs[(round_num - 1, dep)] for dep in ROLE_DEPENDENCIES[role])
+                        )
+
+                    # Providers for a round are assigned when its first role starts
+                    if round_num not in assignments:
+                        assignments[round_num] = self._assign_roles(round_num)
+                        print(f"  Round {round_num}/{self.num_rounds} started ({role.value})...")
+                        if progress_callback:
+                            progress_callback(round_num, self.num_rounds, ticker)
+
+                    provider_name = assignments[round_num][role]
+                    previous = [m for m in previous if m]
+                    if summary_store:
+                        prev_context = summary_store.render_available(round_num)
+                        if previous:
+                            prev_context += "\n" + summary_store.digest(
+                                self._summary_entries(previous), f"Round {round_num - 1} messages you are answering"
+                            ) + "\n"
+                    else:
+                        prev_context = self._format_prev_context(previous)
+                    prompt = self._build_round_prompt(round_num, role, prev_context)
+                    provider_name, response = await self._get_ai_response(provider_name, role, prompt,
+                                                                          equity_context, ticker, round_num)
+
+                    outputs[(round_num, role)].set_result(DebateMessage(
+                        round_num=round_num,
+                        role=role.value,
+                        ai_provider=provider_name,
+                        content=response,
+                        timestamp=datetime.now().isoformat(),
+                        challenges=[]
+                    ) if response else None)
+                    record_if_complete(round_num)
+            finally:
+                # Never leave dependants waiting on a role that stopped early
+                for remaining in range(max(round_num, 1), self.num_rounds + 1):
+                    if not outputs[(remaining, role)].done():
+                        outputs[(remaining, role)].set_result(None)
+                        record_if_complete(remaining)
+
+        await asyncio.gather(*(run_role(role) for role in roles))
+
+        debate_rounds = []
+        for round_num in range(1, self.num_rounds + 1):
+            messages = [outputs[(round_num, role)].result() for role in roles]
+            debate_rounds.append(self._build_round(round_num, [m for m in messages if m]))
+        return debate_rounds
 
     def _extract_disagreements(self, messages: List[DebateMessage]) -> List[str]:
         """Extract key points of disagreement from messages"""
@@ -319,23 +454,30 @@ Be specific, quantitative, and challenge weak assumptions.
 
         all_messages = []
         debate_rounds = []
+        summary_store = self._new_summary_store()
 
-        for round_num in range(1, self.num_rounds + 1):
-            print(f"  Round {round_num}/{self.num_rounds}...")
+        if self.pipelined:
+            debate_rounds = await self.run_pipelined_rounds(equity_data, progress_callback, summary_store)
+        else:
+            for round_num in range(1, self.num_rounds + 1):
+                print(f"  Round {round_num}/{self.num_rounds}...")
 
-            # Call progress callback for visualizer updates
-            if progress_callback:
-                progress_callback(round_num, self.num_rounds, ticker)
+                # Call progress callback for visualizer updates
+                if progress_callback:
+                    progress_callback(round_num, self.num_rounds, ticker)
 
-            round_result = await self.run_debate_round(round_num, equity_data, all_messages)
-            debate_rounds.append(round_result)
-            all_messages.extend(round_result.messages)
+                round_result = await self.run_debate_round(round_num, equity_data, all_messages, summary_store)
+                debate_rounds.append(round_result)
+                all_messages.extend(round_result.messages)
+                if summary_store:
+                    summary_store.add_round(round_num, self._summary_entries(round_result.messages))
 
-            # Brief pause to avoid rate limiting
-            await asyncio.sleep(1)
+                # Brief pause to avoid rate limiting
+                await asyncio.sleep(1)
 
         # Final synthesis
-        final_thesis = await self._generate_final_synthesis(equity_data, debate_rounds)
+        debate_summary = await summary_store.final() if summary_store else ""
+        final_thesis = await self._generate_final_synthesis(equity_data, debate_rounds, debate_summary)
 
         result = DebateResult(
             ticker=equity_data.get('ticker', ''),
@@ -363,8 +505,8 @@ Be specific, quantitative, and challenge weak assumptions.
 
         return result
 
-    async def _generate_final_synthesis(self, equity_data: Dict,
-                                        debate_rounds: List[DebateRound]) -> Dict[str, Any]:
+    async def _generate_final_synthesis(self, equity_data: Dict, debate_rounds: List[DebateRound],
+                                        debate_summary: str = "") -> Dict[str, Any]:
         """Generate final synthesis from all debate rounds"""
 
         # Collect all key points
@@ -389,6 +531,9 @@ DISAGREEMENTS:
 CONSENSUS:
 {json.dumps(all_consensus[:5], indent=2)}
 
+DEBATE SUMMARY:
+{debate_summary or 'N/A'}
+
 RESEARCH:
 {json.dumps(equity_data.get('executive_summary', ''), indent=2)[:600]}
 
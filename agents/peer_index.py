@@ -0,0 +1,506 @@
+"""
+Peer Index - Nearest-neighbour search for comparable companies
+
+Ranks candidate comparables for a ticker by distance over one feature
+vector per company:
+
+- sector:          one-hot (weighted highest - peers should share a sector)
+- industry:        multi-hot over '/'-separated parts, so "Biotechnology"
+                   and "Biotechnology/Oncology" partly match
+- size:            log10 market cap
+- growth:          base-case revenue growth (years 1-3)
+- margin:          EBIT margin
+
+Numeric features are z-scored across the index; a missing value sits at the
+mean. Features come from cached fundamentals only - config.EQUITIES and
+context/{ticker}_context.json for sector/industry, and the saved
+context/{ticker}_valuation_inputs.json for market data - so building and
+querying never touch a market data API.
+
+The universe is list.txt. sync() compares it with the indexed tickers and
+loads only the new ones (and drops removed ones), then rebuilds the matrix.
+update() - run after every saved valuation - is incremental: it overwrites
+(or appends) one company's raw row and re-standardises the numeric columns
+with array operations; the sector / industry blocks are only rebuilt when a
+new sector or industry part appears. A top-k query is one vectorised
+distance pass plus argpartition (well under a millisecond for thousands of
+companies).
+
+Usage:
+    index = get_peer_index()
+    index.sync()
+    for match in index.query("9926 HK", k=5):
+        print(match.ticker, match.similarity)
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from agents.valuation.assumption_extractor import PeerData
+
+ROOT_DIR = Path(__file__).parent.parent
+LIST_FILE = ROOT_DIR / "list.txt"
+CONTEXT_DIR = ROOT_DIR / "context"
+
+# Feature weights (applied after z-scoring the numeric features)
+SECTOR_WEIGHT = 3.0
+INDUSTRY_WEIGHT = 1.5
+SIZE_WEIGHT = 1.0
+GROWTH_WEIGHT = 1.0
+MARGIN_WEIGHT = 1.0
+NUMERIC_WEIGHTS = np.array([SIZE_WEIGHT, GROWTH_WEIGHT, MARGIN_WEIGHT]) if HAS_NUMPY else None
+
+# Region filter -> ticker exchange suffix
+REGION_EXCHANGES = {
+    'US': ('US',),
+    'HK': ('HK',),
+    'CN': ('CH',),
+}
+
+
+def normalize_ticker(ticker: str) -> str:
+    """'6682 HK Equity' / '6682_HK' / '6682 hk' -> '6682 HK'"""
+    ticker = ticker.replace('_', ' ').strip().upper()
+    if ticker.endswith(' EQUITY'):
+        ticker = ticker[:-len(' EQUITY')].strip()
+    return ' '.join(ticker.split())
+
+
+def parse_list_file(path: Path) -> Dict[str, str]:
+    """list.txt lines ('6682 HK Equity<TAB> NAME') -> {ticker: name}"""
+    equities = {}
+    if not path.exists():
+        return equities
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            ticker, _, name = line.partition('\t')
+            equities[normalize_ticker(ticker)] = name.strip() or normalize_ticker(ticker)
+    return equities
+
+
+@dataclass
+class PeerFeatures:
+    """Cached fundamentals of one company"""
+    ticker: str
+    name: str
+    sector: str = ""
+    industry: str = ""
+    market_cap: Optional[float] = None
+    revenue_growth: Optional[float] = None
+    ebit_margin: Optional[float] = None
+
+    # Multiples (for PeerData)
+    pe_ratio: Optional[float] = None
+    ev_ebitda: Optional[float] = None
+    ev_revenue: Optional[float] = None
+    price_to_book: Optional[float] = None
+
+    @property
+    def has_features(self) -> bool:
+        return bool(self.sector or self.industry) or any(
+            v is not None for v in (self.market_cap, self.revenue_growth, self.ebit_margin)
+        )
+
+    def to_peer_data(self) -> PeerData:
+        return PeerData(
+            ticker=self.ticker,
+            name=self.name,
+            market_cap=self.market_cap or 0.0,
+            pe_ratio=self.pe_ratio,
+            ev_ebitda=self.ev_ebitda,
+            ev_revenue=self.ev_revenue,
+            price_to_book=self.price_to_book,
+            revenue_growth=self.revenue_growth,
+            ebit_margin=self.ebit_margin
+        )
+
+
+@dataclass
+class PeerMatch:
+    """One ranked comparable"""
+    ticker: str
+    name: str
+    sector: str
+    industry: str
+    distance: float
+    similarity: float  # 1 / (1 + distance)
+    features: PeerFeatures
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'ticker': self.ticker,
+            'name': self.name,
+            'sector': self.sector,
+            'industry': self.industry,
+            'market_cap': self.features.market_cap,
+            'revenue_growth': self.features.revenue_growth,
+            'ebit_margin': self.features.ebit_margin,
+            'distance': round(self.distance, 4),
+            'similarity': round(self.similarity, 4)
+        }
+
+
+def load_peer_features(
+    ticker: str,
+    name: Optional[str] = None,
+    context_dir: Optional[Path] = None
+) -> PeerFeatures:
+    """Build features for ticker from cached fundamentals (missing values stay None)"""
+    ticker = normalize_ticker(ticker)
+    context_dir = Path(context_dir or CONTEXT_DIR)
+    key = ticker.replace(' ', '_')
+    features = PeerFeatures(ticker=ticker, name=name or ticker)
+
+    try:
+        from config import EQUITIES
+    except ImportError:
+        EQUITIES = {}
+    meta = EQUITIES.get(ticker, {})
+    features.sector = meta.get('sector', '')
+    features.industry = meta.get('industry', '')
+    if meta.get('name') and not name:
+        features.name = meta['name']
+
+    context_file = context_dir / f"{key}_context.json"
+    if context_file.exists() and not (features.sector and features.industry):
+        try:
+            with open(context_file, 'r', encoding='utf-8') as f:
+                context = json.load(f)
+            features.sector = features.sector or context.get('sector') or ''
+            features.industry = features.industry or context.get('industry') or ''
+        except (OSError, ValueError) as e:
+            print(f"[PeerIndex] Could not read {context_file.name}: {e}")
+
+    inputs_file = context_dir / f"{key}_valuation_inputs.json"
+    if inputs_file.exists():
+        try:
+            with open(inputs_file, 'r', encoding='utf-8') as f:
+                inputs = json.load(f)
+            md = inputs.get('market_data', {})
+            features.market_cap = md.get('market_cap') or None
+            features.ebit_margin = md.get('ebit_margin')
+            features.pe_ratio = md.get('pe_ratio')
+            features.ev_ebitda = md.get('ev_ebitda')
+            features.ev_revenue = md.get('ev_revenue')
+            features.price_to_book = md.get('price_to_book')
+            base = inputs.get('scenarios', {}).get('base', {})
+            features.revenue_growth = base.get('revenue_growth_y1_3')
+        except (OSError, ValueError) as e:
+            print(f"[PeerIndex] Could not read {inputs_file.name}: {e}")
+
+    return features
+
+
+class PeerIndex:
+    """
+    Feature matrix over the equity universe with top-k nearest-neighbour queries.
+
+    Usage:
+        index = PeerIndex()
+        index.sync()                          # load new list.txt tickers
+        matches = index.query("762 HK", k=3)
+        peers = index.peer_data("762 HK")     # PeerData for CompsEngine
+    """
+
+    def __init__(self, list_file: Optional[Path] = None, context_dir: Optional[Path] = None):
+        self.list_file = Path(list_file or LIST_FILE)
+        self.context_dir = Path(context_dir or CONTEXT_DIR)
+        self._entries: Dict[str, PeerFeatures] = {}
+        self._list_mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+        # Built by _rebuild()
+        self._tickers: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._matrix = None
+        self._sector_column = None
+        self._exchange_column = None
+        self._market_caps = None
+        self._raw = None            # (N, 3) unstandardised numeric features
+        self._categorical = None    # (N, sectors + industry parts) weighted one-hot blocks
+        self._sectors: List[str] = []
+        self._industry_parts: List[str] = []
+        self._means = None
+        self._stds = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, ticker: str) -> bool:
+        return normalize_ticker(ticker) in self._entries
+
+    def sync(self, force: bool = False) -> Dict[str, List[str]]:
+        """
+        Bring the index in line with list.txt.
+
+        Only tickers new to the list have their fundamentals loaded; removed
+        tickers are dropped. Does nothing if list.txt is unchanged since the
+        last sync (unless force).
+
+        Returns:
+            {'added': [...], 'removed': [...]}
+        """
+        try:
+            mtime = os.stat(self.list_file).st_mtime
+        except OSError:
+            mtime = None
+        if not force and mtime is not None and mtime == self._list_mtime:
+            return {'added': [], 'removed': []}
+
+        universe = parse_list_file(self.list_file)
+        with self._lock:
+            added = [t for t in universe if t not in self._entries]
+            removed = [t for t in self._entries if t not in universe]
+            for ticker in removed:
+                del self._entries[ticker]
+            for ticker in added:
+                self._entries[ticker] = load_peer_features(ticker, universe[ticker], self.context_dir)
+            self._list_mtime = mtime
+            if added or removed or self._matrix is None:
+                self._rebuild()
+
+        if added or removed:
+            print(f"[PeerIndex] Synced with {self.list_file.name}: +{len(added)} / -{len(removed)} "
+                  f"({len(self._entries)} companies)")
+        return {'added': added, 'removed': removed}
+
+    def update(self, features: PeerFeatures):
+        """
+        Add or replace one company's features (e.g. after a new valuation is saved).
+
+        Only that company's row is rewritten, unless it brings a sector or
+        industry part the index has no column for yet.
+        """
+        with self._lock:
+            self._entries[features.ticker] = features
+            if not HAS_NUMPY:
+                return
+            new_columns = (
+                (features.sector and features.sector not in self._sectors) or
+                any(p not in self._industry_parts for p in self._split_industry(features.industry))
+            )
+            if self._matrix is None or new_columns:
+                self._rebuild()
+                return
+
+            row = self._rows.get(features.ticker)
+            if row is None:
+                row = len(self._tickers)
+                self._tickers.append(features.ticker)
+                self._rows[features.ticker] = row
+                self._sector_column = np.append(self._sector_column, None)
+                self._exchange_column = np.append(self._exchange_column, features.ticker.rsplit(' ', 1)[-1])
+                self._market_caps = np.append(self._market_caps, np.nan)
+                self._raw = np.vstack([self._raw, np.full((1, 3), np.nan)])
+                self._categorical = np.vstack([self._categorical, np.zeros((1, self._categorical.shape[1]))])
+
+            self._sector_column[row] = features.sector
+            self._market_caps[row] = np.nan if features.market_cap is None else features.market_cap
+            self._raw[row] = self._numeric(features)
+            self._categorical[row] = self._categorical_vector(features)
+            self._restandardise()
+
+    def refresh(self, ticker: str):
+        """Reload an indexed ticker's features from the cached fundamentals"""
+        ticker = normalize_ticker(ticker)
+        current = self._entries.get(ticker)
+        if current is not None:
+            self.update(load_peer_features(ticker, current.name, self.context_dir))
+
+    def get(self, ticker: str) -> Optional[PeerFeatures]:
+        return self._entries.get(normalize_ticker(ticker))
+
+    def _rebuild(self):
+        """Recompute the standardised, weighted feature matrix (caller holds the lock)"""
+        if not HAS_NUMPY:
+            return
+        entries = list(self._entries.values())
+        self._tickers = [e.ticker for e in entries]
+        self._rows = {t: i for i, t in enumerate(self._tickers)}
+        self._sectors = sorted({e.sector for e in entries if e.sector})
+        self._industry_parts = sorted({p for e in entries for p in self._split_industry(e.industry)})
+
+        # Filter columns
+        self._sector_column = np.array([e.sector for e in entries], dtype=object)
+        self._exchange_column = np.array([t.rsplit(' ', 1)[-1] for t in self._tickers], dtype=object)
+        self._market_caps = np.array(
+            [np.nan if e.market_cap is None else e.market_cap for e in entries], dtype=float
+        )
+
+        self._raw = np.array([self._numeric(e) for e in entries], dtype=float).reshape(len(entries), 3)
+        self._categorical = np.array([self._categorical_vector(e) for e in entries], dtype=float).reshape(
+            len(entries), len(self._sectors) + len(self._industry_parts)
+        )
+        self._restandardise()
+
+    def _restandardise(self):
+        """Z-score the raw numeric columns and reassemble the weighted matrix"""
+        numeric = self._raw
+        # Column mean / std over the known values (a column with none scales to 0 / 1)
+        known = ~np.isnan(numeric)
+        counts = np.maximum(known.sum(axis=0), 1)
+        filled = np.where(known, numeric, 0.0)
+        self._means = filled.sum(axis=0) / counts
+        variance = (np.where(known, numeric - self._means, 0.0) ** 2).sum(axis=0) / counts
+        self._stds = np.where(variance > 0, np.sqrt(variance), 1.0)
+
+        scaled = np.where(known, (numeric - self._means) / self._stds, 0.0)
+        self._matrix = np.hstack([self._categorical, scaled * NUMERIC_WEIGHTS])
+
+    @staticmethod
+    def _split_industry(industry: str) -> List[str]:
+        return [p.strip().lower() for p in industry.split('/') if p.strip()]
+
+    @staticmethod
+    def _numeric(features: PeerFeatures) -> List[float]:
+        log_cap = np.log10(features.market_cap) if features.market_cap and features.market_cap > 0 else np.nan
+        return [
+            log_cap,
+            np.nan if features.revenue_growth is None else features.revenue_growth,
+            np.nan if features.ebit_margin is None else features.ebit_margin,
+        ]
+
+    def _categorical_vector(self, features: PeerFeatures):
+        """Weighted sector one-hot and industry multi-hot in the index's current columns"""
+        sector = np.array([s == features.sector for s in self._sectors], dtype=float) * SECTOR_WEIGHT
+
+        parts = self._split_industry(features.industry)
+        industry = np.array([p in parts for p in self._industry_parts], dtype=float)
+        if parts:
+            industry *= INDUSTRY_WEIGHT / np.sqrt(len(parts))
+        return np.concatenate([sector, industry])
+
+    def _vector(self, features: PeerFeatures):
+        """Weighted feature vector in the index's current coordinates"""
+        numeric = (np.array(self._numeric(features)) - self._means) / self._stds
+        numeric = np.nan_to_num(numeric) * NUMERIC_WEIGHTS
+        return np.concatenate([self._categorical_vector(features), numeric])
+
+    def query(
+        self,
+        ticker: str,
+        k: int = 5,
+        sector: Optional[str] = None,
+        same_sector: bool = False,
+        market_cap_range: Optional[Sequence[float]] = None,
+        region: Optional[str] = None,
+        exclude: Iterable[str] = ()
+    ) -> List[PeerMatch]:
+        """
+        Top-k most similar companies to ticker.
+
+        Args:
+            ticker: Target (indexed, or with cached fundamentals on disk)
+            k: Number of peers
+            sector: Only peers in this sector
+            same_sector: Only peers in the target's sector (none if the
+                target's sector is unknown)
+            market_cap_range: [min, max] market cap
+            region: 'US', 'HK', 'CN' or 'GLOBAL'
+            exclude: Tickers to leave out (the target always is)
+
+        Returns:
+            Matches ordered by similarity (empty if the target has no features)
+        """
+        if not HAS_NUMPY:
+            return []
+        ticker = normalize_ticker(ticker)
+        if self._matrix is None:
+            self.sync()
+
+        target = self._entries.get(ticker) or load_peer_features(ticker, context_dir=self.context_dir)
+        if not target.has_features or not self._tickers:
+            return []
+
+        row = self._rows.get(ticker)
+        vector = self._matrix[row] if row is not None else self._vector(target)
+        distances = np.sqrt(((self._matrix - vector) ** 2).sum(axis=1))
+
+        mask = np.ones(len(self._tickers), dtype=bool)
+        for t in {ticker} | {normalize_ticker(t) for t in exclude}:
+            if t in self._rows:
+                mask[self._rows[t]] = False
+        if same_sector and not sector:
+            if not target.sector:
+                return []
+            sector = target.sector
+        if sector:
+            mask &= self._sector_column == sector
+        region_exchanges = REGION_EXCHANGES.get((region or 'GLOBAL').upper())
+        if region_exchanges:
+            mask &= np.isin(self._exchange_column, region_exchanges)
+        if market_cap_range:
+            with np.errstate(invalid='ignore'):
+                mask &= (self._market_caps >= market_cap_range[0]) & (self._market_caps <= market_cap_range[1])
+
+        candidates = np.flatnonzero(mask)
+        if len(candidates) == 0:
+            return []
+        k = min(k, len(candidates))
+        nearest = candidates[np.argpartition(distances[candidates], k - 1)[:k]]
+        nearest = nearest[np.argsort(distances[nearest], kind='stable')]
+
+        matches = []
+        for i in nearest:
+            entry = self._entries[self._tickers[i]]
+            distance = float(distances[i])
+            matches.append(PeerMatch(
+                ticker=entry.ticker,
+                name=entry.name,
+                sector=entry.sector,
+                industry=entry.industry,
+                distance=distance,
+                similarity=1 / (1 + distance),
+                features=entry
+            ))
+        return matches
+
+    def peer_data(self, ticker: str, k: int = 5, same_sector: bool = True, **filters) -> List[PeerData]:
+        """
+        Nearest peers as PeerData for CompsEngine - only peers with at least
+        one cached multiple.
+        """
+        matches = self.query(ticker, k=len(self._tickers), same_sector=same_sector, **filters)
+        peers = []
+        for match in matches:
+            f = match.features
+            if any(v for v in (f.pe_ratio, f.ev_ebitda, f.ev_revenue, f.price_to_book)):
+                peers.append(f.to_peer_data())
+            if len(peers) == k:
+                break
+        return peers
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'companies': len(self._entries),
+            'sectors': len(self._sectors),
+            'industry_parts': len(self._industry_parts),
+            'with_market_data': sum(1 for e in self._entries.values() if e.market_cap),
+            'list_file': str(self.list_file)
+        }
+
+
+# Global index (built from list.txt on first use)
+_peer_index: Optional[PeerIndex] = None
+
+
+def get_peer_index() -> PeerIndex:
+    """The process-wide peer index, synced with list.txt"""
+    global _peer_index
+    if _peer_index is None:
+        _peer_index = PeerIndex()
+    _peer_index.sync()
+    return _peer_index
@@ -0,0 +1,170 @@
+"""
+Shared Rate Limiter - Token buckets coordinated across processes via SQLite.
+
+The default TokenBucketRateLimiter in ai_providers.py lives in a module-level
+dict, so every Python process believes it owns the whole TPM budget. Running
+several run_workflow_live.py processes, or main.py alongside run_debates.py,
+then produces 429 storms because the buckets never see each other's traffic.
+
+This backend keeps the bucket state in a small SQLite table on local disk.
+Every acquire is one short BEGIN IMMEDIATE transaction (well under a
+millisecond on a local SSD), so all processes on the machine draw from the
+same budget without a separate coordinator process. Under contention a
+transaction can wait up to the busy timeout for another process's write
+lock, so async callers run it in a worker thread and never block the event
+loop (and every other provider's calls) while they wait.
+
+Enable it with RATE_LIMIT_BACKEND = "sqlite" in config.py (or the
+RATE_LIMIT_BACKEND environment variable).
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Tuple
+
+
+class SharedTokenBucketRateLimiter:
+    """
+    Token bucket rate limiter whose state is shared through SQLite.
+
+    Same interface as TokenBucketRateLimiter. The one behavioural difference
+    is that acquire() reserves the tokens immediately and lets the bucket go
+    into debt; the returned wait time is how long the caller must sleep
+    until that debt is repaid. This keeps each acquire to a single
+    transaction and serves competing processes in arrival order.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS token_buckets (
+            name TEXT PRIMARY KEY,
+            tokens_per_minute REAL NOT NULL,
+            available_tokens REAL NOT NULL,
+            last_refill REAL NOT NULL
+        )
+    """
+
+    # One connection per database file per process
+    _connections: Dict[str, Tuple[sqlite3.Connection, threading.Lock]] = {}
+    _connections_lock = threading.Lock()
+
+    def __init__(self, tokens_per_minute: int, name: str = "default", db_path: str = None):
+        self.tokens_per_minute = tokens_per_minute
+        self.name = name
+        self.db_path = os.path.abspath(db_path or "rate_limits.db")
+        self._conn, self._conn_lock = self._get_connection(self.db_path)
+        self._ensure_bucket()
+
+    @classmethod
+    def _get_connection(cls, db_path: str):
+        with cls._connections_lock:
+            if db_path not in cls._connections:
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+                conn = sqlite3.connect(
+                    db_path,
+                    timeout=10.0,
+                    isolation_level=None,  # explicit transactions only
+                    check_same_thread=False
+                )
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(cls._SCHEMA)
+                cls._connections[db_path] = (conn, threading.Lock())
+            return cls._connections[db_path]
+
+    def _ensure_bucket(self):
+        """Create the bucket row (full) if no other process has yet"""
+        with self._conn_lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO token_buckets "
+                "(name, tokens_per_minute, available_tokens, last_refill) VALUES (?, ?, ?, ?)",
+                (self.name, self.tokens_per_minute, self.tokens_per_minute, time.time())
+            )
+
+    def _transact(self, tokens_delta: float) -> float:
+        """
+        Refill the bucket, apply tokens_delta and return the new balance.
+
+        Runs as a single BEGIN IMMEDIATE transaction so concurrent processes
+        serialise on the write lock instead of racing on read-modify-write.
+        """
+        with self._conn_lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                row = cur.execute(
+                    "SELECT available_tokens, last_refill FROM token_buckets WHERE name = ?",
+                    (self.name,)
+                ).fetchone()
+                now = time.time()
+                if row is None:
+                    available = float(self.tokens_per_minute)
+                else:
+                    available, last_refill = row
+                    elapsed = max(0.0, now - last_refill)
+                    available = min(
+                        self.tokens_per_minute,
+                        available + (elapsed / 60.0) * self.tokens_per_minute
+                    )
+
+                available = min(self.tokens_per_minute, available + tokens_delta)
+
+                cur.execute(
+                    "INSERT OR REPLACE INTO token_buckets "
+                    "(name, tokens_per_minute, available_tokens, last_refill) VALUES (?, ?, ?, ?)",
+                    (self.name, self.tokens_per_minute, available, now)
+                )
+                cur.execute("COMMIT")
+                return available
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+
+    @property
+    def available_tokens(self) -> float:
+        """Current shared balance (negative while callers are waiting on debt)"""
+        return self._transact(0.0)
+
+    async def acquire(self, tokens_needed: int) -> float:
+        """
+        Reserve tokens for an API call.
+
+        Args:
+            tokens_needed: Estimated tokens for this request
+
+        Returns:
+            Wait time in seconds before the call may proceed (0 if none)
+        """
+        balance = await asyncio.to_thread(self._transact, -tokens_needed)
+        if balance >= 0:
+            return 0.0
+
+        wait_seconds = (-balance / self.tokens_per_minute) * 60.0
+        print(f"  [{self.name}] Shared rate limit: waiting {wait_seconds:.1f}s for {tokens_needed} tokens...")
+        return wait_seconds
+
+    async def wait_and_acquire(self, tokens_needed: int):
+        """Reserve tokens, sleeping until the shared budget covers them"""
+        wait_time = await self.acquire(tokens_needed)
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+    def report_actual_usage(self, actual_tokens: int, estimated_tokens: int):
+        """Give back over-reserved tokens to the shared bucket"""
+        diff = estimated_tokens - actual_tokens
+        if diff <= 0:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._transact(diff)
+            return
+        future = loop.run_in_executor(None, self._transact, diff)
+        future.add_done_callback(self._log_refund_error)
+
+    def _log_refund_error(self, future: asyncio.Future):
+        """Report a refund that failed in the executor instead of dropping it"""
+        if not future.cancelled() and future.exception() is not None:
+            print(f"  [{self.name}] Shared rate limit: token refund failed: {future.exception()}")
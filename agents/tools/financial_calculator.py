@@ -10,6 +10,14 @@ from dataclasses import dataclass, field
 from decimal import Decimal, ROUND_HALF_UP
 import math
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from agents.wacc_cache import get_wacc_cache
+
 
 @dataclass
 class DCFInputs:
@@ -92,34 +100,33 @@ class FinancialCalculator:
         """
         Calculate WACC with full formula transparency.
 
+        Memoised in the shared WACC cache (agents.wacc_cache), so repeated
+        calls - including the compute_wacc MCP tool - are lookups.
+
         Returns:
             (wacc, cost_of_equity, calculation_string)
         """
-        equity_ratio = 1 - debt_ratio
-
-        # Cost of Equity using CAPM
-        cost_of_equity = risk_free_rate + beta * equity_risk_premium + country_risk_premium
-
-        # After-tax cost of debt
-        after_tax_cost_of_debt = cost_of_debt * (1 - tax_rate)
-
-        # WACC
-        wacc = (equity_ratio * cost_of_equity) + (debt_ratio * after_tax_cost_of_debt)
+        cache = get_wacc_cache()
+        args = (risk_free_rate, beta, equity_risk_premium, country_risk_premium, cost_of_debt, tax_rate, debt_ratio)
+        rates = cache.wacc(*args)
 
         # Build calculation string for transparency
-        calc_str = f"""WACC Calculation:
+        def breakdown():
+            return f"""WACC Calculation:
         Cost of Equity (Re) = Rf + β × ERP + CRP
         Re = {risk_free_rate:.2%} + {beta:.2f} × {equity_risk_premium:.2%} + {country_risk_premium:.2%}
-        Re = {cost_of_equity:.2%}
+        Re = {rates.cost_of_equity:.2%}
 
         After-tax Cost of Debt = Rd × (1 - T)
-        After-tax Rd = {cost_of_debt:.2%} × (1 - {tax_rate:.2%}) = {after_tax_cost_of_debt:.2%}
+        After-tax Rd = {cost_of_debt:.2%} × (1 - {tax_rate:.2%}) = {rates.after_tax_cost_of_debt:.2%}
 
         WACC = (E/V) × Re + (D/V) × Rd × (1-T)
-        WACC = {equity_ratio:.2%} × {cost_of_equity:.2%} + {debt_ratio:.2%} × {after_tax_cost_of_debt:.2%}
-        WACC = {wacc:.2%}"""
+        WACC = {rates.equity_ratio:.2%} × {rates.cost_of_equity:.2%} + {debt_ratio:.2%} × {rates.after_tax_cost_of_debt:.2%}
+        WACC = {rates.wacc:.2%}"""
 
-        return wacc, cost_of_equity, calc_str
+        calc_str = cache.memo(('calculator_wacc_calculation',) + args, breakdown)
+
+        return rates.wacc, rates.cost_of_equity, calc_str
 
     @staticmethod
     def calculate_fcf(
@@ -183,9 +190,10 @@ class FinancialCalculator:
     @staticmethod
     def npv(cash_flows: List[float], discount_rate: float) -> float:
         """Calculate Net Present Value of cash flows"""
+        discount_factors = get_wacc_cache().discount_factors(discount_rate, len(cash_flows))
         npv = 0.0
-        for i, cf in enumerate(cash_flows):
-            npv += cf / ((1 + discount_rate) ** (i + 1))
+        for cf, factor in zip(cash_flows, discount_factors):
+            npv += cf * factor
         return npv
 
     @staticmethod
@@ -269,6 +277,7 @@ class DCFCalculator:
         margin_step = (inputs.target_margin - inputs.ebit_margin) / inputs.margin_improvement_years
 
         fcf_list = []
+        discount_factors = get_wacc_cache().discount_factors(wacc, self.projection_years)
 
         for year in range(1, self.projection_years + 1):
             # Determine growth rate by phase
@@ -311,8 +320,8 @@ class DCFCalculator:
                 'capex': capex,
                 'working_capital_change': wc_change,
                 'fcf': fcf,
-                'discount_factor': 1 / ((1 + wacc) ** year),
-                'pv_fcf': fcf / ((1 + wacc) ** year)
+                'discount_factor': discount_factors[year - 1],
+                'pv_fcf': fcf * discount_factors[year - 1]
             })
 
         # Step 3: Calculate Terminal Value
@@ -322,7 +331,7 @@ class DCFCalculator:
         )
 
         # Discount terminal value to present
-        pv_terminal = self.calc.discount_value(terminal_value, wacc, self.projection_years)
+        pv_terminal = terminal_value * discount_factors[-1]
 
         # Step 4: Sum PV of FCFs
         pv_fcfs = sum(proj['pv_fcf'] for proj in yearly_projections)
@@ -342,8 +351,8 @@ class DCFCalculator:
         # Step 7: Per Share Value
         fair_value_per_share = equity_value / inputs.shares_outstanding
 
-        # Step 8: Build sensitivity table
-        sensitivity_table = self._build_sensitivity_table(inputs, wacc)
+        # Step 8: Build sensitivity table (reuses the FCF stream - it does not depend on WACC or g)
+        sensitivity_table = self._build_sensitivity_table(inputs, wacc, fcf_list)
 
         return DCFOutput(
             enterprise_value=enterprise_value,
@@ -364,52 +373,113 @@ class DCFCalculator:
     def _build_sensitivity_table(
         self,
         inputs: DCFInputs,
-        base_wacc: float
+        base_wacc: float,
+        fcfs: List[float],
+        wacc_points: int = 5,
+        tg_points: int = 5,
+        wacc_step: float = 0.01,
+        tg_step: float = 0.005
     ) -> Dict[str, Dict[str, float]]:
-        """Build WACC vs Terminal Growth sensitivity table"""
-        wacc_range = [base_wacc - 0.02, base_wacc - 0.01, base_wacc, base_wacc + 0.01, base_wacc + 0.02]
-        tg_range = [inputs.terminal_growth - 0.01, inputs.terminal_growth - 0.005,
-                    inputs.terminal_growth, inputs.terminal_growth + 0.005, inputs.terminal_growth + 0.01]
-
-        table = {}
-        for wacc in wacc_range:
-            wacc_key = f"{wacc:.1%}"
-            table[wacc_key] = {}
-            for tg in tg_range:
+        """
+        Build WACC vs Terminal Growth sensitivity table.
+
+        Grid centred on the base WACC and terminal growth; every cell is a
+        full DCF revaluation of the same FCF stream. Cells with WACC <= g are inf.
+        """
+        wacc_range = self._centred_range(base_wacc, wacc_step, wacc_points)
+        tg_range = self._centred_range(inputs.terminal_growth, tg_step, tg_points)
+        grid = self.sensitivity_grid(inputs, fcfs, wacc_range, tg_range)
+
+        wacc_keys = self._rate_labels(wacc_range, 1)
+        tg_keys = self._rate_labels(tg_range, 2)
+        return {
+            wacc_key: dict(zip(tg_keys, row))
+            for wacc_key, row in zip(wacc_keys, grid)
+        }
+
+    def sensitivity_table(
+        self,
+        inputs: DCFInputs,
+        output: DCFOutput,
+        wacc_points: int = 50,
+        tg_points: int = 50,
+        wacc_step: float = 0.001,
+        tg_step: float = 0.0005
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Sensitivity table of any size for an existing DCF result (e.g. 50x50 heat maps).
+
+        Args:
+            inputs: Inputs the output was calculated from
+            output: DCFOutput from calculate()
+            wacc_points / tg_points: Grid size
+            wacc_step / tg_step: Spacing between grid points
+        """
+        fcfs = [proj['fcf'] for proj in output.yearly_projections]
+        return self._build_sensitivity_table(
+            inputs, output.wacc, fcfs, wacc_points, tg_points, wacc_step, tg_step
+        )
+
+    def sensitivity_grid(
+        self,
+        inputs: DCFInputs,
+        fcfs: List[float],
+        wacc_values: List[float],
+        tg_values: List[float]
+    ) -> List[List[float]]:
+        """
+        Fair value per share for every (WACC, terminal growth) pair.
+
+        FV = (Σ FCF_t / (1+WACC)^t + TV / (1+WACC)^N - net debt) / shares
+        TV = FCF_N × (1+g) / (WACC-g)
+
+        Returns:
+            Rows per WACC value, columns per terminal growth value (inf where WACC <= g)
+        """
+        years = len(fcfs)
+        terminal_fcf = fcfs[-1]
+
+        if HAS_NUMPY:
+            wacc = np.asarray(wacc_values, dtype=float)[:, None]
+            tg = np.asarray(tg_values, dtype=float)[None, :]
+            discount = get_wacc_cache().discount_matrix(wacc_values, years)  # (waccs, years)
+            pv_fcfs = discount @ np.asarray(fcfs, dtype=float)
+            valid = wacc > tg
+            with np.errstate(divide='ignore', invalid='ignore'):
+                terminal_value = terminal_fcf * (1 + tg) / (wacc - tg)
+                enterprise_value = pv_fcfs[:, None] + terminal_value * discount[:, -1:]
+                values = (enterprise_value - inputs.net_debt) / inputs.shares_outstanding
+            return np.where(valid, values, float('inf')).tolist()
+
+        grid = []
+        for wacc in wacc_values:
+            pv_fcfs = self.calc.npv(fcfs, wacc)
+            row = []
+            for tg in tg_values:
                 if wacc > tg:
-                    # Recalculate with different WACC and terminal growth
-                    modified_inputs = DCFInputs(
-                        revenue_base=inputs.revenue_base,
-                        ebit_margin=inputs.ebit_margin,
-                        tax_rate=inputs.tax_rate,
-                        depreciation=inputs.depreciation,
-                        capex=inputs.capex,
-                        working_capital_change=inputs.working_capital_change,
-                        growth_phase1=inputs.growth_phase1,
-                        growth_phase2=inputs.growth_phase2,
-                        growth_phase3=inputs.growth_phase3,
-                        terminal_growth=tg,
-                        target_margin=inputs.target_margin,
-                        margin_improvement_years=inputs.margin_improvement_years,
-                        risk_free_rate=inputs.risk_free_rate,
-                        beta=inputs.beta,
-                        equity_risk_premium=inputs.equity_risk_premium,
-                        country_risk_premium=inputs.country_risk_premium,
-                        cost_of_debt=inputs.cost_of_debt,
-                        debt_ratio=inputs.debt_ratio,
-                        shares_outstanding=inputs.shares_outstanding,
-                        net_debt=inputs.net_debt
-                    )
-                    # Simple recalc - just terminal value impact
-                    # This is a simplified sensitivity
-                    base_result = self.calculate(inputs)
-                    tv_multiplier = (base_wacc - inputs.terminal_growth) / (wacc - tg)
-                    adjusted_value = base_result.fair_value_per_share * (0.5 + 0.5 * tv_multiplier)
-                    table[wacc_key][f"{tg:.2%}"] = adjusted_value
+                    terminal_value = terminal_fcf * (1 + tg) / (wacc - tg)
+                    enterprise_value = pv_fcfs + self.calc.discount_value(terminal_value, wacc, years)
+                    row.append((enterprise_value - inputs.net_debt) / inputs.shares_outstanding)
                 else:
-                    table[wacc_key][f"{tg:.2%}"] = float('inf')
+                    row.append(float('inf'))
+            grid.append(row)
+        return grid
 
-        return table
+    @staticmethod
+    def _centred_range(centre: float, step: float, points: int) -> List[float]:
+        """points values spaced by step around centre (centre included when points is odd)"""
+        offset = (points - 1) / 2
+        return [centre + (i - offset) * step for i in range(points)]
+
+    @staticmethod
+    def _rate_labels(values: List[float], decimals: int) -> List[str]:
+        """Percent labels with enough decimals to keep every grid point distinct"""
+        while decimals < 6:
+            labels = [f"{v:.{decimals}%}" for v in values]
+            if len(set(labels)) == len(labels):
+                return labels
+            decimals += 1
+        return [f"{v:.{decimals}%}" for v in values]
 
     def calculate_scenarios(
         self,
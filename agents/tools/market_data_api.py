@@ -13,6 +13,8 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 import re
 
+from agents.peer_index import get_peer_index
+
 
 @dataclass
 class StockQuote:
@@ -485,8 +487,14 @@ class MarketDataAPI:
             print(f"Error fetching analyst estimates for {ticker}: {e}")
             return None
 
-    async def get_peers(self, ticker: str) -> List[str]:
+    async def get_peers(self, ticker: str, max_results: int = 5) -> List[str]:
         """Get list of peer/comparable companies"""
+        # Nearest same-sector neighbours from the local peer index (cached fundamentals);
+        # the index only knows the coverage list, so too few matches fall through to Yahoo
+        index_peers = [m.ticker for m in get_peer_index().query(ticker, k=max_results, same_sector=True)]
+        if len(index_peers) >= max_results:
+            return index_peers
+
         yahoo_ticker, exchange, currency = self._normalize_ticker(ticker)
 
         try:
@@ -504,11 +512,11 @@ class MarketDataAPI:
             peers = []
 
             # Return industry/sector for now
-            return peers
+            return peers or index_peers
 
         except Exception as e:
             print(f"Error fetching peers for {ticker}: {e}")
-            return []
+            return index_peers
 
     async def verify_price(self, ticker: str, claimed_price: float, tolerance: float = 0.05) -> Dict[str, Any]:
         """
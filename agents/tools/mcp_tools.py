@@ -18,6 +18,7 @@ import json
 from .financial_calculator import FinancialCalculator, DCFCalculator, DCFInputs
 from .market_data_api import MarketDataAPI
 from .validation_tools import ValidationTools
+from agents.peer_index import get_peer_index
 
 # Import utilities
 import sys
@@ -405,18 +406,49 @@ class MCPToolExecutor:
         max_peers = params.get("max_peers", 5)
 
         try:
-            # Get company info first to determine sector if not provided
-            info = self.market_api.get_company_info(ticker)
-            if not sector and info:
-                sector = info.get("sector")
-
-            # Get peers from market API
-            peers = self.market_api.get_peers(
-                ticker=ticker,
+            # Local similarity index over cached fundamentals first (no API calls).
+            # Same sector only - the coverage list is small, so the nearest names
+            # in other sectors are not comparables
+            index = get_peer_index()
+            matches = index.query(
+                ticker,
+                k=max_peers,
                 sector=sector,
+                same_sector=True,
                 market_cap_range=market_cap_range,
-                max_results=max_peers
+                region=region
+            )
+            index_result = MCPToolResult(
+                success=True,
+                data={
+                    "target_ticker": ticker,
+                    "sector": sector or (index.get(ticker).sector if ticker in index else None),
+                    "peers": [m.to_dict() for m in matches],
+                    "peer_count": len(matches),
+                    "source": "peer_index"
+                }
             )
+            if len(matches) >= max_peers:
+                return index_result
+
+            try:
+                # Get company info first to determine sector if not provided
+                info = self.market_api.get_company_info(ticker)
+                if not sector and info:
+                    sector = info.get("sector")
+
+                # Get peers from market API
+                peers = self.market_api.get_peers(
+                    ticker=ticker,
+                    sector=sector,
+                    market_cap_range=market_cap_range,
+                    max_results=max_peers
+                )
+            except Exception as e:
+                if not matches:
+                    raise
+                index_result.warnings.append(f"Peer API lookup failed: {e}")
+                return index_result
 
             if peers:
                 return MCPToolResult(
@@ -429,6 +461,10 @@ class MCPToolExecutor:
                     }
                 )
 
+            # Fewer than max_peers same-sector matches beat none
+            if matches:
+                return index_result
+
             return MCPToolResult(
                 success=True,
                 data={
@@ -71,14 +71,14 @@ TOOL_REGISTRY: Dict[str, ToolEntry] = {
     ),
     "get_peer_companies": ToolEntry(
         name="get_peer_companies",
-        description="Find comparable peer companies for valuation",
+        description="Find comparable peer companies for valuation (nearest same-sector neighbours from the local peer index, then the market data API)",
         category=ToolCategory.MCP,
         status=ToolStatus.AVAILABLE,
         module="agents.tools.mcp_tools",
         function_or_class="MCPToolExecutor._invoke_get_peer_companies",
         used_by=["Comparable Validator"],
-        inputs={"ticker": "str", "sector": "str", "market_cap_range": "list", "max_peers": "int"},
-        outputs={"peers": "list", "sector": "str", "peer_count": "int"}
+        inputs={"ticker": "str", "sector": "str", "market_cap_range": "list", "region": "str", "max_peers": "int"},
+        outputs={"peers": "list", "sector": "str", "peer_count": "int", "source": "str"}
     ),
     "get_peer_multiples": ToolEntry(
         name="get_peer_multiples",
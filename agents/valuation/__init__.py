@@ -9,6 +9,7 @@ Methods:
 - Comps (Comparable Company Analysis)
 - DDM (Dividend Discount Model)
 - Reverse DCF (What growth does current price imply?)
+- Monte Carlo DCF (fair value distribution across the scenario ranges)
 
 All methods use Python math, not AI hallucination.
 
@@ -32,10 +33,17 @@ from .assumption_agents import (  # NEW: AI-powered extraction agents
     extract_validated_assumptions,
     ExtractedAssumptions
 )
-from .engines import DCFEngine, CompsEngine, DDMEngine, ReverseDCFEngine
+from .engines import DCFEngine, CompsEngine, DDMEngine, ReverseDCFEngine, MonteCarloEngine
 from .cross_checker import CrossChecker, CrossCheckResult
 from .consensus_builder import ConsensusBuilder, ConsensusValuation
-from .valuation_orchestrator import ValuationOrchestrator, run_valuation_node
+from .valuation_orchestrator import (
+    ValuationOrchestrator,
+    run_valuation_node,
+    get_last_valuation_inputs,
+    get_last_valuation_state,
+    restore_valuation_state,
+    fingerprint_valuation_inputs
+)
 
 __all__ = [
     # Assumption extraction
@@ -55,6 +63,7 @@ __all__ = [
     'CompsEngine',
     'DDMEngine',
     'ReverseDCFEngine',
+    'MonteCarloEngine',
     # Cross-check and consensus
     'CrossChecker',
     'CrossCheckResult',
@@ -62,5 +71,9 @@ __all__ = [
     'ConsensusValuation',
     # Main orchestrator
     'ValuationOrchestrator',
-    'run_valuation_node'
+    'run_valuation_node',
+    'get_last_valuation_inputs',
+    'get_last_valuation_state',
+    'restore_valuation_state',
+    'fingerprint_valuation_inputs'
 ]
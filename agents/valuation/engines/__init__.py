@@ -5,9 +5,10 @@ Each engine takes the SAME structured inputs and produces a fair value estimate.
 No AI is involved in calculations - just pure mathematical formulas.
 """
 
-from .dcf_engine import DCFEngine
-from .comps_engine import CompsEngine
+from .dcf_engine import DCFEngine, DCFGreeks, DCFSensitivities
+from .comps_engine import CompsEngine, PeerTable
 from .ddm_engine import DDMEngine
 from .reverse_dcf_engine import ReverseDCFEngine
+from .monte_carlo_engine import MonteCarloEngine
 
-__all__ = ['DCFEngine', 'CompsEngine', 'DDMEngine', 'ReverseDCFEngine']
+__all__ = ['DCFEngine', 'DCFGreeks', 'DCFSensitivities', 'CompsEngine', 'PeerTable', 'DDMEngine', 'ReverseDCFEngine', 'MonteCarloEngine']
@@ -9,14 +9,156 @@ This engine values a company by applying peer multiples:
 
 The target's financials are multiplied by peer median multiples
 to derive implied values.
+
+With NumPy, peers are held as a columnar PeerTable and all multiples are
+summarised in one pass (medians, trimmed means, quantiles, and regressions
+of multiples on revenue growth). Statistics are cached per sector and peer
+set, so every ticker valued against the same sector universe reuses them.
 """
 
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Tuple, Optional, Iterable
+from dataclasses import dataclass, field, replace
+from collections import OrderedDict
+import hashlib
 import statistics
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 from ..assumption_extractor import ValuationInputs, PeerData
 
+# Multiple -> (PeerData field, valid range) - values outside the range are outliers
+MULTIPLE_RANGES = {
+    'pe': ('pe_ratio', 0, 100),
+    'ev_ebitda': ('ev_ebitda', 0, 50),
+    'ev_revenue': ('ev_revenue', 0, 20),
+    'pb': ('price_to_book', 0, 20),
+}
+
+# Multiples regressed on a peer driver (multiple -> driver column)
+REGRESSIONS = {
+    'ev_revenue': 'revenue_growth',
+    'ev_ebitda': 'revenue_growth',
+}
+
+TRIM_FRACTION = 0.10              # cut from each tail for the trimmed mean
+REPORTED_QUANTILES = (10, 25, 75, 90)
+MIN_REGRESSION_PEERS = 5
+MAX_CACHED_PEER_STATS = 128
+DEFAULT_INDEX_PEERS = 5           # peers taken from the peer index when none are provided
+
+# Placeholder peers that must never count as real comparables
+PLACEHOLDER_TICKERS = ("PEER_AVG",)
+PLACEHOLDER_NAMES = ("Industry Average",)
+
+
+class PeerTable:
+    """
+    Peer universe stored by column - one float array per PeerData field.
+
+    Usage:
+        table = PeerTable.from_peers(peers)                 # from PeerData
+        table = PeerTable(tickers, names, pe_ratio=[...])   # sector-wide columns
+    """
+
+    COLUMNS = ('market_cap', 'pe_ratio', 'ev_ebitda', 'ev_revenue', 'price_to_book',
+               'revenue_growth', 'ebit_margin')
+
+    def __init__(self, tickers: List[str], names: Optional[List[str]] = None, **columns):
+        self.tickers = list(tickers)
+        self.names = list(names) if names is not None else list(self.tickers)
+        for name in self.COLUMNS:
+            values = columns.get(name)
+            if values is None:
+                column = np.full(len(self.tickers), np.nan)
+            else:
+                column = np.array([np.nan if v is None else v for v in values], dtype=float)
+            setattr(self, name, column)
+        self._fingerprint: Optional[str] = None
+
+    @classmethod
+    def from_peers(cls, peers: Iterable[PeerData]) -> 'PeerTable':
+        peers = list(peers)
+        return cls(
+            [p.ticker for p in peers],
+            [p.name for p in peers],
+            **{name: [getattr(p, name) for p in peers] for name in cls.COLUMNS}
+        )
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the peer set and its values (cache key)"""
+        if self._fingerprint is None:
+            digest = hashlib.sha256("|".join(self.tickers).encode())
+            for name in self.COLUMNS:
+                digest.update(getattr(self, name).tobytes())
+            self._fingerprint = digest.hexdigest()[:16]
+        return self._fingerprint
+
+    def real_mask(self, exclude: Iterable[str] = ()):
+        """Rows that are real peers (no placeholders, no excluded tickers)"""
+        excluded = set(exclude)
+        return np.array([
+            t not in PLACEHOLDER_TICKERS and n not in PLACEHOLDER_NAMES and t not in excluded
+            for t, n in zip(self.tickers, self.names)
+        ], dtype=bool)
+
+
+@dataclass
+class MultipleStats:
+    """Distribution of one multiple across the peers"""
+    count: int
+    median: Optional[float]
+    trimmed_mean: Optional[float]
+    quantiles: Dict[str, float]  # {'p10': ..., 'p25': ..., 'p75': ..., 'p90': ...}
+
+
+@dataclass
+class MultipleRegression:
+    """OLS fit multiple = intercept + slope x driver across the peers"""
+    multiple: str
+    driver: str
+    slope: float
+    intercept: float
+    r_squared: float
+    count: int
+
+    def predict(self, driver_value: float) -> float:
+        return self.intercept + self.slope * driver_value
+
+
+@dataclass
+class PeerStatistics:
+    """Peer multiple statistics for one peer set (cached per sector)"""
+    sector: Optional[str]
+    fingerprint: str
+    peer_count: int
+    peers_used: List[str]
+    multiples: Dict[str, MultipleStats]
+    regressions: Dict[str, MultipleRegression]
+
+
+# Statistics per (sector, peer table fingerprint, excluded tickers), least recently used evicted first
+_peer_stats_cache: "OrderedDict[Tuple, PeerStatistics]" = OrderedDict()
+
+
+def get_cached_peer_statistics(sector: str) -> Optional[PeerStatistics]:
+    """Most recently built or used statistics for a sector"""
+    for (cached_sector, _, _), stats in reversed(_peer_stats_cache.items()):
+        if cached_sector == sector:
+            return stats
+    return None
+
+
+def clear_peer_stats_cache():
+    _peer_stats_cache.clear()
+
 
 @dataclass
 class CompsResult:
@@ -53,6 +195,11 @@ class CompsResult:
     is_valid: bool
     warnings: List[str]
 
+    # Peer distribution and regression-based values (vectorised path only)
+    peer_statistics: Optional[PeerStatistics] = None
+    regression_multiples: Dict[str, float] = field(default_factory=dict)  # fitted at the target's growth
+    implied_from_regression: Dict[str, float] = field(default_factory=dict)
+
 
 class CompsEngine:
     """
@@ -72,44 +219,65 @@ class CompsEngine:
             'pb': 0.10
         }
 
-    def calculate(self, inputs: ValuationInputs) -> CompsResult:
+    def calculate(
+        self,
+        inputs: ValuationInputs,
+        peer_table: Optional[PeerTable] = None,
+        sector: Optional[str] = None
+    ) -> CompsResult:
         """
         Run comparable company analysis.
 
         Args:
             inputs: Complete valuation inputs with peer data
+            peer_table: Optional sector-wide peer universe (used instead of
+                inputs.peers; the target's own row is excluded)
+            sector: Sector name - peer statistics are cached per sector
 
         Returns:
             CompsResult with implied values
         """
         warnings = []
         md = inputs.market_data
+        stats = None
+
+        peers = inputs.peers
+        if peer_table is None and not peers:
+            peers = self._get_default_peers(md)
+            if peers:
+                warnings.append(f"Peers selected from local peer index (none provided): "
+                                f"{', '.join(p.ticker for p in peers)}")
+
+        if peer_table is None and HAS_NUMPY and peers:
+            peer_table = PeerTable.from_peers(peers)
+            exclude = ()
+        else:
+            exclude = (inputs.ticker,)
 
-        # Get peer multiples
-        if inputs.peers and len(inputs.peers) > 0:
-            # Filter out fake/placeholder peers
-            real_peers = [p for p in inputs.peers if p.ticker != "PEER_AVG" and p.name != "Industry Average"]
-            if real_peers:
-                peers = real_peers
-            else:
-                peers = []
+        if peer_table is not None and len(peer_table) > 0:
+            stats = self.peer_statistics(peer_table, sector=sector, exclude=exclude)
+            peer_names = stats.peers_used
+            if not peer_names:
                 warnings.append("CRITICAL: No real peer data - comps valuation unreliable")
+
+            median_pe = stats.multiples['pe'].median
+            median_ev_ebitda = stats.multiples['ev_ebitda'].median
+            median_ev_revenue = stats.multiples['ev_revenue'].median
+            median_pb = stats.multiples['pb'].median
         else:
-            # NO FAKE PEER DATA - mark comps as unavailable
-            peers = []
-            warnings.append("CRITICAL: No peer data provided - comps valuation NOT AVAILABLE")
-            warnings.append("To fix: Provide real comparable company data from broker research or yfinance")
-
-        # Calculate median multiples
-        pe_values = [p.pe_ratio for p in peers if p.pe_ratio and 0 < p.pe_ratio < 100]
-        ev_ebitda_values = [p.ev_ebitda for p in peers if p.ev_ebitda and 0 < p.ev_ebitda < 50]
-        ev_rev_values = [p.ev_revenue for p in peers if p.ev_revenue and 0 < p.ev_revenue < 20]
-        pb_values = [p.price_to_book for p in peers if p.price_to_book and 0 < p.price_to_book < 20]
-
-        median_pe = statistics.median(pe_values) if pe_values else None
-        median_ev_ebitda = statistics.median(ev_ebitda_values) if ev_ebitda_values else None
-        median_ev_revenue = statistics.median(ev_rev_values) if ev_rev_values else None
-        median_pb = statistics.median(pb_values) if pb_values else None
+            peers = self._real_peers(peers, warnings)
+            peer_names = [p.name for p in peers]
+
+            # Calculate median multiples
+            pe_values = [p.pe_ratio for p in peers if p.pe_ratio and 0 < p.pe_ratio < 100]
+            ev_ebitda_values = [p.ev_ebitda for p in peers if p.ev_ebitda and 0 < p.ev_ebitda < 50]
+            ev_rev_values = [p.ev_revenue for p in peers if p.ev_revenue and 0 < p.ev_revenue < 20]
+            pb_values = [p.price_to_book for p in peers if p.price_to_book and 0 < p.price_to_book < 20]
+
+            median_pe = statistics.median(pe_values) if pe_values else None
+            median_ev_ebitda = statistics.median(ev_ebitda_values) if ev_ebitda_values else None
+            median_ev_revenue = statistics.median(ev_rev_values) if ev_rev_values else None
+            median_pb = statistics.median(pb_values) if pb_values else None
 
         # Calculate implied values
         implied_values = {}
@@ -187,8 +355,11 @@ class CompsEngine:
         else:
             recommendation = "HOLD"
 
+        # Regression-implied values at the target's own growth (reported, not weighted)
+        regression_multiples, implied_from_regression = self._regression_values(stats, inputs)
+
         # Mark as invalid if no real peers were used
-        has_real_peers = len(peers) > 0
+        has_real_peers = len(peer_names) > 0
         is_valid = weighted_target > 0 and has_real_peers
 
         if not has_real_peers:
@@ -199,8 +370,8 @@ class CompsEngine:
             ticker=inputs.ticker,
             current_price=md.current_price,
             currency=md.currency,
-            peer_count=len(peers),
-            peers_used=[p.name for p in peers] if peers else ["NONE - No real peer data available"],
+            peer_count=len(peer_names),
+            peers_used=peer_names if peer_names else ["NONE - No real peer data available"],
             median_pe=median_pe,
             median_ev_ebitda=median_ev_ebitda,
             median_ev_revenue=median_ev_revenue,
@@ -214,9 +385,231 @@ class CompsEngine:
             implied_upside=implied_upside if has_real_peers else 0.0,
             recommendation=recommendation,
             is_valid=is_valid,
-            warnings=warnings
+            warnings=warnings,
+            peer_statistics=stats,
+            regression_multiples=regression_multiples,
+            implied_from_regression=implied_from_regression
         )
 
+    def reprice(self, result: CompsResult, inputs: ValuationInputs) -> CompsResult:
+        """
+        Revalue a CompsResult after a market data tick (price, net debt).
+
+        Peer medians and the methods used are unchanged. EV-based per-share
+        values move with net debt; P/E and P/B values (earnings and book value
+        per share) do not move with the price.
+
+        Args:
+            result: CompsResult from calculate() on the previous market data
+            inputs: Valuation inputs with the new market data
+        """
+        md = inputs.market_data
+        implied_from_ev_ebitda = result.implied_from_ev_ebitda
+        implied_from_ev_revenue = result.implied_from_ev_revenue
+
+        if implied_from_ev_ebitda is not None:
+            implied_ev = md.ebit_ttm * 1.15 * result.median_ev_ebitda
+            implied_from_ev_ebitda = (implied_ev - md.net_debt) / md.shares_outstanding if md.shares_outstanding > 0 else 0
+        if implied_from_ev_revenue is not None:
+            implied_ev = md.revenue_ttm * result.median_ev_revenue
+            implied_from_ev_revenue = (implied_ev - md.net_debt) / md.shares_outstanding if md.shares_outstanding > 0 else 0
+
+        implied_values = {
+            'pe': result.implied_from_pe,
+            'ev_ebitda': implied_from_ev_ebitda,
+            'ev_revenue': implied_from_ev_revenue,
+            'pb': result.implied_from_pb
+        }
+        weighted_target = sum(
+            implied_values[method] * weight
+            for method, weight in result.weights_used.items()
+            if implied_values.get(method) is not None
+        )
+
+        has_real_peers = result.peer_count > 0
+        implied_upside = (weighted_target / md.current_price - 1) if md.current_price > 0 else 0
+
+        if not has_real_peers:
+            recommendation = "N/A - No peer data"
+        elif implied_upside > 0.15:
+            recommendation = "BUY"
+        elif implied_upside < -0.10:
+            recommendation = "SELL"
+        else:
+            recommendation = "HOLD"
+
+        implied_from_regression = {
+            method: self._implied_from_multiple(method, multiple, md)
+            for method, multiple in result.regression_multiples.items()
+        }
+
+        return replace(
+            result,
+            current_price=md.current_price,
+            implied_from_ev_ebitda=implied_from_ev_ebitda,
+            implied_from_ev_revenue=implied_from_ev_revenue,
+            implied_from_regression=implied_from_regression,
+            weighted_target=weighted_target if has_real_peers else 0.0,
+            implied_upside=implied_upside if has_real_peers else 0.0,
+            recommendation=recommendation,
+            is_valid=weighted_target > 0 and has_real_peers
+        )
+
+    def peer_statistics(
+        self,
+        table: PeerTable,
+        sector: Optional[str] = None,
+        exclude: Iterable[str] = ()
+    ) -> PeerStatistics:
+        """
+        Multiple statistics for a peer table, cached per sector and peer set.
+
+        Args:
+            table: Peer universe
+            sector: Sector name (part of the cache key)
+            exclude: Tickers to leave out, e.g. the company being valued
+        """
+        excluded = tuple(sorted(t for t in set(exclude) if t in table.tickers)) if exclude else ()
+        key = (sector, table.fingerprint, excluded)
+
+        stats = _peer_stats_cache.get(key)
+        if stats is not None:
+            _peer_stats_cache.move_to_end(key)
+            return stats
+
+        stats = self._compute_peer_statistics(table, sector, excluded)
+        _peer_stats_cache[key] = stats
+        while len(_peer_stats_cache) > MAX_CACHED_PEER_STATS:
+            _peer_stats_cache.popitem(last=False)
+        return stats
+
+    def _compute_peer_statistics(
+        self,
+        table: PeerTable,
+        sector: Optional[str],
+        exclude: Iterable[str]
+    ) -> PeerStatistics:
+        """All multiples summarised at once on a (multiples x peers) matrix"""
+        real = table.real_mask(exclude)
+        names = list(MULTIPLE_RANGES)
+
+        values = np.vstack([getattr(table, MULTIPLE_RANGES[m][0]) for m in names])
+        low = np.array([MULTIPLE_RANGES[m][1] for m in names], dtype=float)[:, None]
+        high = np.array([MULTIPLE_RANGES[m][2] for m in names], dtype=float)[:, None]
+        with np.errstate(invalid='ignore'):
+            valid = real & (values > low) & (values < high)  # NaN compares False
+
+        # Invalid entries sort to the end, so the first counts[i] of row i are its valid values
+        counts = valid.sum(axis=1)
+        ordered = np.sort(np.where(valid, values, np.inf), axis=1)
+
+        multiples = {}
+        for i, multiple in enumerate(names):
+            k = int(counts[i])
+            if k == 0:
+                multiples[multiple] = MultipleStats(count=0, median=None, trimmed_mean=None, quantiles={})
+                continue
+
+            row = ordered[i, :k]
+            median = (row[k // 2] + row[(k - 1) // 2]) / 2
+
+            # Linear interpolation between closest ranks (numpy's default percentile method)
+            positions = np.array(REPORTED_QUANTILES, dtype=float) / 100 * (k - 1)
+            lower = np.floor(positions).astype(int)
+            upper = np.minimum(lower + 1, k - 1)
+            quantiles = row[lower] + (row[upper] - row[lower]) * (positions - lower)
+
+            cut = int(k * TRIM_FRACTION)
+            trimmed_mean = row[cut:k - cut].mean()
+
+            multiples[multiple] = MultipleStats(
+                count=k,
+                median=float(median),
+                trimmed_mean=float(trimmed_mean),
+                quantiles={f"p{q}": float(v) for q, v in zip(REPORTED_QUANTILES, quantiles)}
+            )
+
+        regressions = {}
+        for multiple, driver in REGRESSIONS.items():
+            x = getattr(table, driver)
+            y = values[names.index(multiple)]
+            mask = valid[names.index(multiple)] & ~np.isnan(x)
+            if mask.sum() < MIN_REGRESSION_PEERS:
+                continue
+            x, y = x[mask], y[mask]
+            x_dev = x - x.mean()
+            variance = (x_dev ** 2).sum()
+            if variance <= 0:
+                continue
+            slope = (x_dev * (y - y.mean())).sum() / variance
+            intercept = y.mean() - slope * x.mean()
+            residual = ((y - (intercept + slope * x)) ** 2).sum()
+            total = ((y - y.mean()) ** 2).sum()
+            regressions[multiple] = MultipleRegression(
+                multiple=multiple,
+                driver=driver,
+                slope=float(slope),
+                intercept=float(intercept),
+                r_squared=float(1 - residual / total) if total > 0 else 0.0,
+                count=int(mask.sum())
+            )
+
+        return PeerStatistics(
+            sector=sector,
+            fingerprint=table.fingerprint,
+            peer_count=int(real.sum()),
+            peers_used=[n for n, r in zip(table.names, real) if r],
+            multiples=multiples,
+            regressions=regressions
+        )
+
+    def _real_peers(self, peers: List[PeerData], warnings: List[str]) -> List[PeerData]:
+        """Peers without placeholders (list path, no NumPy)"""
+        if peers and len(peers) > 0:
+            # Filter out fake/placeholder peers
+            real_peers = [
+                p for p in peers
+                if p.ticker not in PLACEHOLDER_TICKERS and p.name not in PLACEHOLDER_NAMES
+            ]
+            if not real_peers:
+                warnings.append("CRITICAL: No real peer data - comps valuation unreliable")
+            return real_peers
+
+        # NO FAKE PEER DATA - mark comps as unavailable
+        warnings.append("CRITICAL: No peer data provided - comps valuation NOT AVAILABLE")
+        warnings.append("To fix: Provide real comparable company data from broker research or yfinance")
+        return []
+
+    def _regression_values(
+        self,
+        stats: Optional[PeerStatistics],
+        inputs: ValuationInputs
+    ) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """Fitted multiples at the target's base-case growth and their per-share values"""
+        base = inputs.scenarios.get('base') if inputs.scenarios else None
+        if stats is None or base is None:
+            return {}, {}
+
+        multiples, implied = {}, {}
+        for method, fit in stats.regressions.items():
+            _, low, high = MULTIPLE_RANGES[method]
+            multiple = min(max(fit.predict(base.revenue_growth_y1_3), low), high)
+            value = self._implied_from_multiple(method, multiple, inputs.market_data)
+            if multiple > low and value is not None:
+                multiples[method] = multiple
+                implied[method] = value
+        return multiples, implied
+
+    def _implied_from_multiple(self, method: str, multiple: float, md) -> Optional[float]:
+        """Per-share equity value from an EV multiple"""
+        if method == 'ev_ebitda' and md.ebit_ttm > 0:
+            implied_ev = md.ebit_ttm * 1.15 * multiple
+        elif method == 'ev_revenue' and md.revenue_ttm > 0:
+            implied_ev = md.revenue_ttm * multiple
+        else:
+            return None
+        return (implied_ev - md.net_debt) / md.shares_outstanding if md.shares_outstanding > 0 else 0
+
     def _get_default_peers(self, market_data) -> List[PeerData]:
         """
         DO NOT generate fake peer data.
@@ -224,11 +617,14 @@ class CompsEngine:
         Previously this generated fake "Industry Average" peers with made-up multiples.
         This was WRONG - it created hallucinated valuation data.
 
-        Now we return an empty list and let the comps result show as invalid/unavailable.
+        Fallback peers are the target's nearest same-sector neighbours in the
+        local peer index, using their cached market data (real multiples from
+        earlier valuations). If there are none, we return an empty list and
+        let the comps result show as invalid/unavailable.
         Real peer data should come from:
         1. Broker research (PDFs/Excel models)
         2. yfinance peer lookup
         3. User-provided peer list
         """
-        # Return empty - no fake peers
-        return []
+        from agents.peer_index import get_peer_index
+        return get_peer_index().peer_data(market_data.ticker, k=DEFAULT_INDEX_PEERS)
@@ -6,14 +6,76 @@ This engine calculates intrinsic value by:
 2. Discounting them to present value using WACC
 3. Adding discounted terminal value
 4. Subtracting net debt to get equity value
+
+With NumPy available, all scenarios are calculated together as array
+operations (scenarios x years) and the per-scenario result objects are only
+built when a caller needs them - see DCFEngine.calculate_batch().
 """
 
 from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
+from array import array
 import math
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from agents.wacc_cache import get_wacc_cache
 from ..assumption_extractor import ValuationInputs, ScenarioAssumptions
 
+# Operating assumptions shared by every scenario
+DA_PCT = 0.05      # D&A, % of revenue
+CAPEX_PCT = 0.06   # CapEx, % of revenue
+WC_PCT = 0.02      # Working capital, % of revenue growth
+
+# Scenario fields the vectorised core reads, one array entry per scenario
+SCENARIO_FIELDS = (
+    'probability',
+    'revenue_growth_y1_3',
+    'revenue_growth_y4_5',
+    'revenue_growth_y6_10',
+    'terminal_growth',
+    'target_ebit_margin',
+    'years_to_target_margin',
+    'wacc_adjustment',
+)
+
+# Company fields the vectorised core reads - scalars for one company, or one
+# entry per scenario row when several companies are valued in one pass
+MARKET_FIELDS = (
+    'revenue_ttm',
+    'ebit_margin',
+    'net_debt',
+    'shares_outstanding',
+    'risk_free_rate',
+    'beta',
+    'equity_risk_premium',
+    'country_risk_premium',
+    'cost_of_debt',
+    'tax_rate',
+    'debt_to_total_capital',
+)
+
+# Inputs DCFEngine.sensitivities() differentiates fair value per share against.
+# The first six go through central differences; FCF is linear in CapEx % and
+# equity value in net debt, so those two partials are exact closed forms.
+SENSITIVITY_INPUTS = (
+    'revenue_growth_y1_3',
+    'revenue_growth_y4_5',
+    'revenue_growth_y6_10',
+    'target_ebit_margin',
+    'terminal_growth',
+    'wacc',
+    'capex_pct',
+    'net_debt',
+)
+FINITE_DIFFERENCE_INPUTS = SENSITIVITY_INPUTS[:6]
+SENSITIVITY_STEP = 1e-4  # 1bp bump either side
+
 
 @dataclass
 class YearlyProjection:
@@ -32,6 +94,106 @@ class YearlyProjection:
     pv_fcf: float  # Present Value of FCF
 
 
+class ProjectionTable:
+    """
+    Yearly projections of one scenario, stored by column.
+
+    Keeps the six projected columns - row views into the batch arrays, or
+    array('d') columns from the per-scenario path - and derives EBIT, NOPAT,
+    D&A, CapEx and ΔWC when read. Indexing or iterating yields
+    YearlyProjection records, so code written against List[YearlyProjection]
+    keeps working; to_dicts() renders the output/JSON shape.
+    """
+
+    __slots__ = ('revenue', 'revenue_growth', 'ebit_margin', 'fcf', 'discount_factor', 'pv_fcf',
+                 'base_revenue', 'tax_rate')
+
+    STORED = ('revenue', 'revenue_growth', 'ebit_margin', 'fcf', 'discount_factor', 'pv_fcf')
+    FIELDS = ('year', 'revenue', 'revenue_growth', 'ebit', 'ebit_margin', 'nopat', 'da', 'capex',
+              'wc_change', 'fcf', 'discount_factor', 'pv_fcf')
+
+    def __init__(self, revenue, revenue_growth, ebit_margin, fcf, discount_factor, pv_fcf,
+                 base_revenue: float, tax_rate: float):
+        self.revenue = revenue
+        self.revenue_growth = revenue_growth
+        self.ebit_margin = ebit_margin
+        self.fcf = fcf
+        self.discount_factor = discount_factor
+        self.pv_fcf = pv_fcf
+        self.base_revenue = base_revenue
+        self.tax_rate = tax_rate
+
+    def __len__(self) -> int:
+        return len(self.revenue)
+
+    def __getitem__(self, index):
+        return self.rows()[index]
+
+    def __iter__(self):
+        return iter(self.rows())
+
+    def column(self, name: str) -> List[float]:
+        """One YearlyProjection field for every year, as floats"""
+        if name in self.STORED:
+            return getattr(self, name).tolist()
+
+        revenue = self.revenue.tolist()
+        if name == 'year':
+            return list(range(1, len(revenue) + 1))
+        if name == 'ebit':
+            return [r * m for r, m in zip(revenue, self.ebit_margin.tolist())]
+        if name == 'nopat':
+            return [r * m * (1 - self.tax_rate) for r, m in zip(revenue, self.ebit_margin.tolist())]
+        if name == 'da':
+            return [r * DA_PCT for r in revenue]
+        if name == 'capex':
+            return [r * CAPEX_PCT for r in revenue]
+        if name == 'wc_change':
+            return [(r - prev) * WC_PCT for r, prev in zip(revenue, [self.base_revenue] + revenue[:-1])]
+        raise KeyError(name)
+
+    def rows(self) -> List[YearlyProjection]:
+        """Materialise one YearlyProjection per year"""
+        columns = [self.column(name) for name in self.FIELDS]
+        return [YearlyProjection(*values) for values in zip(*columns)]
+
+    def to_dicts(self) -> List[Dict[str, float]]:
+        """Per-year dicts, as in the valuation output"""
+        columns = [self.column(name) for name in self.FIELDS]
+        return [dict(zip(self.FIELDS, values)) for values in zip(*columns)]
+
+
+class ScenarioInputs(Mapping):
+    """
+    inputs_used for one scenario: the company-level inputs, one dict shared
+    by every scenario of a run, overlaid with the scenario's own assumptions.
+    Reads like a dict; dict(inputs_used) gives a plain copy.
+    """
+
+    __slots__ = ('shared', 'own')
+
+    def __init__(self, shared: Dict[str, Any], own: Dict[str, Any]):
+        self.shared = shared
+        self.own = own
+
+    def __getitem__(self, key):
+        if key in self.own:
+            return self.own[key]
+        return self.shared[key]
+
+    def __iter__(self):
+        yield from self.shared
+        for key in self.own:
+            if key not in self.shared:
+                yield key
+
+    def __len__(self) -> int:
+        return len(self.shared) + sum(1 for key in self.own if key not in self.shared)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
 @dataclass
 class DCFScenarioResult:
     """Result of DCF calculation for a single scenario"""
@@ -57,11 +219,11 @@ class DCFScenarioResult:
     yearly_fcfs: List[float]
     pv_fcfs: float
 
-    # NEW: Detailed yearly projections
-    yearly_projections: List[YearlyProjection]
+    # NEW: Detailed yearly projections (columnar - iterates as YearlyProjection)
+    yearly_projections: ProjectionTable
 
-    # NEW: Key inputs used
-    inputs_used: Dict
+    # NEW: Key inputs used (company-level part shared across scenarios)
+    inputs_used: ScenarioInputs
 
     # Warnings
     warnings: List[str]
@@ -90,6 +252,212 @@ class DCFResult:
     warnings: List[str]
 
 
+@dataclass
+class DCFSensitivities:
+    """
+    Partial derivatives of fair value per share with respect to each DCF
+    input (SENSITIVITY_INPUTS), per unit of the input: a partial of 250 for
+    revenue_growth_y1_3 means +1pp of growth adds 2.50 per share; for
+    net_debt it is per currency unit of net debt.
+    """
+    scenario_name: str
+    fair_value_per_share: float
+    inputs: Dict[str, float]    # value of each input the partials are taken at
+    partials: Dict[str, float]
+
+    def required_change(self, target_fair_value: float, name: str) -> Optional[float]:
+        """First-order change in one input that moves fair value to the target (None if insensitive)"""
+        partial = self.partials.get(name)
+        if not partial:
+            return None
+        return (target_fair_value - self.fair_value_per_share) / partial
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'scenario': self.scenario_name,
+            'fair_value_per_share': self.fair_value_per_share,
+            'inputs': self.inputs,
+            'partials': self.partials
+        }
+
+
+@dataclass
+class DCFGreeks:
+    """
+    Sensitivities per scenario and of the probability-weighted value. PWV
+    partials are for the same shift applied to every scenario, and their
+    inputs are probability-weighted averages.
+    """
+    pwv: DCFSensitivities
+    scenarios: Dict[str, DCFSensitivities]
+    step: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'pwv': self.pwv.to_dict(),
+            'scenarios': {name: s.to_dict() for name, s in self.scenarios.items()},
+            'step': self.step
+        }
+
+
+class DCFBatchResult:
+    """
+    Array form of a DCF run over many scenarios.
+
+    Per-scenario values are NumPy arrays of shape (scenarios,) and yearly
+    values (scenarios, years). YearlyProjection / DCFScenarioResult objects
+    are only built on request:
+
+        batch = engine.calculate_batch(inputs)
+        batch.fair_value_per_share      # array, no objects built
+        batch.scenario('base')          # one DCFScenarioResult
+        batch.result                    # full DCFResult (built once)
+    """
+
+    def __init__(self, engine: 'DCFEngine', inputs: ValuationInputs, labels: Optional[List[str]],
+                 scenario_names: Optional[List[str]], assumptions: Dict[str, Any], failed, **arrays):
+        self.engine = engine
+        self.inputs = inputs
+        self.assumptions = assumptions
+        self.failed = failed
+        self._array_names = list(arrays)
+        for name, values in arrays.items():
+            setattr(self, name, values)
+
+        # Generated on first use - sampled batches never need them
+        self._labels = labels
+        self._scenario_names = scenario_names
+        self._index: Optional[Dict[str, int]] = None
+        self._scenarios: Dict[int, DCFScenarioResult] = {}
+        self._result: Optional[DCFResult] = None
+        self._shared_inputs: Optional[Dict[str, Any]] = None
+
+    def __len__(self) -> int:
+        return len(self.failed)
+
+    @property
+    def labels(self) -> List[str]:
+        """Scenario keys (default: scenario_0, scenario_1, ...)"""
+        if self._labels is None:
+            self._labels = [f"scenario_{i}" for i in range(len(self))]
+        return self._labels
+
+    @property
+    def scenario_names(self) -> List[str]:
+        return self._scenario_names if self._scenario_names is not None else self.labels
+
+    def _slice(self, start: int, stop: int, inputs: ValuationInputs,
+               labels: Optional[List[str]], scenario_names: Optional[List[str]]) -> 'DCFBatchResult':
+        """Rows start:stop as their own batch (views, no copies)"""
+        return DCFBatchResult(
+            engine=self.engine,
+            inputs=inputs,
+            labels=labels,
+            scenario_names=scenario_names,
+            assumptions={name: values[start:stop] for name, values in self.assumptions.items()},
+            failed=self.failed[start:stop],
+            **{name: getattr(self, name)[start:stop] for name in self._array_names}
+        )
+
+    @property
+    def pwv(self) -> float:
+        """Probability-weighted fair value over the scenarios that calculated"""
+        ok = ~self.failed
+        return float(np.sum(self.fair_value_per_share[ok] * self.assumptions['probability'][ok]))
+
+    def warnings_for(self, i: int) -> List[str]:
+        """Warnings for scenario i, worded as in DCFEngine._calculate_scenario"""
+        if self.failed[i]:
+            return [f"Error calculating {self.labels[i]}: float division by zero"]
+
+        tg = float(self.assumptions['terminal_growth'][i])
+        wacc = float(self.wacc[i])
+        warnings = []
+        if self.critical[i]:
+            warnings.append(f"CRITICAL: WACC ({float(self.wacc_before_floor[i]):.2%}) <= terminal growth ({tg:.2%})")
+        if self.spread_warning[i]:
+            warnings.append(f"WARNING: WACC-g spread ({(wacc - tg):.2%}) < 2%")
+        if self.tv_warning[i]:
+            warnings.append(f"WARNING: Terminal value is {float(self.terminal_value_pct_of_ev[i]):.1%} of EV (>75%)")
+        return warnings
+
+    def scenario(self, label: str) -> DCFScenarioResult:
+        """Build the DCFScenarioResult for one scenario"""
+        if self._index is None:
+            self._index = {key: i for i, key in enumerate(self.labels)}
+        return self._materialise(self._index[label])
+
+    def _materialise(self, i: int) -> DCFScenarioResult:
+        if i in self._scenarios:
+            return self._scenarios[i]
+
+        md = self.inputs.market_data
+        wi = self.inputs.wacc_inputs
+        a = {name: float(values[i]) for name, values in self.assumptions.items()}
+        _, _, wacc_calc = self.engine._calculate_wacc(
+            wi.risk_free_rate,
+            wi.beta + a['wacc_adjustment'] * 10,
+            wi.equity_risk_premium,
+            wi.country_risk_premium,
+            wi.cost_of_debt,
+            wi.tax_rate,
+            wi.debt_to_total_capital
+        )
+
+        # Row views into the batch arrays - nothing copied per scenario
+        projections = ProjectionTable(
+            self.revenue[i], self.growth[i], self.ebit_margin[i],
+            self.fcf[i], self.discount_factor[i], self.pv_fcf[i],
+            base_revenue=md.revenue_ttm, tax_rate=wi.tax_rate
+        )
+
+        if self._shared_inputs is None:
+            self._shared_inputs = self.engine._company_inputs(self.inputs)
+        inputs_used = ScenarioInputs(self._shared_inputs, {
+            'terminal_growth': a['terminal_growth'],
+            'revenue_growth_y1_3': a['revenue_growth_y1_3'],
+            'revenue_growth_y4_5': a['revenue_growth_y4_5'],
+            'revenue_growth_y6_10': a['revenue_growth_y6_10'],
+            'target_ebit_margin': a['target_ebit_margin']
+        })
+
+        result = DCFScenarioResult(
+            scenario_name=self.scenario_names[i],
+            probability=a['probability'],
+            enterprise_value=float(self.enterprise_value[i]),
+            equity_value=float(self.equity_value[i]),
+            fair_value_per_share=float(self.fair_value_per_share[i]),
+            wacc=float(self.wacc[i]),
+            cost_of_equity=float(self.cost_of_equity[i]),
+            wacc_calculation=wacc_calc,
+            terminal_value=float(self.terminal_value[i]),
+            pv_terminal_value=float(self.pv_terminal_value[i]),
+            terminal_value_pct_of_ev=float(self.terminal_value_pct_of_ev[i]),
+            yearly_fcfs=self.fcf[i].tolist(),
+            pv_fcfs=float(self.pv_fcfs[i]),
+            yearly_projections=projections,
+            inputs_used=inputs_used,
+            warnings=self.warnings_for(i)
+        )
+        self._scenarios[i] = result
+        return result
+
+    @property
+    def result(self) -> DCFResult:
+        """Full DCFResult, built on first access"""
+        if self._result is None:
+            scenario_results = {}
+            all_warnings = []
+            for i, label in enumerate(self.labels):
+                if self.failed[i]:
+                    all_warnings.extend(self.warnings_for(i))
+                    continue
+                scenario_results[label] = self._materialise(i)
+                all_warnings.extend(scenario_results[label].warnings)
+            self._result = self.engine._build_result(self.inputs, scenario_results, all_warnings)
+        return self._result
+
+
 class DCFEngine:
     """
     DCF Valuation Engine - Pure Python calculation.
@@ -115,17 +483,37 @@ class DCFEngine:
         Returns:
             DCFResult with all scenarios and PWV
         """
+        if HAS_NUMPY:
+            try:
+                return self.calculate_batch(inputs).result
+            except (TypeError, ValueError):
+                pass  # non-numeric assumptions - the per-scenario path reports them
+
+        return self._calculate_loop(inputs)
+
+    def _calculate_loop(self, inputs: ValuationInputs) -> DCFResult:
+        """Run DCF one scenario at a time (used without NumPy)"""
         scenario_results = {}
         all_warnings = []
+        shared_inputs = self._company_inputs(inputs)
 
         for scenario_name, scenario in inputs.scenarios.items():
             try:
-                result = self._calculate_scenario(inputs, scenario)
+                result = self._calculate_scenario(inputs, scenario, shared_inputs)
                 scenario_results[scenario_name] = result
                 all_warnings.extend(result.warnings)
             except Exception as e:
                 all_warnings.append(f"Error calculating {scenario_name}: {str(e)}")
 
+        return self._build_result(inputs, scenario_results, all_warnings)
+
+    def _build_result(
+        self,
+        inputs: ValuationInputs,
+        scenario_results: Dict[str, DCFScenarioResult],
+        all_warnings: List[str]
+    ) -> DCFResult:
+        """Combine scenario results into a DCFResult"""
         # Calculate PWV
         pwv, pwv_calc = self._calculate_pwv(scenario_results)
 
@@ -154,10 +542,410 @@ class DCFEngine:
             warnings=all_warnings
         )
 
+    def reprice(self, result: DCFResult, inputs: ValuationInputs) -> DCFResult:
+        """
+        Revalue a DCFResult after a market data tick (price, net debt).
+
+        FCF projections, WACC and enterprise value do not depend on the share
+        price or net debt, so every scenario keeps them; only equity value,
+        fair value per share, PWV, upside and recommendation are recomputed.
+
+        Args:
+            result: DCFResult from calculate() on the previous market data
+            inputs: Valuation inputs with the new market data
+        """
+        md = inputs.market_data
+        shared_inputs = None
+        scenario_results = {}
+        for label, s in result.scenarios.items():
+            if shared_inputs is None:
+                shared_inputs = {**s.inputs_used.shared, 'net_debt': md.net_debt}
+            equity_value = s.enterprise_value - md.net_debt
+            scenario_results[label] = replace(
+                s,
+                equity_value=equity_value,
+                fair_value_per_share=equity_value / md.shares_outstanding if md.shares_outstanding > 0 else 0,
+                inputs_used=ScenarioInputs(shared_inputs, s.inputs_used.own)
+            )
+        return self._build_result(inputs, scenario_results, result.warnings)
+
+    @staticmethod
+    def reprice_sensitivities(greeks: DCFGreeks, inputs: ValuationInputs) -> DCFGreeks:
+        """
+        Move DCFGreeks to new market data (price, net debt) without re-running the bumps.
+
+        The share price does not enter the DCF and net debt only shifts each
+        fair value by -change / shares, so every partial is unchanged.
+        """
+        net_debt = inputs.market_data.net_debt
+
+        def shift(s: DCFSensitivities) -> DCFSensitivities:
+            change = net_debt - s.inputs['net_debt']
+            return replace(
+                s,
+                fair_value_per_share=s.fair_value_per_share + s.partials['net_debt'] * change,
+                inputs={**s.inputs, 'net_debt': net_debt}
+            )
+
+        return replace(
+            greeks,
+            pwv=shift(greeks.pwv),
+            scenarios={label: shift(s) for label, s in greeks.scenarios.items()}
+        )
+
+    def sensitivities(
+        self,
+        inputs: ValuationInputs,
+        scenarios: Optional[Dict[str, ScenarioAssumptions]] = None,
+        step: float = SENSITIVITY_STEP
+    ) -> DCFGreeks:
+        """
+        Partial derivatives of fair value per share for every scenario and
+        for the PWV, in one pass.
+
+        Every scenario is bumped up and down by step in each finite-difference
+        input and all bumped rows go through one calculate_arrays() call.
+        WACC is bumped through the risk-free rate (dWACC = (1 - D/V) dRf).
+        The CapEx % and net debt partials are closed forms.
+
+        Args:
+            inputs: Valuation inputs
+            scenarios: Scenarios to differentiate (default: inputs.scenarios)
+            step: Central-difference bump
+
+        Returns:
+            DCFGreeks - e.g. greeks.pwv.required_change(target, 'target_ebit_margin')
+        """
+        scenarios = inputs.scenarios if scenarios is None else scenarios
+        md = inputs.market_data
+        wi = inputs.wacc_inputs
+        equity_ratio = 1 - wi.debt_to_total_capital
+
+        if HAS_NUMPY:
+            rows = self._sensitivity_rows_batch(inputs, scenarios, step)
+        else:
+            rows = self._sensitivity_rows_loop(inputs, scenarios, step)
+
+        results = {}
+        for label, (scenario, base, revenue, discount_factor, wacc, up, down) in rows.items():
+            partials = {
+                name: (up[name] - down[name]) / (2 * step)
+                for name in FINITE_DIFFERENCE_INPUTS
+            }
+            partials['wacc'] = partials['wacc'] / equity_ratio if equity_ratio > 0 else 0.0
+
+            # FCF_t falls by revenue_t per unit of CapEx %, and so does the terminal FCF
+            tg = scenario.terminal_growth
+            pv_capex = sum(r * df for r, df in zip(revenue, discount_factor))
+            pv_capex += revenue[-1] * (1 + tg) / (wacc - tg) * discount_factor[-1]
+            per_share = 1 / md.shares_outstanding if md.shares_outstanding > 0 else 0.0
+            partials['capex_pct'] = -pv_capex * per_share
+            partials['net_debt'] = -per_share
+
+            results[label] = DCFSensitivities(
+                scenario_name=scenario.name,
+                fair_value_per_share=base,
+                inputs={
+                    'revenue_growth_y1_3': scenario.revenue_growth_y1_3,
+                    'revenue_growth_y4_5': scenario.revenue_growth_y4_5,
+                    'revenue_growth_y6_10': scenario.revenue_growth_y6_10,
+                    'target_ebit_margin': scenario.target_ebit_margin,
+                    'terminal_growth': scenario.terminal_growth,
+                    'wacc': wacc,
+                    'capex_pct': CAPEX_PCT,
+                    'net_debt': md.net_debt
+                },
+                partials={name: float(partials[name]) for name in SENSITIVITY_INPUTS}
+            )
+
+        # PWV: probability-weighted over the scenarios that calculated
+        weights = {label: scenarios[label].probability for label in results}
+        total = sum(weights.values())
+        pwv = DCFSensitivities(
+            scenario_name='Probability-Weighted',
+            fair_value_per_share=sum(weights[k] * r.fair_value_per_share for k, r in results.items()),
+            inputs={
+                name: sum(weights[k] * r.inputs[name] for k, r in results.items()) / total if total else 0.0
+                for name in SENSITIVITY_INPUTS
+            },
+            partials={
+                name: sum(weights[k] * r.partials[name] for k, r in results.items())
+                for name in SENSITIVITY_INPUTS
+            }
+        )
+        return DCFGreeks(pwv=pwv, scenarios=results, step=step)
+
+    def _sensitivity_rows_batch(self, inputs, scenarios, step) -> Dict[str, tuple]:
+        """Base and bumped fair values per scenario from one calculate_arrays() call"""
+        base = self.calculate_batch(inputs, scenarios)
+        arrays = base.assumptions
+        count = len(base)
+        bumps = len(FINITE_DIFFERENCE_INPUTS) * 2
+
+        # Rows: [input 0 up, input 0 down, input 1 up, ...], each block one row per scenario
+        bumped = {name: np.tile(arrays[name], bumps) for name in SCENARIO_FIELDS}
+        market = self.market_columns(inputs)
+        risk_free_rate = np.full(bumps * count, float(market['risk_free_rate']))
+        for i, name in enumerate(FINITE_DIFFERENCE_INPUTS):
+            for j, sign in enumerate((1, -1)):
+                block = slice((2 * i + j) * count, (2 * i + j + 1) * count)
+                column = risk_free_rate if name == 'wacc' else bumped[name]
+                column[block] += sign * step
+        market['risk_free_rate'] = risk_free_rate
+
+        fair_values = self.calculate_arrays(inputs, bumped, market=market).fair_value_per_share
+        fair_values = fair_values.reshape(len(FINITE_DIFFERENCE_INPUTS), 2, count)
+
+        rows = {}
+        for k, (label, scenario) in enumerate(scenarios.items()):
+            if base.failed[k]:
+                continue
+            rows[label] = (
+                scenario,
+                float(base.fair_value_per_share[k]),
+                base.revenue[k].tolist(),
+                base.discount_factor[k].tolist(),
+                float(base.wacc[k]),
+                {name: float(fair_values[i, 0, k]) for i, name in enumerate(FINITE_DIFFERENCE_INPUTS)},
+                {name: float(fair_values[i, 1, k]) for i, name in enumerate(FINITE_DIFFERENCE_INPUTS)}
+            )
+        return rows
+
+    def _sensitivity_rows_loop(self, inputs, scenarios, step) -> Dict[str, tuple]:
+        """Same as _sensitivity_rows_batch, one scenario calculation per bump (used without NumPy)"""
+        wi = inputs.wacc_inputs
+        rows = {}
+        for label, scenario in scenarios.items():
+            try:
+                base = self._calculate_scenario(inputs, scenario)
+                up, down = {}, {}
+                for name in FINITE_DIFFERENCE_INPUTS:
+                    for sign, values in ((1, up), (-1, down)):
+                        if name == 'wacc':
+                            bumped_inputs = replace(inputs, wacc_inputs=replace(
+                                wi, risk_free_rate=wi.risk_free_rate + sign * step))
+                            bumped = self._calculate_scenario(bumped_inputs, scenario)
+                        else:
+                            bumped = self._calculate_scenario(
+                                inputs, replace(scenario, **{name: getattr(scenario, name) + sign * step}))
+                        values[name] = bumped.fair_value_per_share
+            except Exception:
+                continue  # reported by calculate()
+            rows[label] = (
+                scenario,
+                base.fair_value_per_share,
+                base.yearly_projections.column('revenue'),
+                base.yearly_projections.column('discount_factor'),
+                base.wacc,
+                up,
+                down
+            )
+        return rows
+
+    # ==========================================
+    # Vectorised core
+    # ==========================================
+
+    def calculate_batch(
+        self,
+        inputs: ValuationInputs,
+        scenarios: Optional[Dict[str, ScenarioAssumptions]] = None
+    ) -> 'DCFBatchResult':
+        """
+        Run DCF for many scenarios at once.
+
+        Args:
+            inputs: Valuation inputs (market data and WACC inputs are shared)
+            scenarios: Scenarios to value (default: inputs.scenarios)
+
+        Returns:
+            DCFBatchResult - use .result for the DCFResult
+        """
+        scenarios = inputs.scenarios if scenarios is None else scenarios
+        return self.calculate_arrays(
+            inputs,
+            self.scenario_arrays(scenarios.values()),
+            labels=list(scenarios.keys()),
+            scenario_names=[s.name for s in scenarios.values()]
+        )
+
+    @staticmethod
+    def scenario_arrays(scenarios) -> Dict[str, Any]:
+        """Scenario assumptions as one float array per SCENARIO_FIELDS entry"""
+        scenarios = list(scenarios)
+        return {
+            name: np.array([getattr(s, name) for s in scenarios], dtype=float)
+            for name in SCENARIO_FIELDS
+        }
+
+    @staticmethod
+    def market_columns(inputs: ValuationInputs) -> Dict[str, float]:
+        """MARKET_FIELDS values for one company"""
+        md = inputs.market_data
+        wi = inputs.wacc_inputs
+        return {
+            'revenue_ttm': md.revenue_ttm,
+            'ebit_margin': md.ebit_margin,
+            'net_debt': md.net_debt,
+            'shares_outstanding': md.shares_outstanding,
+            'risk_free_rate': wi.risk_free_rate,
+            'beta': wi.beta,
+            'equity_risk_premium': wi.equity_risk_premium,
+            'country_risk_premium': wi.country_risk_premium,
+            'cost_of_debt': wi.cost_of_debt,
+            'tax_rate': wi.tax_rate,
+            'debt_to_total_capital': wi.debt_to_total_capital,
+        }
+
+    def calculate_portfolio(self, inputs_list: List[ValuationInputs]) -> List[DCFResult]:
+        """
+        Run DCF for every scenario of every company in one array pass.
+
+        Scenario rows of all companies are stacked with their company's
+        market columns alongside; the result is split back per company.
+        Without NumPy each company goes through calculate().
+
+        Returns:
+            DCFResult per input, in order
+        """
+        if not HAS_NUMPY:
+            return [self.calculate(inputs) for inputs in inputs_list]
+
+        scenarios = [list(inputs.scenarios.values()) for inputs in inputs_list]
+        counts = [len(rows) for rows in scenarios]
+        arrays = self.scenario_arrays(s for rows in scenarios for s in rows)
+        columns = [self.market_columns(inputs) for inputs in inputs_list]
+        market = {
+            name: np.repeat(np.array([c[name] for c in columns], dtype=float), counts)
+            for name in MARKET_FIELDS
+        }
+        combined = self.calculate_arrays(inputs_list[0] if inputs_list else None, arrays, market=market)
+
+        results = []
+        start = 0
+        for inputs, rows, count in zip(inputs_list, scenarios, counts):
+            results.append(combined._slice(start, start + count, inputs,
+                                           labels=list(inputs.scenarios.keys()),
+                                           scenario_names=[s.name for s in rows]).result)
+            start += count
+        return results
+
+    def calculate_arrays(
+        self,
+        inputs: ValuationInputs,
+        arrays: Dict[str, Any],
+        labels: Optional[List[str]] = None,
+        scenario_names: Optional[List[str]] = None,
+        market: Optional[Dict[str, Any]] = None
+    ) -> 'DCFBatchResult':
+        """
+        Run DCF over scenario assumption arrays.
+
+        Same formulas as _calculate_scenario/_project_fcfs, computed for all
+        scenarios and years as (scenarios x years) arrays.
+
+        Args:
+            inputs: Valuation inputs (inputs.scenarios is not used)
+            arrays: One array per SCENARIO_FIELDS entry, all the same length
+            labels: Scenario keys (default: scenario_0, scenario_1, ...)
+            scenario_names: Scenario names (default: labels)
+            market: MARKET_FIELDS values overriding inputs, scalar or per row
+        """
+        m = self.market_columns(inputs) if market is None else market
+        a = {name: np.asarray(arrays[name], dtype=float) for name in SCENARIO_FIELDS}
+        count = len(a['probability'])
+        terminal_growth = a['terminal_growth']
+        target_margin = a['target_ebit_margin']
+        years_to_target = a['years_to_target_margin']
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            # Step 1: WACC per scenario
+            adjusted_beta = m['beta'] + a['wacc_adjustment'] * 10  # rough conversion
+            cost_of_equity = m['risk_free_rate'] + adjusted_beta * m['equity_risk_premium'] + m['country_risk_premium']
+            after_tax_cod = m['cost_of_debt'] * (1 - m['tax_rate'])
+            debt_ratio = m['debt_to_total_capital']
+            wacc = ((1 - debt_ratio) * cost_of_equity) + (debt_ratio * after_tax_cod)
+            wacc_before_floor = wacc + a['wacc_adjustment']
+
+            critical = wacc_before_floor <= terminal_growth
+            wacc = np.where(critical, terminal_growth + 0.02, wacc_before_floor)  # Force minimum spread
+            spread_warning = wacc - terminal_growth < 0.02
+
+            # Step 2: Revenue paths - growth by phase, compounded from TTM revenue
+            years = np.arange(1, self.projection_years + 1)
+            growth = np.where(
+                years <= 3, a['revenue_growth_y1_3'][:, None],
+                np.where(years <= 5, a['revenue_growth_y4_5'][:, None], a['revenue_growth_y6_10'][:, None])
+            )
+            compounding = np.empty((count, self.projection_years + 1))
+            compounding[:, 0] = m['revenue_ttm']
+            compounding[:, 1:] = 1 + growth
+            revenue_path = np.cumprod(compounding, axis=1)
+            revenue = revenue_path[:, 1:]
+            prev_revenue = revenue_path[:, :-1]
+
+            # Margin ramp - stepped like _project_fcfs, all scenarios per year
+            margin_step = (target_margin - m['ebit_margin']) / years_to_target
+            ebit_margin = np.empty_like(revenue)
+            margin = np.zeros(count) + m['ebit_margin']
+            for year in years:
+                margin = np.where(year <= years_to_target, np.minimum(margin + margin_step, target_margin),
+                                  target_margin)
+                ebit_margin[:, year - 1] = margin
+
+            # FCF = NOPAT + D&A - CapEx - ΔWC
+            nopat = revenue * ebit_margin * (1 - np.asarray(m['tax_rate'], dtype=float)[..., None])
+            fcf = nopat + revenue * DA_PCT - revenue * CAPEX_PCT - (revenue - prev_revenue) * WC_PCT
+
+            # Step 3: Discounting (factor rows shared through the WACC cache)
+            discount_factor = get_wacc_cache().discount_matrix(wacc, self.projection_years)
+            pv_fcf = fcf * discount_factor
+            pv_fcfs = pv_fcf.sum(axis=1)
+
+            # Step 4: Terminal value
+            terminal_value = fcf[:, -1] * (1 + terminal_growth) / (wacc - terminal_growth)
+            pv_terminal = terminal_value * discount_factor[:, -1]
+
+            # Steps 5-7: EV, equity value, per share value
+            enterprise_value = pv_fcfs + pv_terminal
+            tv_pct = np.where(enterprise_value > 0, pv_terminal / enterprise_value, 0.0)
+            equity_value = enterprise_value - m['net_debt']
+            shares = m['shares_outstanding']
+            fair_value = np.where(np.asarray(shares) > 0, equity_value / shares, 0.0)
+
+        return DCFBatchResult(
+            engine=self,
+            inputs=inputs,
+            labels=labels,
+            scenario_names=scenario_names,
+            assumptions=a,
+            failed=years_to_target == 0,  # margin step is undefined
+            wacc_before_floor=wacc_before_floor,
+            wacc=wacc,
+            cost_of_equity=cost_of_equity,
+            growth=growth,
+            revenue=revenue,
+            ebit_margin=ebit_margin,
+            fcf=fcf,
+            discount_factor=discount_factor,
+            pv_fcf=pv_fcf,
+            pv_fcfs=pv_fcfs,
+            terminal_value=terminal_value,
+            pv_terminal_value=pv_terminal,
+            terminal_value_pct_of_ev=tv_pct,
+            enterprise_value=enterprise_value,
+            equity_value=equity_value,
+            fair_value_per_share=fair_value,
+            critical=critical,
+            spread_warning=spread_warning,
+            tv_warning=tv_pct > 0.75
+        )
+
     def _calculate_scenario(
         self,
         inputs: ValuationInputs,
-        scenario: ScenarioAssumptions
+        scenario: ScenarioAssumptions,
+        shared_inputs: Optional[Dict[str, Any]] = None
     ) -> DCFScenarioResult:
         """Calculate DCF for a single scenario"""
         warnings = []
@@ -192,14 +980,14 @@ class DCFEngine:
         yearly_fcfs, yearly_projections = self._project_fcfs(md, scenario, wi.tax_rate, wacc)
 
         # Step 3: Calculate PV of FCFs
-        pv_fcfs = sum(proj.pv_fcf for proj in yearly_projections)
+        pv_fcfs = sum(yearly_projections.pv_fcf)
 
         # Step 4: Calculate terminal value
         terminal_fcf = yearly_fcfs[-1]
         terminal_value = terminal_fcf * (1 + scenario.terminal_growth) / (wacc - scenario.terminal_growth)
 
         # Discount terminal value to present
-        pv_terminal = terminal_value / ((1 + wacc) ** self.projection_years)
+        pv_terminal = terminal_value * get_wacc_cache().discount_factors(wacc, self.projection_years)[-1]
 
         # Step 5: Enterprise Value
         enterprise_value = pv_fcfs + pv_terminal
@@ -215,29 +1003,14 @@ class DCFEngine:
         # Step 7: Per share value
         fair_value = equity_value / md.shares_outstanding if md.shares_outstanding > 0 else 0
 
-        # Build inputs_used dict for transparency
-        inputs_used = {
-            'base_revenue': md.revenue_ttm,
-            'base_ebit_margin': md.ebit_margin,
-            'net_debt': md.net_debt,
-            'shares_outstanding': md.shares_outstanding,
-            'tax_rate': wi.tax_rate,
-            'risk_free_rate': wi.risk_free_rate,
-            'beta': wi.beta,
-            'equity_risk_premium': wi.equity_risk_premium,
-            'country_risk_premium': wi.country_risk_premium,
-            'cost_of_debt': wi.cost_of_debt,
-            'debt_ratio': wi.debt_to_total_capital,
-            'da_pct': 0.05,
-            'capex_pct': 0.06,
-            'wc_pct': 0.02,
-            'projection_years': self.projection_years,
+        # Build inputs_used for transparency (company-level part shared across scenarios)
+        inputs_used = ScenarioInputs(shared_inputs or self._company_inputs(inputs), {
             'terminal_growth': scenario.terminal_growth,
             'revenue_growth_y1_3': scenario.revenue_growth_y1_3,
             'revenue_growth_y4_5': scenario.revenue_growth_y4_5,
             'revenue_growth_y6_10': scenario.revenue_growth_y6_10,
             'target_ebit_margin': scenario.target_ebit_margin
-        }
+        })
 
         return DCFScenarioResult(
             scenario_name=scenario.name,
@@ -258,6 +1031,28 @@ class DCFEngine:
             warnings=warnings
         )
 
+    def _company_inputs(self, inputs: ValuationInputs) -> Dict[str, Any]:
+        """Company-level part of inputs_used, shared by every scenario"""
+        md = inputs.market_data
+        wi = inputs.wacc_inputs
+        return {
+            'base_revenue': md.revenue_ttm,
+            'base_ebit_margin': md.ebit_margin,
+            'net_debt': md.net_debt,
+            'shares_outstanding': md.shares_outstanding,
+            'tax_rate': wi.tax_rate,
+            'risk_free_rate': wi.risk_free_rate,
+            'beta': wi.beta,
+            'equity_risk_premium': wi.equity_risk_premium,
+            'country_risk_premium': wi.country_risk_premium,
+            'cost_of_debt': wi.cost_of_debt,
+            'debt_ratio': wi.debt_to_total_capital,
+            'da_pct': DA_PCT,
+            'capex_pct': CAPEX_PCT,
+            'wc_pct': WC_PCT,
+            'projection_years': self.projection_years
+        }
+
     def _calculate_wacc(
         self,
         risk_free_rate: float,
@@ -268,23 +1063,19 @@ class DCFEngine:
         tax_rate: float,
         debt_ratio: float
     ) -> Tuple[float, float, str]:
-        """Calculate WACC with CAPM for cost of equity"""
-        equity_ratio = 1 - debt_ratio
+        """Calculate WACC with CAPM for cost of equity (memoised in the shared WACC cache)"""
+        cache = get_wacc_cache()
+        args = (risk_free_rate, beta, equity_risk_premium, country_risk_premium, cost_of_debt, tax_rate, debt_ratio)
+        rates = cache.wacc(*args)
 
-        # Cost of Equity using CAPM
-        cost_of_equity = risk_free_rate + beta * equity_risk_premium + country_risk_premium
+        def breakdown():
+            return f"""WACC = (E/V)×Re + (D/V)×Rd×(1-T)
+Re = Rf + β×ERP + CRP = {risk_free_rate:.2%} + {beta:.2f}×{equity_risk_premium:.2%} + {country_risk_premium:.2%} = {rates.cost_of_equity:.2%}
+WACC = {rates.equity_ratio:.0%}×{rates.cost_of_equity:.2%} + {rates.debt_ratio:.0%}×{rates.after_tax_cost_of_debt:.2%} = {rates.wacc:.2%}"""
 
-        # After-tax cost of debt
-        after_tax_cod = cost_of_debt * (1 - tax_rate)
+        calc = cache.memo(('dcf_wacc_calculation',) + args, breakdown)
 
-        # WACC
-        wacc = (equity_ratio * cost_of_equity) + (debt_ratio * after_tax_cod)
-
-        calc = f"""WACC = (E/V)×Re + (D/V)×Rd×(1-T)
-Re = Rf + β×ERP + CRP = {risk_free_rate:.2%} + {beta:.2f}×{equity_risk_premium:.2%} + {country_risk_premium:.2%} = {cost_of_equity:.2%}
-WACC = {equity_ratio:.0%}×{cost_of_equity:.2%} + {debt_ratio:.0%}×{after_tax_cod:.2%} = {wacc:.2%}"""
-
-        return wacc, cost_of_equity, calc
+        return rates.wacc, rates.cost_of_equity, calc
 
     def _project_fcfs(
         self,
@@ -292,18 +1083,19 @@ WACC = {equity_ratio:.0%}×{cost_of_equity:.2%} + {debt_ratio:.0%}×{after_tax_c
         scenario: ScenarioAssumptions,
         tax_rate: float,
         wacc: float
-    ) -> Tuple[List[float], List[YearlyProjection]]:
+    ) -> Tuple[List[float], ProjectionTable]:
         """Project Free Cash Flows for 10 years with detailed breakdown"""
         fcfs = []
-        projections = []
+        columns = {name: array('d') for name in ProjectionTable.STORED}
+        discount_factors = get_wacc_cache().discount_factors(wacc, self.projection_years)
 
         revenue = market_data.revenue_ttm
         ebit_margin = market_data.ebit_margin
 
         # Estimate D&A and CapEx as % of revenue
-        da_pct = 0.05  # 5% of revenue
-        capex_pct = 0.06  # 6% of revenue
-        wc_pct = 0.02  # 2% of revenue growth
+        da_pct = DA_PCT
+        capex_pct = CAPEX_PCT
+        wc_pct = WC_PCT
 
         # Margin improvement trajectory
         margin_step = (scenario.target_ebit_margin - ebit_margin) / scenario.years_to_target_margin
@@ -327,37 +1119,20 @@ WACC = {equity_ratio:.0%}×{cost_of_equity:.2%} + {debt_ratio:.0%}×{after_tax_c
             else:
                 ebit_margin = scenario.target_ebit_margin
 
-            # Calculate components
-            ebit = revenue * ebit_margin
-            nopat = ebit * (1 - tax_rate)
-            da = revenue * da_pct
-            capex = revenue * capex_pct
-            wc_change = (revenue - prev_revenue) * wc_pct
-
             # FCF = NOPAT + D&A - CapEx - ΔWC
-            fcf = nopat + da - capex - wc_change
+            nopat = revenue * ebit_margin * (1 - tax_rate)
+            fcf = nopat + revenue * da_pct - revenue * capex_pct - (revenue - prev_revenue) * wc_pct
             fcfs.append(fcf)
 
-            # Calculate discount factor and PV
-            discount_factor = 1 / ((1 + wacc) ** year)
-            pv_fcf = fcf * discount_factor
-
-            # Store detailed projection
-            projections.append(YearlyProjection(
-                year=year,
-                revenue=revenue,
-                revenue_growth=growth,
-                ebit=ebit,
-                ebit_margin=ebit_margin,
-                nopat=nopat,
-                da=da,
-                capex=capex,
-                wc_change=wc_change,
-                fcf=fcf,
-                discount_factor=discount_factor,
-                pv_fcf=pv_fcf
-            ))
+            # Store the projected columns (EBIT, NOPAT, D&A, CapEx, ΔWC are derived on read)
+            columns['revenue'].append(revenue)
+            columns['revenue_growth'].append(growth)
+            columns['ebit_margin'].append(ebit_margin)
+            columns['fcf'].append(fcf)
+            columns['discount_factor'].append(discount_factors[year - 1])
+            columns['pv_fcf'].append(fcf * discount_factors[year - 1])
 
+        projections = ProjectionTable(**columns, base_revenue=market_data.revenue_ttm, tax_rate=tax_rate)
         return fcfs, projections
 
     def _calculate_pwv(
@@ -11,8 +11,9 @@ Where:
 """
 
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
+from agents.wacc_cache import get_wacc_cache
 from ..assumption_extractor import ValuationInputs
 
 
@@ -96,10 +97,11 @@ class DDMEngine:
                 warnings=warnings
             )
 
-        # Calculate cost of equity using CAPM
-        cost_of_equity = (
-            wi.risk_free_rate +
-            wi.beta * wi.equity_risk_premium +
+        # Calculate cost of equity using CAPM (shared WACC cache)
+        cost_of_equity = get_wacc_cache().cost_of_equity(
+            wi.risk_free_rate,
+            wi.beta,
+            wi.equity_risk_premium,
             wi.country_risk_premium
         )
 
@@ -170,3 +172,31 @@ Fair Value = {d1:.2f} / ({cost_of_equity:.2%} - {dividend_growth:.2%}) = {md.cur
             calculation=calculation,
             warnings=warnings
         )
+
+    def reprice(self, result: DDMResult, inputs: ValuationInputs) -> DDMResult:
+        """
+        Revalue a DDMResult after a market data tick.
+
+        The Gordon fair value does not depend on the share price; only the
+        dividend yield, implied upside and recommendation are recomputed.
+        """
+        md = inputs.market_data
+        if not result.is_applicable:
+            return replace(result, current_price=md.current_price, dividend_yield=md.dividend_yield)
+
+        implied_upside = (result.fair_value / md.current_price - 1) if md.current_price > 0 else 0
+
+        if implied_upside > 0.15:
+            recommendation = "BUY"
+        elif implied_upside < -0.10:
+            recommendation = "SELL"
+        else:
+            recommendation = "HOLD"
+
+        return replace(
+            result,
+            current_price=md.current_price,
+            dividend_yield=md.dividend_yield,
+            implied_upside=implied_upside,
+            recommendation=recommendation
+        )
@@ -0,0 +1,333 @@
+"""
+Monte Carlo Engine - Fair value distribution from sampled DCF assumptions.
+
+The DCF engine values five fixed scenarios with fixed probabilities. This
+engine treats the scenarios as the edges of a distribution instead:
+
+1. For each driver (growth by phase, target margin, terminal growth, WACC
+   adjustment) take the range spanned by the scenarios, with the base case
+   as the most likely value (triangular distribution)
+2. Sample paths with the drivers linked through one common "outlook" factor
+   (Gaussian copula), so bullish growth tends to come with bullish margins
+   and a lower WACC instead of mixing independently
+3. Value every path with the vectorised DCF core (DCFEngine.calculate_arrays)
+4. Report the fair value distribution: mean (the PWV), percentiles,
+   probability of upside and a histogram
+
+Paths are valued in chunks so the (paths x years) working arrays stay
+bounded by chunk_size; only one fair value per path is kept. Chunks can be
+spread over a process pool, but 100k paths take well under a second
+in-process, which is what the Financial Modeler node uses.
+"""
+
+from typing import Dict, List, Tuple, Optional, Any
+from dataclasses import dataclass, field, replace
+from concurrent.futures import ProcessPoolExecutor
+import math
+import time
+
+from ..assumption_extractor import ValuationInputs
+from .dcf_engine import DCFEngine, HAS_NUMPY
+
+if HAS_NUMPY:
+    import numpy as np
+
+
+# Drivers sampled per path, with the direction a bullish outlook moves them
+SAMPLED_DRIVERS = {
+    'revenue_growth_y1_3': 1,
+    'revenue_growth_y4_5': 1,
+    'revenue_growth_y6_10': 1,
+    'target_ebit_margin': 1,
+    'terminal_growth': 1,
+    'wacc_adjustment': -1,  # bullish = lower discount rate
+}
+
+REPORTED_PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+# Above this share of paths hitting the WACC <= g floor the distribution is not trusted
+MAX_WACC_FLOOR_SHARE = 0.05
+
+
+@dataclass
+class DriverRange:
+    """Triangular distribution for one sampled driver"""
+    low: float
+    mode: float
+    high: float
+
+
+@dataclass
+class MonteCarloResult:
+    """Fair value distribution from a Monte Carlo DCF run"""
+    ticker: str
+    current_price: float
+    currency: str
+
+    # Run size
+    n_paths: int
+    elapsed_seconds: float
+
+    # Distribution of fair value per share
+    pwv: float  # mean over paths (each path equally likely)
+    std: float
+    percentiles: Dict[int, float]
+    prob_upside: float  # share of paths with fair value above the current price
+    histogram: Dict[str, List[float]]  # {'edges': [...], 'counts': [...]}
+
+    # Inputs
+    driver_ranges: Dict[str, DriverRange]
+    correlation: float
+
+    # Validation
+    paths_with_wacc_floor: int  # paths where WACC <= g forced the minimum spread
+    is_valid: bool
+    warnings: List[str]
+
+    # Per-path fair values (only with keep_paths=True)
+    fair_values: Optional[Any] = field(default=None, repr=False)
+
+
+def _normal_cdf(x):
+    """Standard normal CDF (Abramowitz & Stegun 7.1.26, |error| < 1.5e-7)"""
+    z = np.abs(x) / math.sqrt(2)
+    t = 1 / (1 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1 - poly * np.exp(-z * z)
+    return 0.5 * (1 + np.sign(x) * erf)
+
+
+def _triangular(u, low: float, mode: float, high: float):
+    """Inverse CDF of a triangular distribution at quantiles u"""
+    if high <= low:
+        return np.full(u.shape, low)
+    split = (mode - low) / (high - low)
+    return np.where(
+        u < split,
+        low + np.sqrt(u * (high - low) * (mode - low)),
+        high - np.sqrt((1 - u) * (high - low) * (high - mode))
+    )
+
+
+def _simulate_chunk(
+    projection_years: int,
+    inputs: ValuationInputs,
+    ranges: Dict[str, DriverRange],
+    fixed: Dict[str, float],
+    correlation: float,
+    seed,
+    size: int
+) -> Tuple[Any, int]:
+    """
+    Sample and value one chunk of paths.
+
+    Module-level so it can run in a worker process.
+
+    Returns:
+        (fair value per path, paths where the WACC floor applied)
+    """
+    rng = np.random.default_rng(seed)
+
+    # Gaussian copula: shared outlook factor plus driver-specific noise
+    outlook = rng.standard_normal(size)
+    arrays = {}
+    for name, direction in SAMPLED_DRIVERS.items():
+        z = math.sqrt(correlation) * outlook + math.sqrt(1 - correlation) * rng.standard_normal(size)
+        u = _normal_cdf(direction * z)
+        r = ranges[name]
+        arrays[name] = _triangular(u, r.low, r.mode, r.high)
+
+    for name, value in fixed.items():
+        arrays[name] = np.full(size, value)
+
+    batch = DCFEngine(projection_years).calculate_arrays(inputs, arrays)
+    return batch.fair_value_per_share, int(np.count_nonzero(batch.critical))
+
+
+class MonteCarloEngine:
+    """
+    Monte Carlo DCF - samples assumptions between the scenario extremes.
+
+    Usage:
+        engine = MonteCarloEngine(n_paths=100_000)
+        result = engine.simulate(valuation_inputs)
+        result.pwv, result.percentiles[5], result.percentiles[95]
+    """
+
+    DEFAULT_PATHS = 100_000
+    DEFAULT_CHUNK_SIZE = 25_000  # paths valued per array pass (~20 MB of working arrays)
+    DEFAULT_CORRELATION = 0.6    # weight of the common outlook factor across drivers
+
+    def __init__(
+        self,
+        projection_years: int = 10,
+        n_paths: int = DEFAULT_PATHS,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        correlation: float = DEFAULT_CORRELATION,
+        workers: int = 0,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            projection_years: DCF projection horizon
+            n_paths: Paths to simulate
+            chunk_size: Paths per chunk - bounds working memory
+            correlation: 0 = drivers independent, 1 = all drivers move together
+            workers: Process pool size for chunks (0/1 = in-process)
+            seed: Seed for reproducible runs (same result for any worker count)
+        """
+        self.projection_years = projection_years
+        self.n_paths = n_paths
+        self.chunk_size = max(1, chunk_size)
+        self.correlation = min(1.0, max(0.0, correlation))
+        self.workers = workers
+        self.seed = seed
+
+    def driver_ranges(self, inputs: ValuationInputs) -> Dict[str, DriverRange]:
+        """Low/most likely/high per driver from the scenario assumptions"""
+        scenarios = list(inputs.scenarios.values())
+        base = inputs.scenarios.get('base')
+        total_probability = sum(s.probability for s in scenarios)
+
+        ranges = {}
+        for name in SAMPLED_DRIVERS:
+            values = [float(getattr(s, name)) for s in scenarios]
+            if base is not None:
+                mode = float(getattr(base, name))
+            elif total_probability > 0:
+                mode = sum(float(getattr(s, name)) * s.probability for s in scenarios) / total_probability
+            else:
+                mode = sum(values) / len(values)
+            ranges[name] = DriverRange(low=min(values), mode=min(max(mode, min(values)), max(values)),
+                                       high=max(values))
+        return ranges
+
+    def simulate(self, inputs: ValuationInputs, n_paths: Optional[int] = None,
+                 keep_paths: bool = False, seed: Optional[int] = None) -> MonteCarloResult:
+        """
+        Run the simulation.
+
+        Args:
+            inputs: Valuation inputs - scenarios define the sampled ranges
+            n_paths: Override the engine's path count
+            keep_paths: Keep every path's fair value on the result
+            seed: Override the engine's seed for this run
+
+        Returns:
+            MonteCarloResult with the fair value distribution
+        """
+        if not HAS_NUMPY:
+            raise ImportError("Monte Carlo valuation requires numpy")
+        if not inputs.scenarios:
+            raise ValueError("Monte Carlo valuation needs at least one scenario")
+
+        start = time.perf_counter()
+        n_paths = n_paths or self.n_paths
+        md = inputs.market_data
+        warnings = []
+
+        ranges = self.driver_ranges(inputs)
+        base = inputs.scenarios.get('base') or next(iter(inputs.scenarios.values()))
+        years_to_target = base.years_to_target_margin
+        if years_to_target == 0:
+            warnings.append("WARNING: years_to_target_margin is 0 - sampling with 1 year")
+            years_to_target = 1
+        fixed = {
+            'probability': 1.0 / n_paths,
+            'years_to_target_margin': years_to_target,
+        }
+
+        if len(inputs.scenarios) < 2:
+            warnings.append("WARNING: Only one scenario - assumption ranges are points, no dispersion")
+
+        # One independent stream per chunk, so results do not depend on workers
+        sizes = [min(self.chunk_size, n_paths - offset) for offset in range(0, n_paths, self.chunk_size)]
+        seeds = np.random.SeedSequence(self.seed if seed is None else seed).spawn(len(sizes))
+        args = [(self.projection_years, inputs, ranges, fixed, self.correlation, seed, size)
+                for seed, size in zip(seeds, sizes)]
+
+        if self.workers > 1 and len(sizes) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(sizes))) as pool:
+                chunks = list(pool.map(_simulate_chunk, *zip(*args)))
+        else:
+            chunks = [_simulate_chunk(*chunk_args) for chunk_args in args]
+
+        fair_values = np.concatenate([values for values, _ in chunks])
+        floored = sum(count for _, count in chunks)
+
+        finite = np.isfinite(fair_values)
+        if not finite.all():
+            warnings.append(f"WARNING: {int((~finite).sum())} paths produced non-finite values and were dropped")
+            fair_values = fair_values[finite]
+
+        if floored:
+            level = "CRITICAL" if floored / n_paths > MAX_WACC_FLOOR_SHARE else "WARNING"
+            warnings.append(f"{level}: {floored / n_paths:.1%} of paths had WACC <= terminal growth "
+                            f"(minimum 2% spread applied)")
+
+        percentile_values = np.percentile(fair_values, REPORTED_PERCENTILES) if fair_values.size else []
+        percentiles = {p: float(v) for p, v in zip(REPORTED_PERCENTILES, percentile_values)}
+
+        # Histogram over the 1st-99th percentile so tails do not flatten it
+        histogram = {'edges': [], 'counts': []}
+        if fair_values.size:
+            lo, hi = np.percentile(fair_values, [1, 99])
+            counts, edges = np.histogram(fair_values, bins=20, range=(lo, hi) if hi > lo else None)
+            histogram = {'edges': edges.tolist(), 'counts': counts.tolist()}
+
+        pwv = float(fair_values.mean()) if fair_values.size else 0.0
+        return MonteCarloResult(
+            ticker=inputs.ticker,
+            current_price=md.current_price,
+            currency=md.currency,
+            n_paths=int(fair_values.size),
+            elapsed_seconds=time.perf_counter() - start,
+            pwv=pwv,
+            std=float(fair_values.std()) if fair_values.size else 0.0,
+            percentiles=percentiles,
+            prob_upside=float((fair_values > md.current_price).mean()) if fair_values.size else 0.0,
+            histogram=histogram,
+            driver_ranges=ranges,
+            correlation=self.correlation,
+            paths_with_wacc_floor=floored,
+            is_valid=fair_values.size > 0 and floored / n_paths <= MAX_WACC_FLOOR_SHARE,
+            warnings=warnings,
+            fair_values=fair_values if keep_paths else None
+        )
+
+    @staticmethod
+    def reprice(result: MonteCarloResult, inputs: ValuationInputs, previous_net_debt: float) -> MonteCarloResult:
+        """
+        Move a MonteCarloResult to new market data without resampling.
+
+        Path enterprise values do not depend on price or net debt, so every
+        path's fair value shifts by the change in net debt per share. The
+        probability of upside needs the paths (simulate(keep_paths=True));
+        without them it is interpolated from the percentiles.
+        """
+        md = inputs.market_data
+        shift = (previous_net_debt - md.net_debt) / md.shares_outstanding if md.shares_outstanding > 0 else 0.0
+
+        fair_values = result.fair_values + shift if result.fair_values is not None else None
+        if fair_values is not None and fair_values.size:
+            prob_upside = float((fair_values > md.current_price).mean())
+        elif result.percentiles:
+            levels = sorted(result.percentiles)
+            values = [result.percentiles[p] + shift for p in levels]
+            prob_upside = 1 - float(np.interp(md.current_price, values, levels)) / 100
+        else:
+            prob_upside = 0.0
+
+        histogram = result.histogram
+        if histogram.get('edges'):
+            histogram = {'edges': [edge + shift for edge in histogram['edges']], 'counts': histogram['counts']}
+
+        return replace(
+            result,
+            current_price=md.current_price,
+            pwv=result.pwv + shift,
+            percentiles={p: v + shift for p, v in result.percentiles.items()},
+            prob_upside=prob_upside,
+            histogram=histogram,
+            fair_values=fair_values
+        )
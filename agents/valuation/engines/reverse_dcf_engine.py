@@ -12,14 +12,46 @@ either:
 Formula:
 Given: Market Price, WACC, Terminal Growth, Current FCF
 Solve for: Implied Revenue Growth Rate
+
+With constant FCF growth g the EV has a closed form (q = (1+g)/(1+WACC)):
+EV = FCF × q(1-q^N)/(1-q) + FCF × q^N × (1+g_T)/(WACC-g_T)
+so implied growth, implied WACC and implied margin are solved with
+safeguarded Newton iteration on analytic derivatives (or directly, for
+margin). A single ticker is solved in scalar form; batches of tickers and
+price x WACC surfaces use the vectorised solvers.
 """
 
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Tuple, Optional, Any
+from dataclasses import dataclass, field
+from collections import OrderedDict
+import hashlib
+import json
 import math
+import time
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
+from agents.wacc_cache import get_wacc_cache
 from ..assumption_extractor import ValuationInputs
 
+FCF_CONVERSION = 0.9               # FCF as a share of NOPAT
+GROWTH_SEARCH_RANGE = (-0.10, 0.50)
+WACC_SEARCH_MAX = 0.50
+SOLVER_TOLERANCE = 1e-12           # relative EV error
+SOLVER_MAX_ITERATIONS = 50
+
+# Implied-growth surface defaults: price moves x WACC shifts around the current inputs
+SURFACE_PRICE_RANGE = 0.30         # ±30% of the reference price
+SURFACE_PRICE_STEP = 0.01          # 1% steps
+SURFACE_WACC_RANGE = 0.02          # ±2% around our WACC
+SURFACE_WACC_STEP = 0.0025
+MAX_CACHED_SURFACES = 64
+PRICE_MOVES = (-0.30, -0.20, -0.10, 0.0, 0.10, 0.20, 0.30)
+
 
 @dataclass
 class ReverseDCFResult:
@@ -49,14 +81,245 @@ class ReverseDCFResult:
     is_valid: bool
     warnings: List[str]
 
+    # Other implied assumptions (holding our base growth)
+    implied_ebit_margin: Optional[float] = None
+    implied_wacc: Optional[float] = None
+    solver_iterations: int = 0
+
+    # Implied growth at our WACC for price moves (from the implied-growth surface)
+    implied_growth_by_price: Optional[Dict[str, Optional[float]]] = None
+
+
+@dataclass
+class ImpliedGrowthSurface:
+    """Implied growth over a price grid x WACC grid for one ticker"""
+    ticker: str
+    currency: str
+    input_hash: str
+    reference_price: float
+
+    prices: Any             # (P,) prices
+    waccs: Any              # (W,) WACC values
+    implied_growth: Any     # (W, P) implied constant FCF growth
+    converged: Any          # (W, P) False where the price is outside the growth search range
+
+    base_wacc: float
+    built_at: float = field(default_factory=time.time)
+
+    def covers(self, price: float, wacc: Optional[float] = None) -> bool:
+        wacc = self.base_wacc if wacc is None else wacc
+        return (self.prices[0] <= price <= self.prices[-1]) and (self.waccs[0] <= wacc <= self.waccs[-1])
+
+    def implied_growth_at(self, price: float, wacc: Optional[float] = None) -> Optional[float]:
+        """
+        Bilinear interpolation of implied growth, or None outside the grid.
+        """
+        wacc = self.base_wacc if wacc is None else wacc
+        if not self.covers(price, wacc):
+            return None
+
+        row = int(np.clip(np.searchsorted(self.waccs, wacc) - 1, 0, len(self.waccs) - 2)) if len(self.waccs) > 1 else 0
+        lower = float(np.interp(price, self.prices, self.implied_growth[row]))
+        if len(self.waccs) == 1:
+            return lower
+        upper = float(np.interp(price, self.prices, self.implied_growth[row + 1]))
+        weight = (wacc - self.waccs[row]) / (self.waccs[row + 1] - self.waccs[row])
+        return float(lower + (upper - lower) * weight)
+
+    def price_move_table(self, price: Optional[float] = None, moves=PRICE_MOVES) -> Dict[str, Optional[float]]:
+        """
+        Implied growth at our WACC for price moves from price (default: the
+        reference price the grid was built around). None where a move falls
+        off the grid.
+        """
+        price = self.reference_price if price is None else price
+        return {f"{move:+.0%}": self.implied_growth_at(price * (1 + move)) for move in moves}
+
+
+# Surfaces per (ticker, input hash), least recently used evicted first
+_surface_cache: "OrderedDict[Tuple[str, str], ImpliedGrowthSurface]" = OrderedDict()
+
+
+def get_cached_surface(ticker: str) -> Optional[ImpliedGrowthSurface]:
+    """Most recently built or used surface for a ticker"""
+    for (cached_ticker, _), surface in reversed(_surface_cache.items()):
+        if cached_ticker == ticker:
+            return surface
+    return None
+
+
+def clear_surface_cache():
+    _surface_cache.clear()
+
+
+def _geometric_sum(q, n: int):
+    """
+    S = q + q^2 + ... + q^n and dS/dq, element-wise.
+
+    Closed form away from q = 1, second-order series around it.
+    """
+    near_one = np.abs(1 - q) < 1e-6
+    safe_q = np.where(near_one, 0.5, q)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        s = safe_q * (1 - safe_q ** n) / (1 - safe_q)
+        ds = (1 - (n + 1) * safe_q ** n + n * safe_q ** (n + 1)) / (1 - safe_q) ** 2
+    dq = q - 1
+    s = np.where(near_one, n + n * (n + 1) / 2 * dq, s)
+    ds = np.where(near_one, n * (n + 1) / 2 + (n + 1) * n * (n - 1) / 3 * dq, ds)
+    return s, ds
+
+
+def _ev_and_growth_derivative(fcf, growth, wacc, terminal_growth, years: int):
+    """EV for constant FCF growth plus Gordon terminal value, and dEV/dgrowth"""
+    q = (1 + growth) / (1 + wacc)
+    annuity, d_annuity = _geometric_sum(q, years)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tv_factor = np.where(wacc > terminal_growth, (1 + terminal_growth) / (wacc - terminal_growth), 0.0)
+    ev = fcf * (annuity + q ** years * tv_factor)
+    d_ev = fcf * (d_annuity + years * q ** (years - 1) * tv_factor) / (1 + wacc)
+    return ev, d_ev
+
+
+def _ev_and_wacc_derivative(fcf, growth, wacc, terminal_growth, years: int):
+    """EV for constant FCF growth plus Gordon terminal value, and dEV/dWACC (WACC > g_T)"""
+    q = (1 + growth) / (1 + wacc)
+    annuity, d_annuity = _geometric_sum(q, years)
+    pv_fcfs = fcf * annuity
+    pv_tv = fcf * q ** years * (1 + terminal_growth) / (wacc - terminal_growth)
+    d_ev = -fcf * d_annuity * q / (1 + wacc) - pv_tv * (years / (1 + wacc) + 1 / (wacc - terminal_growth))
+    return pv_fcfs + pv_tv, d_ev
+
+
+def _safeguarded_newton(func, target, lo, hi, x0,
+                        tolerance: float = SOLVER_TOLERANCE, max_iterations: int = SOLVER_MAX_ITERATIONS):
+    """
+    Solve func(x)[0] = target element-wise for monotonic func on [lo, hi].
+
+    Newton steps on the analytic derivative; a step that leaves the current
+    bracket (or has no usable derivative) is replaced by bisection, so every
+    element converges. Where the bracket holds no root, the bound closest to
+    the target is returned.
+
+    Returns:
+        (x, converged mask, iterations used)
+    """
+    target, lo, hi, x = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (target, lo, hi, x0)))
+    lo, hi, x = lo.copy(), hi.copy(), x.copy()
+    scale = np.maximum(np.abs(target), 1e-12)
+
+    f_lo = func(lo)[0] - target
+    f_hi = func(hi)[0] - target
+    no_root = np.sign(f_lo) * np.sign(f_hi) > 0
+    closest_bound = np.where(np.abs(f_lo) < np.abs(f_hi), lo, hi)
+
+    # Orient brackets so f(lo) <= 0 <= f(hi)
+    flip = f_lo > 0
+    lo, hi = np.where(flip, hi, lo), np.where(flip, lo, hi)
+
+    converged = no_root.copy()
+    iterations = 0
+    for iterations in range(1, max_iterations + 1):
+        value, derivative = func(x)
+        f = value - target
+        converged |= np.abs(f) <= tolerance * scale
+        if converged.all():
+            break
+
+        lo = np.where(f < 0, x, lo)
+        hi = np.where(f > 0, x, hi)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = x - f / derivative
+        inside = np.isfinite(newton) & (newton > np.minimum(lo, hi)) & (newton < np.maximum(lo, hi))
+        step = np.where(inside, newton, (lo + hi) / 2)
+        converged |= np.abs(step - x) <= 1e-15 * np.maximum(1.0, np.abs(x))
+        x = np.where(converged, x, step)
+
+    x = np.where(no_root, closest_bound, x)
+    return x, converged & ~no_root, iterations
+
+
+def _geometric_sum_scalar(q: float, n: int) -> Tuple[float, float]:
+    """Scalar _geometric_sum"""
+    if abs(1 - q) < 1e-6:
+        dq = q - 1
+        return n + n * (n + 1) / 2 * dq, n * (n + 1) / 2 + (n + 1) * n * (n - 1) / 3 * dq
+    q_n = q ** n
+    return q * (1 - q_n) / (1 - q), (1 - (n + 1) * q_n + n * q_n * q) / (1 - q) ** 2
+
+
+def _ev_and_growth_derivative_scalar(fcf: float, growth: float, wacc: float,
+                                     terminal_growth: float, years: int) -> Tuple[float, float]:
+    """Scalar _ev_and_growth_derivative"""
+    q = (1 + growth) / (1 + wacc)
+    annuity, d_annuity = _geometric_sum_scalar(q, years)
+    tv_factor = (1 + terminal_growth) / (wacc - terminal_growth) if wacc > terminal_growth else 0.0
+    ev = fcf * (annuity + q ** years * tv_factor)
+    d_ev = fcf * (d_annuity + years * q ** (years - 1) * tv_factor) / (1 + wacc)
+    return ev, d_ev
+
+
+def _ev_and_wacc_derivative_scalar(fcf: float, growth: float, wacc: float,
+                                   terminal_growth: float, years: int) -> Tuple[float, float]:
+    """Scalar _ev_and_wacc_derivative"""
+    q = (1 + growth) / (1 + wacc)
+    annuity, d_annuity = _geometric_sum_scalar(q, years)
+    pv_fcfs = fcf * annuity
+    pv_tv = fcf * q ** years * (1 + terminal_growth) / (wacc - terminal_growth)
+    d_ev = -fcf * d_annuity * q / (1 + wacc) - pv_tv * (years / (1 + wacc) + 1 / (wacc - terminal_growth))
+    return pv_fcfs + pv_tv, d_ev
+
+
+def _safeguarded_newton_scalar(func, target: float, lo: float, hi: float, x0: float,
+                               tolerance: float = SOLVER_TOLERANCE,
+                               max_iterations: int = SOLVER_MAX_ITERATIONS) -> Tuple[float, bool, int]:
+    """
+    Scalar _safeguarded_newton - same steps, without array overhead.
+
+    Returns:
+        (x, converged, iterations used)
+    """
+    scale = max(abs(target), 1e-12)
+    f_lo = func(lo)[0] - target
+    f_hi = func(hi)[0] - target
+    if f_lo * f_hi > 0:
+        return (lo if abs(f_lo) < abs(f_hi) else hi), False, 0
+
+    # Orient the bracket so f(lo) <= 0 <= f(hi)
+    if f_lo > 0:
+        lo, hi = hi, lo
+
+    x = x0
+    for iterations in range(1, max_iterations + 1):
+        value, derivative = func(x)
+        f = value - target
+        if abs(f) <= tolerance * scale:
+            return x, True, iterations
+
+        if f < 0:
+            lo = x
+        elif f > 0:
+            hi = x
+        newton = x - f / derivative if derivative else math.nan
+        step = newton if math.isfinite(newton) and min(lo, hi) < newton < max(lo, hi) else (lo + hi) / 2
+        if abs(step - x) <= 1e-15 * max(1.0, abs(x)):
+            return x, True, iterations
+        x = step
+
+    return x, False, max_iterations
+
+
+def _growth_range_warning() -> str:
+    return (f"Implied growth outside {GROWTH_SEARCH_RANGE[0]:.0%} to {GROWTH_SEARCH_RANGE[1]:.0%} "
+            f"search range - showing nearest bound")
+
 
 class ReverseDCFEngine:
     """
     Reverse DCF Engine - Derive implied growth from market price.
 
-    This engine iteratively solves for the growth rate that would
-    produce the current market valuation, given fixed WACC and
-    terminal assumptions.
+    This engine solves for the growth rate that would produce the current
+    market valuation, given fixed WACC and terminal assumptions, and
+    likewise for the implied EBIT margin and WACC at our base growth.
 
     This is extremely useful for understanding market expectations.
     """
@@ -64,30 +327,127 @@ class ReverseDCFEngine:
     def __init__(self, projection_years: int = 10):
         self.projection_years = projection_years
 
-    def calculate(self, inputs: ValuationInputs) -> ReverseDCFResult:
+    def calculate(self, inputs: ValuationInputs, implied_margin: bool = True,
+                  implied_wacc: bool = True) -> ReverseDCFResult:
         """
         Calculate implied growth rate from current market price.
 
+        Solved in scalar form - this is the per-ticker path value_inputs and
+        every reprice go through, where array setup would cost more than the
+        solve itself.
+
         Args:
             inputs: Complete valuation inputs
+            implied_margin: Also solve for the EBIT margin the price implies at our base growth
+            implied_wacc: Also solve for the WACC the price implies at our base growth
 
         Returns:
             ReverseDCFResult with implied growth analysis
         """
+        market = self._market_inputs(inputs)
+        years = self.projection_years
+        target_ev, current_fcf = market['target_ev'], market['current_fcf']
+        wacc, terminal_growth = market['wacc'], market['terminal_growth']
+        base_growth = market['our_base_growth']
+
+        growth, growth_converged, iterations = self._solve_growth_scalar(market, target_ev)
+        if not growth_converged:
+            market['warnings'].append(_growth_range_warning())
+
+        margin = None
+        if implied_margin:
+            ev_per_fcf, _ = _ev_and_growth_derivative_scalar(1.0, base_growth, wacc, terminal_growth, years)
+            denominator = ev_per_fcf * market['revenue'] * (1 - market['tax_rate']) * FCF_CONVERSION
+            margin = target_ev / denominator if denominator else None
+
+        implied = None
+        if implied_wacc:
+            wacc_low = terminal_growth + 1e-4
+            solved, wacc_converged, wacc_iterations = _safeguarded_newton_scalar(
+                lambda w: _ev_and_wacc_derivative_scalar(current_fcf, base_growth, w, terminal_growth, years),
+                target_ev, wacc_low, WACC_SEARCH_MAX, min(max(wacc, wacc_low), WACC_SEARCH_MAX)
+            )
+            implied = solved if wacc_converged else None
+            iterations = max(iterations, wacc_iterations)
+
+        return self._build_result(inputs, market, growth, implied_margin=margin,
+                                  implied_wacc=implied, solver_iterations=iterations)
+
+    def calculate_batch(self, inputs_list: List[ValuationInputs], implied_margin: bool = True,
+                        implied_wacc: bool = True) -> List[ReverseDCFResult]:
+        """
+        Reverse DCF for many tickers with one vectorised solve per implied quantity.
+
+        Args:
+            inputs_list: Valuation inputs per ticker
+            implied_margin / implied_wacc: As for calculate()
+
+        Returns:
+            ReverseDCFResult per input, in order
+        """
+        if not HAS_NUMPY:
+            return [self.calculate(inputs, implied_margin, implied_wacc) for inputs in inputs_list]
+
+        markets = [self._market_inputs(inputs) for inputs in inputs_list]
+        if not markets:
+            return []
+
+        column = lambda key: np.array([m[key] for m in markets], dtype=float)
+        target_ev, current_fcf = column('target_ev'), column('current_fcf')
+        wacc, terminal_growth = column('wacc'), column('terminal_growth')
+        base_growth = column('our_base_growth')
+
+        implied_growth, growth_converged, growth_iterations = self.solve_implied_growth(
+            target_ev, current_fcf, wacc, terminal_growth, return_info=True
+        )
+        margins = None
+        if implied_margin:
+            margins = self.solve_implied_margin(
+                target_ev, column('revenue'), column('tax_rate'), base_growth, wacc, terminal_growth
+            )
+        waccs, wacc_converged, wacc_iterations = None, None, 0
+        if implied_wacc:
+            waccs, wacc_converged, wacc_iterations = self.solve_implied_wacc(
+                target_ev, current_fcf, base_growth, terminal_growth, initial_wacc=wacc, return_info=True
+            )
+
+        results = []
+        for i, (inputs, market) in enumerate(zip(inputs_list, markets)):
+            if not growth_converged[i]:
+                market['warnings'].append(_growth_range_warning())
+            results.append(self._build_result(
+                inputs, market, float(implied_growth[i]),
+                implied_margin=float(margins[i]) if margins is not None and np.isfinite(margins[i]) else None,
+                implied_wacc=float(waccs[i]) if waccs is not None and wacc_converged[i] else None,
+                solver_iterations=max(growth_iterations, wacc_iterations)
+            ))
+        return results
+
+    def _solve_growth_scalar(self, market: Dict[str, Any], target_ev: float) -> Tuple[float, bool, int]:
+        """Scalar solve_implied_growth for one target EV against _market_inputs()"""
+        current_fcf, wacc, terminal_growth = market['current_fcf'], market['wacc'], market['terminal_growth']
+        low, high = GROWTH_SEARCH_RANGE
+        return _safeguarded_newton_scalar(
+            lambda g: _ev_and_growth_derivative_scalar(current_fcf, g, wacc, terminal_growth, self.projection_years),
+            target_ev, low, high, min(max(wacc - 0.03, low), high)
+        )
+
+    def _market_inputs(self, inputs: ValuationInputs) -> Dict[str, Any]:
+        """WACC, target EV and current FCF the reverse DCF solves against"""
         warnings = []
         md = inputs.market_data
         wi = inputs.wacc_inputs
 
-        # Calculate WACC
-        cost_of_equity = (
-            wi.risk_free_rate +
-            wi.beta * wi.equity_risk_premium +
-            wi.country_risk_premium
-        )
-        wacc = (
-            (1 - wi.debt_to_total_capital) * cost_of_equity +
-            wi.debt_to_total_capital * wi.cost_of_debt * (1 - wi.tax_rate)
-        )
+        # Calculate WACC (shared with the other engines through the WACC cache)
+        wacc = get_wacc_cache().wacc(
+            wi.risk_free_rate,
+            wi.beta,
+            wi.equity_risk_premium,
+            wi.country_risk_premium,
+            wi.cost_of_debt,
+            wi.tax_rate,
+            wi.debt_to_total_capital
+        ).wacc
 
         # Get terminal growth from base scenario
         base_scenario = inputs.scenarios.get('base')
@@ -98,22 +458,39 @@ class ReverseDCFEngine:
 
         # Current FCF estimate
         if md.ebit_ttm > 0:
-            current_fcf = md.ebit_ttm * (1 - wi.tax_rate) * 0.9  # 90% FCF conversion
+            current_fcf = md.ebit_ttm * (1 - wi.tax_rate) * FCF_CONVERSION
         else:
             current_fcf = md.revenue_ttm * 0.05  # 5% FCF margin assumption
             warnings.append("Using estimated FCF margin (5%)")
 
-        # Binary search for implied growth rate
-        implied_growth = self._solve_for_growth(
-            target_ev=target_ev,
-            current_fcf=current_fcf,
-            wacc=wacc,
-            terminal_growth=terminal_growth,
-            years=self.projection_years
-        )
-
-        # Get our base case growth for comparison
-        our_base_growth = base_scenario.revenue_growth_y1_3 if base_scenario else 0.15
+        return {
+            'wacc': wacc,
+            'terminal_growth': terminal_growth,
+            'target_ev': target_ev,
+            'current_fcf': current_fcf,
+            'revenue': md.revenue_ttm,
+            'tax_rate': wi.tax_rate,
+            # Get our base case growth for comparison
+            'our_base_growth': base_scenario.revenue_growth_y1_3 if base_scenario else 0.15,
+            'warnings': warnings
+        }
+
+    def _build_result(
+        self,
+        inputs: ValuationInputs,
+        market: Dict[str, Any],
+        implied_growth: float,
+        implied_margin: Optional[float] = None,
+        implied_wacc: Optional[float] = None,
+        solver_iterations: int = 0
+    ) -> ReverseDCFResult:
+        """Compare implied growth with our base case and build the result"""
+        md = inputs.market_data
+        wacc = market['wacc']
+        terminal_growth = market['terminal_growth']
+        target_ev = market['target_ev']
+        current_fcf = market['current_fcf']
+        our_base_growth = market['our_base_growth']
 
         # Calculate difference
         growth_difference = implied_growth - our_base_growth
@@ -143,6 +520,13 @@ Our Base Case Growth: {our_base_growth:.2%}
 Difference: {growth_difference:+.2%}
 Market View: {market_view}"""
 
+        if implied_margin is not None or implied_wacc is not None:
+            calculation += f"\n\nAt our base growth ({our_base_growth:.2%}) the price implies:"
+            if implied_margin is not None:
+                calculation += f"\nImplied EBIT Margin: {implied_margin:.2%}"
+            if implied_wacc is not None:
+                calculation += f"\nImplied WACC: {implied_wacc:.2%}"
+
         return ReverseDCFResult(
             ticker=inputs.ticker,
             current_price=md.current_price,
@@ -157,66 +541,156 @@ Market View: {market_view}"""
             market_view=market_view,
             calculation=calculation,
             is_valid=True,
-            warnings=warnings
+            warnings=market['warnings'],
+            implied_ebit_margin=implied_margin,
+            implied_wacc=implied_wacc,
+            solver_iterations=solver_iterations
         )
 
-    def _solve_for_growth(
-        self,
-        target_ev: float,
-        current_fcf: float,
-        wacc: float,
-        terminal_growth: float,
-        years: int
-    ) -> float:
-        """
-        Binary search to find growth rate that produces target EV.
+    # ==========================================
+    # Vectorised solvers
+    # ==========================================
+
+    def solve_implied_growth(self, target_ev, current_fcf, wacc, terminal_growth,
+                             years: Optional[int] = None, return_info: bool = False):
         """
-        low = -0.10  # -10% decline
-        high = 0.50   # 50% growth
-        tolerance = 0.001
+        Constant FCF growth that makes EV equal target_ev.
 
-        for _ in range(50):  # Max iterations
-            mid = (low + high) / 2
-            ev = self._calculate_ev(current_fcf, mid, wacc, terminal_growth, years)
+        Arguments broadcast against each other (e.g. a price grid against
+        one ticker, or one array entry per ticker).
 
-            if abs(ev - target_ev) / target_ev < tolerance:
-                return mid
+        Returns:
+            Implied growth array; with return_info also (converged mask, iterations).
+            Where no growth in GROWTH_SEARCH_RANGE fits, the nearest bound.
+        """
+        years = years or self.projection_years
+        low, high = GROWTH_SEARCH_RANGE
+        func = lambda g: _ev_and_growth_derivative(current_fcf, g, wacc, terminal_growth, years)
+        # Start a little below WACC, where implied growth usually lands; the bracket catches the rest
+        x0 = np.clip(np.asarray(wacc, dtype=float) - 0.03, low, high)
+        growth, converged, iterations = _safeguarded_newton(func, target_ev, low, high, x0)
+        return (growth, converged, iterations) if return_info else growth
+
+    def solve_implied_margin(self, target_ev, revenue, tax_rate, growth, wacc, terminal_growth,
+                             years: Optional[int] = None):
+        """
+        EBIT margin on current revenue that makes EV equal target_ev at the given growth.
 
-            if ev < target_ev:
-                low = mid
-            else:
-                high = mid
+        EV is linear in the starting FCF, so this is exact:
+        FCF_0 = target EV / EV per unit of FCF; margin = FCF_0 / (revenue × (1-T) × conversion)
+        """
+        years = years or self.projection_years
+        ev_per_fcf, _ = _ev_and_growth_derivative(1.0, growth, wacc, terminal_growth, years)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.asarray(target_ev) / ev_per_fcf / (np.asarray(revenue) * (1 - np.asarray(tax_rate)) * FCF_CONVERSION)
 
-        return mid
+    def solve_implied_wacc(self, target_ev, current_fcf, growth, terminal_growth,
+                           initial_wacc=None, years: Optional[int] = None, return_info: bool = False):
+        """
+        WACC that makes EV equal target_ev at the given growth (searched above g_T).
 
-    def _calculate_ev(
+        Returns:
+            Implied WACC array; with return_info also (converged mask, iterations)
+        """
+        years = years or self.projection_years
+        low = np.asarray(terminal_growth, dtype=float) + 1e-4
+        func = lambda w: _ev_and_wacc_derivative(current_fcf, growth, w, terminal_growth, years)
+        x0 = initial_wacc if initial_wacc is not None else low + 0.05
+        x0 = np.clip(x0, low, WACC_SEARCH_MAX)
+        wacc, converged, iterations = _safeguarded_newton(func, target_ev, low, WACC_SEARCH_MAX, x0)
+        return (wacc, converged, iterations) if return_info else wacc
+
+    # ==========================================
+    # Implied-growth surface
+    # ==========================================
+
+    def implied_growth_surface(
         self,
-        current_fcf: float,
-        growth_rate: float,
-        wacc: float,
-        terminal_growth: float,
-        years: int
-    ) -> float:
-        """
-        Calculate EV given growth assumptions.
-        Simplified: assumes constant growth throughout projection period.
-        """
-        # Project FCFs
-        fcfs = []
-        fcf = current_fcf
-        for year in range(1, years + 1):
-            fcf = fcf * (1 + growth_rate)
-            fcfs.append(fcf)
-
-        # PV of FCFs
-        pv_fcfs = sum(fcf / ((1 + wacc) ** (i + 1)) for i, fcf in enumerate(fcfs))
-
-        # Terminal value
-        if wacc > terminal_growth:
-            terminal_fcf = fcfs[-1]
-            tv = terminal_fcf * (1 + terminal_growth) / (wacc - terminal_growth)
-            pv_tv = tv / ((1 + wacc) ** years)
-        else:
-            pv_tv = 0
+        inputs: ValuationInputs,
+        price_range: float = SURFACE_PRICE_RANGE,
+        price_step: float = SURFACE_PRICE_STEP,
+        wacc_range: float = SURFACE_WACC_RANGE,
+        wacc_step: float = SURFACE_WACC_STEP
+    ) -> ImpliedGrowthSurface:
+        """
+        Implied growth for every price x WACC grid point, solved in one pass.
+
+        Cached per ticker and hash of the solver inputs (FCF, net debt, share
+        count, WACC, terminal growth, grid). The current price is not part of
+        the hash, so intraday repricing reuses the surface while the price
+        stays inside the grid - see lookup_implied_growth().
+        """
+        market = self._market_inputs(inputs)
+        md = inputs.market_data
+        key_inputs = {
+            'current_fcf': market['current_fcf'],
+            'net_debt': md.net_debt,
+            'shares': md.market_cap / md.current_price if md.current_price else 0.0,
+            'wacc': market['wacc'],
+            'terminal_growth': market['terminal_growth'],
+            'years': self.projection_years,
+            'grid': [price_range, price_step, wacc_range, wacc_step],
+        }
+        input_hash = hashlib.sha256(json.dumps(key_inputs, sort_keys=True).encode()).hexdigest()[:16]
+        key = (inputs.ticker, input_hash)
+
+        cached = _surface_cache.get(key)
+        if cached is not None and cached.covers(md.current_price):
+            _surface_cache.move_to_end(key)
+            return cached
+
+        steps = int(round(price_range / price_step))
+        moves = np.arange(-steps, steps + 1) * price_step
+        prices = md.current_price * (1 + moves)
+        wacc_steps = int(round(wacc_range / wacc_step))
+        waccs = market['wacc'] + np.arange(-wacc_steps, wacc_steps + 1) * wacc_step
+
+        # EV at each price scales the market cap (price x shares) and keeps net debt
+        target_ev = md.market_cap * (1 + moves)[None, :] + md.net_debt
+        growth, converged, _ = self.solve_implied_growth(
+            target_ev, market['current_fcf'], waccs[:, None], market['terminal_growth'], return_info=True
+        )
 
-        return pv_fcfs + pv_tv
+        surface = ImpliedGrowthSurface(
+            ticker=inputs.ticker,
+            currency=md.currency,
+            input_hash=input_hash,
+            reference_price=md.current_price,
+            prices=prices,
+            waccs=waccs,
+            implied_growth=growth,
+            converged=converged,
+            base_wacc=market['wacc']
+        )
+        _surface_cache[key] = surface
+        while len(_surface_cache) > MAX_CACHED_SURFACES:
+            _surface_cache.popitem(last=False)
+        return surface
+
+    def implied_growth_by_price(self, inputs: ValuationInputs, moves=PRICE_MOVES) -> Dict[str, Optional[float]]:
+        """
+        Implied growth at our WACC for price moves from the CURRENT price.
+
+        Read off the cached surface, which may have been built around an
+        earlier price; moves that fall off its grid are solved directly.
+        """
+        md = inputs.market_data
+        table = self.implied_growth_surface(inputs).price_move_table(md.current_price, moves)
+
+        market = None
+        for move in moves:
+            label = f"{move:+.0%}"
+            if table[label] is None:
+                market = market or self._market_inputs(inputs)
+                table[label], _, _ = self._solve_growth_scalar(market, md.market_cap * (1 + move) + md.net_debt)
+        return table
+
+    @staticmethod
+    def lookup_implied_growth(ticker: str, price: float, wacc: Optional[float] = None) -> Optional[float]:
+        """
+        Implied growth at a new price from the cached surface (no solve).
+
+        Returns None if the ticker has no surface or the price/WACC is off the grid.
+        """
+        surface = get_cached_surface(ticker)
+        return surface.implied_growth_at(price, wacc) if surface else None
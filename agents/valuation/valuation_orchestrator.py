@@ -18,9 +18,12 @@ Usage:
     )
 """
 
+import hashlib
 import json
-from typing import Dict, Any, Optional
-from dataclasses import asdict
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from dataclasses import asdict, replace
 
 from .assumption_extractor import (
     AssumptionExtractor,
@@ -32,12 +35,90 @@ from .assumption_extractor import (
     ScenarioAssumptions
 )
 from .engines.dcf_engine import DCFEngine
-from .engines.comps_engine import CompsEngine
+from .engines.comps_engine import CompsEngine, PeerTable
 from .engines.ddm_engine import DDMEngine
 from .engines.reverse_dcf_engine import ReverseDCFEngine
+from .engines.monte_carlo_engine import MonteCarloEngine
+from .engines.dcf_engine import HAS_NUMPY
 from .cross_checker import CrossChecker
 from .consensus_builder import ConsensusBuilder, ConsensusValuation
 
+# Extracted inputs are also written here, so reprice() works in a new process
+VALUATION_INPUTS_DIR = Path(__file__).parent.parent.parent / "context"
+
+# Market data fields reprice() can move - none of them change the FCF projections
+REPRICE_FIELDS = ('current_price', 'market_cap', 'net_debt', 'total_debt', 'cash')
+
+# Last valuation per ticker: extracted inputs plus engine results. Module level
+# because run_valuation_node builds a new orchestrator for every node run.
+_last_valuations: Dict[str, Dict[str, Any]] = {}
+
+
+def _ticker_key(ticker: str) -> str:
+    return ticker.replace(' ', '_')
+
+
+def save_valuation_inputs(inputs: ValuationInputs, directory: Optional[Path] = None) -> Path:
+    """Write extracted inputs to {directory}/{ticker}_valuation_inputs.json"""
+    directory = Path(directory or VALUATION_INPUTS_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{_ticker_key(inputs.ticker)}_valuation_inputs.json"
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(asdict(inputs), f, indent=2, default=str)
+    return path
+
+
+def load_valuation_inputs(ticker: str, directory: Optional[Path] = None) -> Optional[ValuationInputs]:
+    """Read inputs saved by save_valuation_inputs, or None if there are none"""
+    path = Path(directory or VALUATION_INPUTS_DIR) / f"{_ticker_key(ticker)}_valuation_inputs.json"
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    data['market_data'] = MarketData(**data['market_data'])
+    data['wacc_inputs'] = WACCInputs(**data['wacc_inputs'])
+    data['scenarios'] = {name: ScenarioAssumptions(**s) for name, s in data['scenarios'].items()}
+    data['peers'] = [PeerData(**p) for p in data.get('peers', [])]
+    return ValuationInputs(**data)
+
+
+def get_last_valuation_inputs(ticker: str) -> Optional[ValuationInputs]:
+    """Inputs of the last valuation of ticker (this process, else saved to disk)"""
+    state = _last_valuations.get(_ticker_key(ticker))
+    return state['inputs'] if state else load_valuation_inputs(ticker)
+
+
+def get_last_valuation_state(ticker: str) -> Optional[Dict[str, Any]]:
+    """Inputs and engine results of the last valuation of ticker in this process"""
+    return _last_valuations.get(_ticker_key(ticker))
+
+
+def restore_valuation_state(ticker: str, state: Dict[str, Any]):
+    """Make state (from get_last_valuation_state) the last valuation again, e.g. on a cache hit"""
+    _last_valuations[_ticker_key(ticker)] = state
+
+
+def fingerprint_valuation_inputs(inputs: ValuationInputs) -> str:
+    """
+    Stable hash of everything the engines read: scenario numbers, WACC
+    inputs, market data, peer multiples and broker targets. Equal
+    fingerprints give equal valuations.
+
+    Free text the engines never read is left out - scenario rationale and
+    source (AI prose with multi-AI extraction), input sources and data date -
+    so a retry that only rewords the reasoning behind the same numbers still
+    matches. The output echoes the rationale, so callers reusing a result
+    must refresh it (see PythonValuationExecutor).
+    """
+    fields = asdict(inputs)
+    fields.pop('sources')
+    fields.pop('data_date')
+    for scenario in fields['scenarios'].values():
+        scenario.pop('rationale')
+        scenario.pop('source')
+    payload = json.dumps(fields, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
 
 class ValuationOrchestrator:
     """
@@ -47,11 +128,17 @@ class ValuationOrchestrator:
     comprehensive valuation report with cross-checked results.
     """
 
-    def __init__(self, projection_years: int = 10, use_multi_ai: bool = True):
+    def __init__(self, projection_years: int = 10, use_multi_ai: bool = True,
+                 monte_carlo_paths: int = MonteCarloEngine.DEFAULT_PATHS):
         self.dcf_engine = DCFEngine(projection_years)
         self.comps_engine = CompsEngine()
         self.ddm_engine = DDMEngine()
         self.reverse_dcf_engine = ReverseDCFEngine(projection_years)
+        # Fair value distribution across the scenario ranges (0 paths = off)
+        self.monte_carlo_engine = (
+            MonteCarloEngine(projection_years, n_paths=monte_carlo_paths)
+            if HAS_NUMPY and monte_carlo_paths > 0 else None
+        )
         self.cross_checker = CrossChecker()
         self.consensus_builder = ConsensusBuilder()
         self.assumption_extractor = AssumptionExtractor()
@@ -90,6 +177,33 @@ class ValuationOrchestrator:
         Returns:
             Comprehensive valuation result as dict
         """
+        valuation_inputs = self.extract_inputs(
+            ticker=ticker,
+            debate_outputs=debate_outputs,
+            market_data_raw=market_data_raw,
+            peers_data=peers_data,
+            industry_researcher_output=industry_researcher_output,
+            business_model_output=business_model_output,
+            company_name=company_name,
+            dot_connector_output=dot_connector_output
+        )
+        return self.value_inputs(valuation_inputs, market_data_raw, broker_target)
+
+    def extract_inputs(
+        self,
+        ticker: str,
+        debate_outputs: Dict[str, str],
+        market_data_raw: Dict[str, Any],
+        peers_data: Optional[list] = None,
+        industry_researcher_output: str = "",
+        business_model_output: str = "",
+        company_name: str = "",
+        dot_connector_output: str = ""
+    ) -> ValuationInputs:
+        """
+        Steps 1-3 of run_valuation: market data, WACC inputs and assumption
+        extraction (the AI part). Same arguments as run_valuation.
+        """
         # Step 1: Prepare market data
         market_data = self._prepare_market_data(ticker, market_data_raw)
 
@@ -127,11 +241,40 @@ class ValuationOrchestrator:
         if peers_data:
             valuation_inputs.peers = self._prepare_peers(peers_data)
 
+        return valuation_inputs
+
+    def value_inputs(
+        self,
+        valuation_inputs: ValuationInputs,
+        market_data_raw: Optional[Dict[str, Any]] = None,
+        broker_target: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Steps 4-7 of run_valuation: all engines, cross-check, consensus and
+        output for already-extracted inputs (no AI calls).
+
+        Args:
+            valuation_inputs: Inputs from extract_inputs()
+            market_data_raw: Raw market data (broker target fields)
+            broker_target: Optional broker consensus target price
+
+        Returns:
+            Comprehensive valuation result as dict
+        """
+        ticker = valuation_inputs.ticker
+
         # Step 4: Run all valuation engines
         dcf_result = self.dcf_engine.calculate(valuation_inputs)
         comps_result = self.comps_engine.calculate(valuation_inputs)
         ddm_result = self.ddm_engine.calculate(valuation_inputs)
         reverse_dcf_result = self.reverse_dcf_engine.calculate(valuation_inputs)
+        if HAS_NUMPY:
+            # Cached per ticker/inputs - later repricing is a lookup on this surface
+            reverse_dcf_result.implied_growth_by_price = self.reverse_dcf_engine.implied_growth_by_price(
+                valuation_inputs
+            )
+        monte_carlo_result = self._run_monte_carlo(valuation_inputs)
+        dcf_sensitivities = self.dcf_engine.sensitivities(valuation_inputs)
 
         # Step 5: Cross-check results
         cross_check = self.cross_checker.check(
@@ -152,26 +295,295 @@ class ValuationOrchestrator:
             broker_target=broker_target
         )
 
-        # Get broker target from market_data if not provided explicitly
-        actual_broker_target = broker_target
-        if not actual_broker_target and market_data_raw:
-            actual_broker_target = market_data_raw.get('broker_target_avg')
-
         # Step 7: Build comprehensive output
         output = self._build_output(
             valuation_inputs, dcf_result, comps_result, ddm_result,
-            reverse_dcf_result, cross_check, consensus
+            reverse_dcf_result, cross_check, consensus, monte_carlo_result,
+            dcf_sensitivities
         )
 
         # Add broker consensus data for DCF Validator
-        if actual_broker_target:
-            output['broker_target_avg'] = actual_broker_target
-            output['broker_target_low'] = market_data_raw.get('broker_target_low') if market_data_raw else None
-            output['broker_target_high'] = market_data_raw.get('broker_target_high') if market_data_raw else None
-            output['broker_count'] = market_data_raw.get('broker_count', 5) if market_data_raw else 5
+        output.update(self._broker_fields(broker_target, market_data_raw))
+
+        # Keep inputs and results so reprice() can revalue without re-extracting
+        _last_valuations[_ticker_key(ticker)] = {
+            'inputs': valuation_inputs,
+            'dcf': dcf_result,
+            'comps': comps_result,
+            'ddm': ddm_result,
+            'monte_carlo': monte_carlo_result,
+            'dcf_sensitivities': dcf_sensitivities,
+            'broker_target': broker_target,
+            'broker': {k: v for k, v in output.items() if k.startswith('broker_')}
+        }
+        # Best effort - the valuation is already complete, so nothing here may fail it
+        try:
+            save_valuation_inputs(valuation_inputs)
+            from agents.peer_index import get_peer_index
+            get_peer_index().refresh(ticker)  # new fundamentals for peer selection
+        except Exception as e:
+            print(f"[ValuationOrchestrator] Could not save valuation inputs / refresh peer index: {e}")
+
+        return output
+
+    def reprice(self, ticker: str, market_delta: Dict[str, float]) -> Dict[str, Any]:
+        """
+        Revalue the last valuation of ticker after a market data tick.
+
+        Reuses the extracted assumptions and the scenario FCF projections (no AI
+        calls, no re-projection) and recomputes only what the tick affects:
+        equity and per-share values, comps per-share values, reverse DCF
+        implied growth, upsides, cross-check, consensus and recommendations.
 
+        Args:
+            ticker: Ticker valued earlier by run_valuation (this process, or
+                inputs saved to VALUATION_INPUTS_DIR)
+            market_delta: New values for the fields that moved (REPRICE_FIELDS),
+                e.g. {'current_price': 51.2} or {'net_debt': 1800.0}
+
+        Returns:
+            Output dict with the same shape as run_valuation
+        """
+        unsupported = sorted(set(market_delta) - set(REPRICE_FIELDS))
+        if unsupported:
+            raise ValueError(f"reprice() cannot apply {unsupported} - these change the projections, "
+                             f"use run_valuation")
+
+        start = time.perf_counter()
+        key = _ticker_key(ticker)
+        state = _last_valuations.get(key)
+        if state is None:
+            inputs = load_valuation_inputs(ticker)
+            if inputs is None:
+                raise KeyError(f"No previous valuation for {ticker} - run run_valuation first")
+            state = {
+                'inputs': inputs,
+                'dcf': self.dcf_engine.calculate(inputs),
+                'comps': self.comps_engine.calculate(inputs),
+                'ddm': self.ddm_engine.calculate(inputs),
+                'monte_carlo': self._run_monte_carlo(inputs),
+                'dcf_sensitivities': self.dcf_engine.sensitivities(inputs),
+                'broker_target': inputs.broker_target_avg,
+                'broker': {}
+            }
+
+        inputs = self.apply_market_data(state['inputs'], market_delta)
+        dcf_result = self.dcf_engine.reprice(state['dcf'], inputs)
+        comps_result = self.comps_engine.reprice(state['comps'], inputs)
+        ddm_result = self.ddm_engine.reprice(state['ddm'], inputs)
+        reverse_dcf_result = self.reverse_dcf_engine.calculate(inputs)
+        if HAS_NUMPY:
+            # Same solver inputs unless net debt moved - a cache hit inside the price grid
+            reverse_dcf_result.implied_growth_by_price = self.reverse_dcf_engine.implied_growth_by_price(inputs)
+        if state.get('dcf_sensitivities') is not None:
+            dcf_sensitivities = DCFEngine.reprice_sensitivities(state['dcf_sensitivities'], inputs)
+        else:
+            # State restored from elsewhere (restore_valuation_state) without sensitivities
+            dcf_sensitivities = self.dcf_engine.sensitivities(inputs)
+        monte_carlo_result = state['monte_carlo']
+        if monte_carlo_result is not None:
+            monte_carlo_result = MonteCarloEngine.reprice(
+                monte_carlo_result, inputs, state['inputs'].market_data.net_debt
+            )
+
+        broker_target = state['broker_target']
+        cross_check = self.cross_checker.check(
+            dcf_result=dcf_result,
+            comps_result=comps_result,
+            ddm_result=ddm_result,
+            reverse_dcf_result=reverse_dcf_result,
+            broker_target=broker_target
+        )
+        consensus = self.consensus_builder.build_consensus(
+            dcf_result=dcf_result,
+            comps_result=comps_result,
+            ddm_result=ddm_result,
+            reverse_dcf_result=reverse_dcf_result,
+            cross_check=cross_check,
+            broker_target=broker_target
+        )
+
+        output = self._build_output(
+            inputs, dcf_result, comps_result, ddm_result,
+            reverse_dcf_result, cross_check, consensus, monte_carlo_result,
+            dcf_sensitivities
+        )
+        output.update(state['broker'])
+
+        _last_valuations[key] = {
+            **state,
+            'inputs': inputs,
+            'dcf': dcf_result,
+            'comps': comps_result,
+            'ddm': ddm_result,
+            'monte_carlo': monte_carlo_result,
+            'dcf_sensitivities': dcf_sensitivities
+        }
+
+        print(f"[ValuationOrchestrator] Repriced {ticker} ({', '.join(sorted(market_delta))}) in "
+              f"{(time.perf_counter() - start) * 1000:.1f}ms")
         return output
 
+    @staticmethod
+    def apply_market_data(inputs: ValuationInputs, market_delta: Dict[str, float]) -> ValuationInputs:
+        """
+        Copy of inputs with new market data values.
+
+        A price move without an explicit market cap scales the market cap, and
+        price-based multiples (P/E, P/B, dividend yield) follow the price. A
+        total_debt/cash move without an explicit net_debt recomputes net debt.
+        """
+        md = inputs.market_data
+        changes = dict(market_delta)
+        price = changes.get('current_price', md.current_price)
+        ratio = price / md.current_price if md.current_price > 0 else 1.0
+
+        if 'market_cap' not in changes:
+            changes['market_cap'] = md.market_cap * ratio
+        if 'net_debt' not in changes and ('total_debt' in changes or 'cash' in changes):
+            changes['net_debt'] = changes.get('total_debt', md.total_debt) - changes.get('cash', md.cash)
+        if md.pe_ratio:
+            changes['pe_ratio'] = md.pe_ratio * ratio
+        if md.price_to_book:
+            changes['price_to_book'] = md.price_to_book * ratio
+        if md.dividend_yield and ratio > 0:
+            changes['dividend_yield'] = md.dividend_yield / ratio
+
+        return replace(inputs, market_data=replace(md, **changes))
+
+    def run_batch_valuation(
+        self,
+        inputs_list: List[ValuationInputs],
+        broker_targets: Optional[Dict[str, float]] = None,
+        sectors: Optional[Dict[str, str]] = None,
+        peer_tables: Optional[Dict[str, PeerTable]] = None,
+        market_data_raw: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Value many companies from already-extracted inputs (no AI extraction).
+
+        DCF runs every scenario of every company in one array pass and the
+        reverse DCF solves all companies in one vectorised call; comps, DDM,
+        cross-check and consensus are closed-form per company. Use after a
+        rate or market move (see apply_market_move) to revalue a universe.
+
+        Args:
+            inputs_list: Valuation inputs per company
+            broker_targets: Optional broker target price per ticker
+            sectors: Optional sector per ticker
+            peer_tables: Optional peer universe per sector - every ticker in
+                the sector is valued against it (its own row excluded) and
+                the peer statistics are computed once per sector
+            market_data_raw: Optional raw market data per ticker, for the
+                broker consensus fields (broker_target_avg/low/high, broker_count)
+
+        Returns:
+            Dict of ticker -> output dict, same shape as value_inputs except
+            that the per-ticker extras too costly for a universe revaluation
+            are None: dcf.sensitivities, dcf.monte_carlo and
+            reverse_dcf.implied_growth_by_price
+        """
+        start = time.perf_counter()
+        broker_targets = broker_targets or {}
+        market_data_raw = market_data_raw or {}
+        sectors = sectors or {}
+        peer_tables = peer_tables or {}
+
+        dcf_results = self.dcf_engine.calculate_portfolio(inputs_list)
+        reverse_dcf_results = self.reverse_dcf_engine.calculate_batch(inputs_list)
+
+        outputs = {}
+        for inputs, dcf_result, reverse_dcf_result in zip(inputs_list, dcf_results, reverse_dcf_results):
+            sector = sectors.get(inputs.ticker)
+            comps_result = self.comps_engine.calculate(
+                inputs, peer_table=peer_tables.get(sector), sector=sector
+            )
+            ddm_result = self.ddm_engine.calculate(inputs)
+            broker_target = broker_targets.get(inputs.ticker)
+
+            cross_check = self.cross_checker.check(
+                dcf_result=dcf_result,
+                comps_result=comps_result,
+                ddm_result=ddm_result,
+                reverse_dcf_result=reverse_dcf_result,
+                broker_target=broker_target
+            )
+            consensus = self.consensus_builder.build_consensus(
+                dcf_result=dcf_result,
+                comps_result=comps_result,
+                ddm_result=ddm_result,
+                reverse_dcf_result=reverse_dcf_result,
+                cross_check=cross_check,
+                broker_target=broker_target
+            )
+            outputs[inputs.ticker] = self._build_output(
+                inputs, dcf_result, comps_result, ddm_result,
+                reverse_dcf_result, cross_check, consensus
+            )
+            outputs[inputs.ticker].update(
+                self._broker_fields(broker_target, market_data_raw.get(inputs.ticker))
+            )
+
+        print(f"[ValuationOrchestrator] Batch valuation: {len(inputs_list)} tickers in "
+              f"{(time.perf_counter() - start) * 1000:.1f}ms")
+        return outputs
+
+    @staticmethod
+    def apply_market_move(
+        inputs: ValuationInputs,
+        risk_free_shift: float = 0.0,
+        price_change: float = 0.0
+    ) -> ValuationInputs:
+        """
+        Copy of inputs after a market move.
+
+        Args:
+            risk_free_shift: Added to the risk-free rate (e.g. 0.0025 for +25bp)
+            price_change: Relative share price move (e.g. -0.05); market cap follows
+        """
+        md = inputs.market_data
+        market_data = replace(
+            md,
+            current_price=md.current_price * (1 + price_change),
+            market_cap=md.market_cap * (1 + price_change)
+        )
+        wacc_inputs = replace(inputs.wacc_inputs, risk_free_rate=inputs.wacc_inputs.risk_free_rate + risk_free_shift)
+        return replace(inputs, market_data=market_data, wacc_inputs=wacc_inputs)
+
+    @staticmethod
+    def _broker_fields(broker_target: Optional[float],
+                       market_data_raw: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Broker consensus fields for the DCF Validator (empty without a target)"""
+        market_data_raw = market_data_raw or {}
+        # Get broker target from market_data if not provided explicitly
+        broker_target = broker_target or market_data_raw.get('broker_target_avg')
+        if not broker_target:
+            return {}
+        return {
+            'broker_target_avg': broker_target,
+            'broker_target_low': market_data_raw.get('broker_target_low'),
+            'broker_target_high': market_data_raw.get('broker_target_high'),
+            'broker_count': market_data_raw.get('broker_count', 5)
+        }
+
+    def _run_monte_carlo(self, inputs: ValuationInputs):
+        """Monte Carlo DCF distribution, or None if disabled or failed"""
+        if not self.monte_carlo_engine or not inputs.scenarios:
+            return None
+        try:
+            # Seeded from the inputs so equal fingerprints give equal percentiles.
+            # The reprice fields are left out: reprice() shifts the stored paths,
+            # which must match a fresh run on the moved market data
+            fixed_market = replace(inputs.market_data, **{name: 0.0 for name in REPRICE_FIELDS})
+            seed = int(fingerprint_valuation_inputs(replace(inputs, market_data=fixed_market)), 16)
+            result = self.monte_carlo_engine.simulate(inputs, keep_paths=True, seed=seed)  # reprice() shifts the paths
+            print(f"[ValuationOrchestrator] Monte Carlo: {result.n_paths:,} paths in {result.elapsed_seconds:.2f}s, "
+                  f"mean {result.pwv:.2f}, P5-P95 {result.percentiles.get(5, 0):.2f}-{result.percentiles.get(95, 0):.2f}")
+            return result
+        except Exception as e:
+            print(f"[ValuationOrchestrator] Monte Carlo failed: {e}")
+            return None
+
     def _run_multi_ai_extraction(
         self,
         ticker: str,
@@ -419,7 +831,8 @@ class ValuationOrchestrator:
     def _build_output(
         self,
         inputs: ValuationInputs,
-        dcf, comps, ddm, reverse_dcf, cross_check, consensus
+        dcf, comps, ddm, reverse_dcf, cross_check, consensus, monte_carlo=None,
+        dcf_sensitivities=None
     ) -> Dict[str, Any]:
         """Build comprehensive output dict"""
         return {
@@ -457,30 +870,30 @@ class ValuationOrchestrator:
                         'pv_fcfs': s.pv_fcfs,
                         'wacc_calculation': s.wacc_calculation,
                         # Detailed inputs used
-                        'inputs_used': s.inputs_used if hasattr(s, 'inputs_used') else {},
-                        # Yearly projections with all numbers
-                        'yearly_projections': [
-                            {
-                                'year': p.year,
-                                'revenue': p.revenue,
-                                'revenue_growth': p.revenue_growth,
-                                'ebit': p.ebit,
-                                'ebit_margin': p.ebit_margin,
-                                'nopat': p.nopat,
-                                'da': p.da,
-                                'capex': p.capex,
-                                'wc_change': p.wc_change,
-                                'fcf': p.fcf,
-                                'discount_factor': p.discount_factor,
-                                'pv_fcf': p.pv_fcf
-                            }
-                            for p in (s.yearly_projections if hasattr(s, 'yearly_projections') else [])
-                        ]
+                        'inputs_used': dict(s.inputs_used),
+                        # Yearly projections with all numbers (rendered from the columnar table)
+                        'yearly_projections': s.yearly_projections.to_dicts()
                     }
                     for name, s in dcf.scenarios.items()
                 },
                 'pwv_calculation': dcf.pwv_calculation,
-                'warnings': dcf.warnings
+                'warnings': dcf.warnings,
+                # d(fair value per share)/d(input) per scenario and for the PWV (None in batch runs)
+                'sensitivities': dcf_sensitivities.to_dict() if dcf_sensitivities else None,
+                # Distribution across the scenario ranges (None if disabled)
+                'monte_carlo': {
+                    'paths': monte_carlo.n_paths,
+                    'mean_fair_value': monte_carlo.pwv,
+                    'std': monte_carlo.std,
+                    'percentiles': {f"p{p}": v for p, v in monte_carlo.percentiles.items()},
+                    'prob_upside': monte_carlo.prob_upside,
+                    'histogram': monte_carlo.histogram,
+                    'driver_ranges': {name: asdict(r) for name, r in monte_carlo.driver_ranges.items()},
+                    'correlation': monte_carlo.correlation,
+                    'elapsed_seconds': monte_carlo.elapsed_seconds,
+                    'is_valid': monte_carlo.is_valid,
+                    'warnings': monte_carlo.warnings
+                } if monte_carlo else None
             },
 
             'comps': {
@@ -501,6 +914,13 @@ class ValuationOrchestrator:
                     'from_ev_revenue': comps.implied_from_ev_revenue,
                     'from_pb': comps.implied_from_pb
                 },
+                'peer_statistics': {
+                    'sector': comps.peer_statistics.sector,
+                    'multiples': {name: asdict(m) for name, m in comps.peer_statistics.multiples.items()},
+                    'regressions': {name: asdict(r) for name, r in comps.peer_statistics.regressions.items()}
+                } if comps.peer_statistics else None,
+                'regression_multiples': comps.regression_multiples,
+                'implied_from_regression': comps.implied_from_regression,
                 'warnings': comps.warnings
             },
 
@@ -522,6 +942,9 @@ class ValuationOrchestrator:
                 'growth_difference': reverse_dcf.growth_difference,
                 'market_view': reverse_dcf.market_view,
                 'description': reverse_dcf.implied_growth_description,
+                'implied_ebit_margin': reverse_dcf.implied_ebit_margin,
+                'implied_wacc': reverse_dcf.implied_wacc,
+                'implied_growth_by_price': reverse_dcf.implied_growth_by_price,
                 'is_valid': reverse_dcf.is_valid,
                 'warnings': reverse_dcf.warnings
             },
@@ -0,0 +1,173 @@
+"""
+WACC Cache - Shared, bounded memo of discount-rate calculations
+
+DCFEngine, ReverseDCFEngine, DDMEngine, FinancialCalculator (and through it
+the compute_wacc MCP tool) all derive CAPM cost of equity and WACC from the
+same handful of inputs, and the DCF paths rebuild (1 + WACC)^-t for every
+year of every scenario. Within a run - and across sensitivity grids, which
+revisit the same WACC points - those inputs repeat, so every engine goes
+through one process-wide cache:
+
+- wacc(): CAPM cost of equity, after-tax cost of debt and WACC
+- cost_of_equity(): CAPM only (DDM)
+- discount_factors(): 1 / (1 + rate)^t for t = 1..years
+- discount_matrix(): the same for an array of rates, one row per rate
+- memo(): any other derived value, e.g. a formatted WACC breakdown
+
+Entries are keyed by the exact input values (no rounding, so cached and
+computed results are identical) and the least recently used entries are
+evicted beyond max_entries. Large rate arrays (Monte Carlo chunks, where
+rates never repeat) bypass the cache.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+DEFAULT_MAX_ENTRIES = 4096
+
+# Rate arrays longer than this are computed directly instead of row by row from the cache
+MAX_CACHED_MATRIX_ROWS = 256
+
+
+class WACCBreakdown(NamedTuple):
+    """WACC and its components"""
+    wacc: float
+    cost_of_equity: float
+    after_tax_cost_of_debt: float
+    equity_ratio: float
+    debt_ratio: float
+
+
+class WACCCache:
+    """
+    LRU cache of WACC breakdowns and discount-factor vectors.
+
+    Usage:
+        cache = get_wacc_cache()
+        rates = cache.wacc(0.04, 1.1, 0.06, 0.0, 0.05, 0.25, 0.2)
+        factors = cache.discount_factors(rates.wacc, 10)
+        print(cache.stats())
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def memo(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Cached value for key, calling compute() on a miss"""
+        try:
+            value = self._entries[key]
+        except KeyError:
+            pass
+        else:
+            # Hit path takes no lock; an entry evicted meanwhile is simply not refreshed
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                pass
+            self.hits += 1
+            return value
+
+        value = compute()
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def wacc(
+        self,
+        risk_free_rate: float,
+        beta: float,
+        equity_risk_premium: float,
+        country_risk_premium: float,
+        cost_of_debt: float,
+        tax_rate: float,
+        debt_ratio: float
+    ) -> WACCBreakdown:
+        """WACC = (E/V) x Re + (D/V) x Rd x (1-T), with Re from CAPM"""
+        def compute():
+            cost_of_equity = self.cost_of_equity(risk_free_rate, beta, equity_risk_premium, country_risk_premium)
+            after_tax_cost_of_debt = cost_of_debt * (1 - tax_rate)
+            equity_ratio = 1 - debt_ratio
+            return WACCBreakdown(
+                wacc=(equity_ratio * cost_of_equity) + (debt_ratio * after_tax_cost_of_debt),
+                cost_of_equity=cost_of_equity,
+                after_tax_cost_of_debt=after_tax_cost_of_debt,
+                equity_ratio=equity_ratio,
+                debt_ratio=debt_ratio
+            )
+
+        key = ('wacc', risk_free_rate, beta, equity_risk_premium, country_risk_premium,
+               cost_of_debt, tax_rate, debt_ratio)
+        return self.memo(key, compute)
+
+    def cost_of_equity(
+        self,
+        risk_free_rate: float,
+        beta: float,
+        equity_risk_premium: float,
+        country_risk_premium: float = 0.0
+    ) -> float:
+        """Re = Rf + beta x ERP + CRP"""
+        key = ('cost_of_equity', risk_free_rate, beta, equity_risk_premium, country_risk_premium)
+        return self.memo(key, lambda: risk_free_rate + beta * equity_risk_premium + country_risk_premium)
+
+    def discount_factors(self, rate: float, years: int) -> Tuple[float, ...]:
+        """1 / (1 + rate)^t for t = 1..years"""
+        rate = float(rate)
+        return self.memo(
+            ('discount_factors', rate, years),
+            lambda: tuple(1 / ((1 + rate) ** year) for year in range(1, years + 1))
+        )
+
+    def discount_matrix(self, rates, years: int):
+        """
+        Discount factors for an array of rates, shape rates.shape + (years,).
+
+        Built from the cached per-rate vectors (so repeated grids are lookups)
+        unless the array is larger than MAX_CACHED_MATRIX_ROWS.
+        """
+        rates = np.asarray(rates, dtype=float)
+        if rates.size > MAX_CACHED_MATRIX_ROWS:
+            return 1 / ((1 + rates[..., None]) ** np.arange(1, years + 1))
+
+        unique, inverse = np.unique(rates, return_inverse=True)
+        table = np.array([self.discount_factors(rate, years) for rate in unique.tolist()], dtype=float)
+        return table.reshape(len(unique), years)[inverse.reshape(-1)].reshape(rates.shape + (years,))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+# Global cache (shared by every valuation engine and calculator in the process)
+_wacc_cache = WACCCache()
+
+
+def get_wacc_cache() -> WACCCache:
+    """The process-wide WACC / discount-factor cache"""
+    return _wacc_cache
@@ -44,3 +44,24 @@ DEBATE_ROUNDS = 5
 
 # Output directory
 OUTPUT_DIR = "reports"
+
+# Rate limiter backend for AI providers
+# "memory" - per-process token buckets (default)
+# "sqlite" - token buckets shared through RATE_LIMIT_DB, so several processes on
+#            this machine (e.g. main.py + run_debates.py) split one TPM budget
+RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_DB = os.environ.get(
+    "RATE_LIMIT_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "context", "rate_limits.db")
+)
+
+# Batch mode (run_workflow_live.py --batch) for non-interactive runs
+# Independent nodes listed here are collected across tickers into provider
+# batch jobs (OpenAI / DashScope Batch API) instead of interactive calls.
+BATCH_NODES = ["Industry Deep Dive", "Company Deep Dive"]
+BATCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "context", "batches")
+BATCH_FILE_TIMEOUT = 3600  # seconds --batch file waits for outputs written into BATCH_DIR
+
+# Override the scheme/host of every AI provider endpoint (path is kept), e.g.
+# "http://127.0.0.1:8900" to run against utils/mock_llm_server.py for load tests
+LLM_BASE_URL = os.environ.get("LLM_BASE_URL", "")
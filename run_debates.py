@@ -15,6 +15,8 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from config import API_KEYS
 from agents.multi_ai_debate import MultiAIDebateOrchestrator
+from agents.debate_scheduler import DebateScheduler
+from agents.ai_providers import close_client_sessions
 
 # Visualizer integration (optional)
 try:
@@ -68,8 +70,15 @@ async def run_single_equity_debate(ticker: str, orchestrator: MultiAIDebateOrche
         return None
 
 
-async def run_all_debates(num_rounds: int = 10, use_visualizer: bool = True):
-    """Run debates for all 14 equities"""
+async def run_all_debates(num_rounds: int = 10, use_visualizer: bool = True, pipelined: bool = False,
+                          scheduled: bool = False):
+    """
+    Run debates for all 14 equities
+
+    With scheduled=True every debate runs concurrently and each
+    (ticker, round, role) call goes through one DebateScheduler, which packs
+    calls against per-provider capacity instead of debating one ticker at a time.
+    """
 
     # Setup paths
     base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -92,7 +101,9 @@ async def run_all_debates(num_rounds: int = 10, use_visualizer: bool = True):
         return
 
     # Initialize orchestrator
-    orchestrator = MultiAIDebateOrchestrator(API_KEYS, num_rounds)
+    orchestrator = MultiAIDebateOrchestrator(API_KEYS, num_rounds, pipelined=pipelined)
+    if scheduled:
+        orchestrator.scheduler = DebateScheduler(orchestrator.provider_manager)
     print(f"Initialized debate orchestrator with {len(orchestrator.provider_manager.get_all_providers())} AI providers")
 
     # Get all research files
@@ -106,16 +117,17 @@ async def run_all_debates(num_rounds: int = 10, use_visualizer: bool = True):
 
     results = []
 
-    for i, research_file in enumerate(research_files):
+    async def debate_file(i: int, research_file: str):
         print(f"\n[{i+1}/{len(research_files)}] Processing: {research_file}")
 
         filepath = os.path.join(context_dir, research_file)
+        ticker = research_file.replace('.json', '')
 
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 equity_data = json.load(f)
 
-            ticker = equity_data.get('ticker', research_file.replace('.json', ''))
+            ticker = equity_data.get('ticker', ticker)
             company = equity_data.get('company_name', '')
 
             # Notify visualizer of debate start
@@ -157,7 +169,14 @@ async def run_all_debates(num_rounds: int = 10, use_visualizer: bool = True):
             traceback.print_exc()
             if visualizer:
                 visualizer.complete_debate(ticker)  # Reset agents on error
-            continue
+
+    if scheduled:
+        # All debates at once - the scheduler packs their calls onto provider capacity
+        await asyncio.gather(*(debate_file(i, f) for i, f in enumerate(research_files)))
+        orchestrator.scheduler.print_utilisation()
+    else:
+        for i, research_file in enumerate(research_files):
+            await debate_file(i, research_file)
 
     # Save summary
     summary_file = os.path.join(output_dir, "debate_summary.json")
@@ -167,6 +186,7 @@ async def run_all_debates(num_rounds: int = 10, use_visualizer: bool = True):
             "num_debates": len(results),
             "num_rounds_per_debate": num_rounds,
             "ai_providers": list(available_apis.keys()),
+            "scheduler": orchestrator.scheduler.utilisation() if orchestrator.scheduler else None,
             "results": results
         }, f, indent=2, ensure_ascii=False)
 
@@ -180,6 +200,7 @@ async def run_all_debates(num_rounds: int = 10, use_visualizer: bool = True):
     for r in results:
         print(f"  {r['ticker']}: {r['recommendation']} (Conviction: {r['conviction']}) - Target: {r['probability_weighted_price']}")
 
+    await close_client_sessions()
     return results
 
 
@@ -189,6 +210,10 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run Multi-AI Debates on Equities")
     parser.add_argument("--ticker", type=str, help="Run debate for specific ticker only")
     parser.add_argument("--rounds", type=int, default=10, help="Number of debate rounds (default: 10)")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="Start each role's next round as soon as the messages it answers are ready")
+    parser.add_argument("--scheduled", action="store_true",
+                        help="Debate all equities concurrently through the global provider-aware scheduler")
 
     args = parser.parse_args()
 
@@ -197,4 +222,4 @@ if __name__ == "__main__":
     print("GPT vs Gemini vs Grok vs Qwen")
     print("="*60)
 
-    asyncio.run(run_all_debates(args.rounds))
+    asyncio.run(run_all_debates(args.rounds, pipelined=args.pipelined, scheduled=args.scheduled))
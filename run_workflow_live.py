@@ -7,6 +7,7 @@ Usage:
     python run_workflow_live.py "9660_HK"                    # Single ticker
     python run_workflow_live.py "9660_HK" "LEGN_US"          # Multiple tickers
     python run_workflow_live.py "9660_HK" "LEGN_US" -c 3     # With concurrency limit
+    python run_workflow_live.py "9660_HK" "LEGN_US" --batch  # Overnight: BATCH_NODES via Batch API
 """
 
 import asyncio
@@ -18,10 +19,11 @@ import webbrowser
 
 import websockets
 
-from config import API_KEYS, EQUITIES
+from config import API_KEYS, EQUITIES, BATCH_NODES, BATCH_DIR, BATCH_FILE_TIMEOUT
 from workflow.workflow_loader import WorkflowLoader
 from workflow.graph_executor import GraphExecutor
 from workflow.node_executor import Message
+from agents.ai_providers import close_client_sessions
 
 # Import visualizer bridge for minions.html
 try:
@@ -33,6 +35,9 @@ except ImportError:
 # Global visualizer instance
 visualizer = None
 
+# Global batch collector (set by --batch, shared across tickers)
+batch_collector = None
+
 # Global list to store connected websocket clients
 connected_clients = set()
 event_queue = asyncio.Queue()
@@ -325,6 +330,9 @@ Remember: This research is ONLY for {company_name} ({ticker}). Any data from oth
         "currency": currency,
         "market_data": market_data
     }
+    if batch_collector:
+        workflow_context["batch_collector"] = batch_collector
+        workflow_context["batch_nodes"] = BATCH_NODES
 
     # Create executor with context for Python valuation nodes
     executor = GraphExecutor(config, api_keys, output_dir="context", context=workflow_context)
@@ -460,9 +468,20 @@ async def run_multiple_tickers(tickers: list, workflow: str, max_concurrent: int
     return results
 
 
-async def run_workflows(tickers: list, port: int = 8765, workflow: str = "equity_research_v4", max_concurrent: int = 2):
+async def run_workflows(tickers: list, port: int = 8765, workflow: str = "equity_research_v4", max_concurrent: int = 2,
+                        batch: str = None):
     """Main entry point for single or multiple tickers"""
-    global visualizer
+    global visualizer, batch_collector
+
+    if batch:
+        from agents.batch_backend import create_batch_collector
+        # The file stub has no responder here, so its jobs need a deadline
+        job_timeout = BATCH_FILE_TIMEOUT if batch == "file" else None
+        batch_collector = create_batch_collector(API_KEYS, backend=batch, batch_dir=BATCH_DIR,
+                                                 job_timeout=job_timeout)
+        # Batch jobs only pay off when every ticker's nodes are queued together
+        max_concurrent = len(tickers)
+        print(f"[Batch] {batch} batch mode for: {', '.join(BATCH_NODES)}", flush=True)
 
     if VISUALIZER_AVAILABLE:
         visualizer = VisualizerBridge("context")
@@ -486,6 +505,7 @@ async def run_workflows(tickers: list, port: int = 8765, workflow: str = "equity
 
     ws_server.close()
     await ws_server.wait_closed()
+    await close_client_sessions()
 
 
 if __name__ == "__main__":
@@ -494,7 +514,10 @@ if __name__ == "__main__":
     parser.add_argument("--port", type=int, default=8765, help="WebSocket port (default: 8765)")
     parser.add_argument("--workflow", type=str, default="equity_research_v4", help="Workflow name")
     parser.add_argument("--max-concurrent", "-c", type=int, default=2, help="Max concurrent workflows")
+    parser.add_argument("--batch", nargs="?", const="openai", choices=["openai", "file"],
+                        help="Run BATCH_NODES through provider batch jobs ('file' = outputs dropped into "
+                             "BATCH_DIR within BATCH_FILE_TIMEOUT)")
 
     args = parser.parse_args()
 
-    asyncio.run(run_workflows(args.tickers, args.port, args.workflow, args.max_concurrent))
+    asyncio.run(run_workflows(args.tickers, args.port, args.workflow, args.max_concurrent, args.batch))
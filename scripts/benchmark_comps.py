@@ -0,0 +1,98 @@
+"""
+Comps Benchmark - Per-peer lists vs columnar peer statistics
+
+Times CompsEngine's pure Python path (one list and one statistics.median per
+multiple) against the PeerTable path for 10, 200 and 2,000 peers, and checks
+both give the same medians.
+
+Reported per size:
+- lists:       CompsEngine.calculate with NumPy disabled
+- columnar:    CompsEngine.calculate on a PeerTable (statistics computed)
+- cached:      the same call again for another ticker in the sector
+- sector:      tickers valued per second against one shared sector table
+
+Usage:
+    python scripts/benchmark_comps.py
+    python scripts/benchmark_comps.py --sizes 10 200 2000 --repeat 20
+"""
+
+import argparse
+import random
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmark_dcf import build_inputs
+from agents.valuation.assumption_extractor import PeerData
+from agents.valuation.engines import comps_engine
+from agents.valuation.engines.comps_engine import CompsEngine, PeerTable, clear_peer_stats_cache
+
+
+def build_peers(n_peers: int, seed: int = 7):
+    """Synthetic sector with multiples loosely tied to revenue growth"""
+    rng = random.Random(seed)
+    peers = []
+    for i in range(n_peers):
+        growth = rng.uniform(-0.05, 0.35)
+        peers.append(PeerData(
+            ticker=f"PEER{i}", name=f"Peer {i}", market_cap=rng.uniform(1e8, 1e11),
+            pe_ratio=rng.uniform(5, 60) if rng.random() > 0.1 else None,
+            ev_ebitda=max(0.5, 8 + 30 * growth + rng.gauss(0, 3)),
+            ev_revenue=max(0.1, 1 + 8 * growth + rng.gauss(0, 1)),
+            price_to_book=rng.uniform(0.3, 8),
+            revenue_growth=growth, ebit_margin=rng.uniform(0.02, 0.3)
+        ))
+    return peers
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark comps peer statistics")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 200, 2000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = CompsEngine()
+    inputs = build_inputs(5)
+
+    print(f"\n{'Peers':>8} {'lists':>12} {'columnar':>12} {'cached':>12} {'sector':>16} {'same medians':>14}")
+    print("-" * 80)
+
+    for size in args.sizes:
+        peers = build_peers(size)
+        table = PeerTable.from_peers(peers)
+        peer_inputs = replace(inputs, peers=peers)
+
+        comps_engine.HAS_NUMPY = False
+        legacy, legacy_time = timed(lambda: engine.calculate(peer_inputs), args.repeat)
+        comps_engine.HAS_NUMPY = True
+
+        def uncached():
+            clear_peer_stats_cache()
+            return engine.calculate(inputs, peer_table=table, sector="Bench")
+
+        columnar, columnar_time = timed(uncached, args.repeat)
+        _, cached_time = timed(lambda: engine.calculate(inputs, peer_table=table, sector="Bench"), args.repeat)
+
+        same = all(
+            getattr(legacy, name) == getattr(columnar, name)
+            for name in ('median_pe', 'median_ev_ebitda', 'median_ev_revenue', 'median_pb')
+        )
+
+        print(f"{size:>8,} {legacy_time * 1e3:>9.3f} ms {columnar_time * 1e3:>9.3f} ms "
+              f"{cached_time * 1e3:>9.3f} ms {1 / cached_time:>10,.0f} /sec {str(same):>14}")
+
+    print()
+
+
+if __name__ == "__main__":
+    main()
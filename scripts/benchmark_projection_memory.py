@@ -0,0 +1,85 @@
+"""
+Projection Memory Benchmark - Columnar vs per-year dataclass projections
+
+Measures the memory held by materialised DCF scenario results for 5, 500 and
+50,000 scenarios in two representations:
+
+- per-year objects:  List[YearlyProjection] (12 floats per year) plus a full
+                     20-key inputs_used dict per scenario (previous layout)
+- columnar:          ProjectionTable (row views into the batch arrays, other
+                     columns derived on read) plus ScenarioInputs sharing one
+                     company-level dict
+
+Both are measured with tracemalloc on top of the same calculate_batch()
+arrays, and the rendered output (to_dicts) is checked to be identical.
+
+Usage:
+    python scripts/benchmark_projection_memory.py
+    python scripts/benchmark_projection_memory.py --sizes 5 500 50000
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmark_dcf import build_inputs
+from agents.valuation.engines.dcf_engine import DCFEngine
+
+
+def measure(build):
+    """(result, bytes allocated and still held, seconds) for build()"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, held, elapsed
+
+
+def per_year_objects(scenarios):
+    """Previous layout, rebuilt from the columnar results"""
+    return [(s.yearly_projections.rows(), dict(s.inputs_used)) for s in scenarios]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark projection storage memory")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 500, 50_000])
+    args = parser.parse_args()
+
+    engine = DCFEngine()
+
+    print(f"\n{'Scenarios':>10} {'per-year objects':>18} {'columnar':>12} {'saving':>8} "
+          f"{'per scenario':>22} {'same output':>12}")
+    print("-" * 90)
+
+    for size in args.sizes:
+        batch = engine.calculate_batch(build_inputs(size))
+
+        scenarios, columnar_bytes, _ = measure(lambda: list(batch.result.scenarios.values()))
+        legacy, legacy_bytes, _ = measure(lambda: per_year_objects(scenarios))
+        legacy_bytes += columnar_bytes  # the scenario results themselves are still needed
+
+        same = all(
+            s.yearly_projections.to_dicts() == [vars(p) for p in rows] and dict(s.inputs_used) == used
+            for s, (rows, used) in zip(scenarios[:100], legacy[:100])
+        )
+
+        print(f"{size:>10,} {legacy_bytes / 1e6:>15.2f} MB {columnar_bytes / 1e6:>9.2f} MB "
+              f"{legacy_bytes / columnar_bytes:>7.1f}x "
+              f"{legacy_bytes / size / 1e3:>9.1f} KB -> {columnar_bytes / size / 1e3:>5.1f} KB "
+              f"{str(same):>12}")
+
+        del scenarios, legacy, batch
+
+    print()
+
+
+if __name__ == "__main__":
+    main()
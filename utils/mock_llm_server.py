@@ -0,0 +1,382 @@
+"""
+Mock LLM Server - Deterministic local stand-in for the AI provider APIs
+
+Speaks the wire formats used by agents/ai_providers.py so workflows, rate
+limiters and the visualizer can be load-tested end to end without paying
+for tokens:
+
+- OpenAI / xAI / DeepSeek:  POST /v1/chat/completions
+- DashScope (compatible):   POST /compatible-mode/v1/chat/completions
+- Gemini:                   POST /v1beta/models/{model}:generateContent
+                            POST /v1beta/models/{model}:streamGenerateContent?alt=sse
+
+Both streaming (SSE) and non-streaming responses are supported. Latency is
+drawn from a configurable distribution, streams arrive in fixed-size chunks
+at a fixed cadence, and a fraction of requests can be answered with 429 to
+exercise retries and circuit breakers.
+
+Canned responses carry the happy-path verdicts the equity_research_v4 edge
+conditions look for (DATA: VERIFIED, INPUTS: VALIDATED, PARAMETERS:
+CONNECTED, ROUTE: Synthesizer, ...). With loop_rate > 0 some responses carry
+the loop-back verdicts instead, so feedback cycles get exercised too.
+
+Usage:
+    python -m utils.mock_llm_server --port 8900 --latency lognormal --mean 2.0
+
+    # In another shell - every provider now talks to the mock
+    set LLM_BASE_URL=http://127.0.0.1:8900
+    set OPENAI_API_KEY=mock (and GOOGLE/XAI/DASHSCOPE keys likewise)
+    python run_workflow_live.py 9660_HK
+
+GET /stats returns request, 429 and token counts for the run.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Tuple
+
+from aiohttp import web
+
+
+# Verdicts that move equity_research_v4 forward
+HAPPY_PATH_VERDICTS = [
+    "DATA: VERIFIED",
+    "INPUTS: VALIDATED",
+    "PARAMETERS: CONNECTED",
+    "DOT CONNECTION COMPLETE",
+    "DCF: VALIDATED",
+    "FINAL: APPROVED",
+    "ROUTE: Synthesizer",
+    "RESEARCH: APPROVED",
+]
+
+# Verdicts that send work back round a feedback loop
+LOOP_BACK_VERDICTS = [
+    "DATA: FAILED",
+    "INPUTS: REVIEW NEEDED",
+    "DCF: NEEDS_PARAMETER_REVISION",
+    "ROUTE: Dot Connector",
+]
+
+# Parameter lines parsed by GraphExecutor._track_parameter_attempt
+CANNED_PARAMETERS = [
+    "REVENUE_GROWTH_Y1_3: 12.0%",
+    "REVENUE_GROWTH_Y4_5: 8.0%",
+    "REVENUE_GROWTH_Y6_10: 5.0%",
+    "TERMINAL_GROWTH: 2.5%",
+    "TARGET_EBIT_MARGIN: 18.0%",
+    "CALCULATED_WACC: 9.5%",
+]
+
+FILLER_SENTENCES = [
+    "Revenue growth is supported by expanding volumes and stable pricing.",
+    "Operating leverage should lift margins as fixed costs are absorbed.",
+    "Competitive intensity remains the key risk to the base case.",
+    "Balance sheet capacity allows continued investment through the cycle.",
+    "Management guidance implies a gradual improvement in free cash flow.",
+    "Valuation screens in line with peers on forward earnings multiples.",
+    "Working capital needs are modest relative to revenue growth.",
+    "Regulatory developments are monitored but not yet in the numbers.",
+]
+
+
+@dataclass
+class MockServerConfig:
+    """Behaviour of the mock server"""
+    latency: str = "fixed"            # fixed | uniform | normal | lognormal
+    latency_mean: float = 0.5         # seconds before the first byte
+    latency_jitter: float = 0.25      # spread (uniform half-width, normal/lognormal sigma)
+    chunk_chars: int = 40             # characters per streamed chunk
+    chunk_interval: float = 0.02      # seconds between streamed chunks
+    output_chars: int = 2000          # response length before max_tokens capping
+    rate_429: float = 0.0             # fraction of requests answered with 429
+    retry_after: float = 1.0          # seconds suggested in 429 bodies
+    loop_rate: float = 0.0            # fraction of responses with loop-back verdicts
+    cached_fraction: float = 0.0      # share of prompt tokens reported as cached
+    seed: int = 42
+
+
+@dataclass
+class MockServerStats:
+    requests: int = 0
+    streamed: int = 0
+    rate_limited: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    by_format: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "streamed": self.streamed,
+            "rate_limited": self.rate_limited,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "by_format": dict(self.by_format),
+        }
+
+
+class MockLLMServer:
+    """aiohttp application serving the mock provider endpoints"""
+
+    def __init__(self, config: MockServerConfig = None):
+        self.config = config or MockServerConfig()
+        self.stats = MockServerStats()
+        # One seeded sequence for latency/429 draws: deterministic for a given arrival order
+        self._rng = random.Random(self.config.seed)
+
+    def create_app(self) -> web.Application:
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/v1/chat/completions", self._handle_chat)
+        app.router.add_post("/compatible-mode/v1/chat/completions", self._handle_chat)
+        app.router.add_post("/v1beta/models/{model_action}", self._handle_gemini)
+        app.router.add_get("/stats", self._handle_stats)
+        return app
+
+    # ==========================================
+    # Behaviour
+    # ==========================================
+
+    def _sample_latency(self) -> float:
+        cfg = self.config
+        if cfg.latency == "uniform":
+            value = self._rng.uniform(cfg.latency_mean - cfg.latency_jitter, cfg.latency_mean + cfg.latency_jitter)
+        elif cfg.latency == "normal":
+            value = self._rng.gauss(cfg.latency_mean, cfg.latency_jitter)
+        elif cfg.latency == "lognormal":
+            # Parameterised so the median is latency_mean; heavy right tail like real APIs
+            value = cfg.latency_mean * math.exp(self._rng.gauss(0.0, cfg.latency_jitter))
+        else:
+            value = cfg.latency_mean
+        return max(0.0, value)
+
+    def _should_rate_limit(self) -> bool:
+        return self.config.rate_429 > 0 and self._rng.random() < self.config.rate_429
+
+    def _canned_text(self, prompt_text: str, max_tokens: int) -> str:
+        """Deterministic response for a prompt, capped at roughly max_tokens"""
+        digest = hashlib.sha256(prompt_text.encode("utf-8")).digest()
+        rng = random.Random(int.from_bytes(digest[:8], "big") ^ self.config.seed)
+
+        if self.config.loop_rate > 0 and rng.random() < self.config.loop_rate:
+            verdicts = [rng.choice(LOOP_BACK_VERDICTS)]
+        else:
+            verdicts = HAPPY_PATH_VERDICTS
+
+        header = "\n".join(["[MOCK RESPONSE]", *CANNED_PARAMETERS, *verdicts, ""])
+        body = []
+        length = len(header)
+        while length < self.config.output_chars:
+            sentence = rng.choice(FILLER_SENTENCES)
+            body.append(sentence)
+            length += len(sentence) + 1
+
+        text = header + " ".join(body)
+        return text[:max(len(header), max_tokens * 4)]
+
+    def _chunks(self, text: str) -> List[str]:
+        size = max(1, self.config.chunk_chars)
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    def _usage_counts(self, prompt_text: str, text: str) -> Tuple[int, int, int]:
+        prompt_tokens = max(1, len(prompt_text) // 4)
+        completion_tokens = max(1, len(text) // 4)
+        cached = int(prompt_tokens * self.config.cached_fraction)
+        self.stats.prompt_tokens += prompt_tokens
+        self.stats.completion_tokens += completion_tokens
+        return prompt_tokens, completion_tokens, cached
+
+    def _count(self, wire_format: str, stream: bool):
+        self.stats.requests += 1
+        self.stats.by_format[wire_format] = self.stats.by_format.get(wire_format, 0) + 1
+        if stream:
+            self.stats.streamed += 1
+
+    # ==========================================
+    # OpenAI-compatible (OpenAI, xAI, DeepSeek, DashScope)
+    # ==========================================
+
+    async def _handle_chat(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        stream = bool(body.get("stream"))
+        model = body.get("model", "mock")
+        wire_format = "dashscope" if request.path.startswith("/compatible-mode") else "openai"
+        self._count(wire_format, stream)
+
+        if self._should_rate_limit():
+            self.stats.rate_limited += 1
+            return web.json_response({
+                "error": {
+                    "message": f"Rate limit reached for {model} (mock). "
+                               f"Please try again in {self.config.retry_after}s.",
+                    "type": "tokens",
+                    "code": "rate_limit_exceeded"
+                }
+            }, status=429)
+
+        prompt_text = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+        text = self._canned_text(prompt_text, body.get("max_tokens") or 4096)
+        prompt_tokens, completion_tokens, cached = self._usage_counts(prompt_text, text)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached}
+        }
+        completion_id = f"chatcmpl-mock-{self.stats.requests}"
+
+        await asyncio.sleep(self._sample_latency())
+
+        if not stream:
+            return web.json_response({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                             "finish_reason": "stop"}],
+                "usage": usage
+            })
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for i, chunk in enumerate(self._chunks(text)):
+            if i:
+                await asyncio.sleep(self.config.chunk_interval)
+            event = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": chunk}, "finish_reason": None}]
+            }
+            await response.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+
+        if (body.get("stream_options") or {}).get("include_usage"):
+            event = {"id": completion_id, "object": "chat.completion.chunk", "model": model,
+                     "choices": [], "usage": usage}
+            await response.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    # ==========================================
+    # Gemini
+    # ==========================================
+
+    async def _handle_gemini(self, request: web.Request) -> web.StreamResponse:
+        model, _, action = request.match_info["model_action"].partition(":")
+        stream = action == "streamGenerateContent"
+        body = await request.json()
+        self._count("gemini", stream)
+
+        if self._should_rate_limit():
+            self.stats.rate_limited += 1
+            return web.json_response({
+                "error": {
+                    "code": 429,
+                    "message": f"Resource has been exhausted (mock). Please try again in {self.config.retry_after}s.",
+                    "status": "RESOURCE_EXHAUSTED"
+                }
+            }, status=429)
+
+        prompt_text = "\n".join(
+            part.get("text", "")
+            for content in body.get("contents", [])
+            for part in content.get("parts", [])
+        )
+        max_tokens = (body.get("generationConfig") or {}).get("maxOutputTokens") or 4096
+        text = self._canned_text(prompt_text, max_tokens)
+        prompt_tokens, completion_tokens, cached = self._usage_counts(prompt_text, text)
+        usage = {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": completion_tokens,
+            "totalTokenCount": prompt_tokens + completion_tokens,
+            "cachedContentTokenCount": cached
+        }
+
+        await asyncio.sleep(self._sample_latency())
+
+        if not stream:
+            return web.json_response({
+                "candidates": [{"content": {"role": "model", "parts": [{"text": text}]},
+                                "finishReason": "STOP"}],
+                "usageMetadata": usage,
+                "modelVersion": model
+            })
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        chunks = self._chunks(text)
+        for i, chunk in enumerate(chunks):
+            if i:
+                await asyncio.sleep(self.config.chunk_interval)
+            event = {"candidates": [{"content": {"role": "model", "parts": [{"text": chunk}]}}],
+                     "modelVersion": model}
+            if i == len(chunks) - 1:
+                event["candidates"][0]["finishReason"] = "STOP"
+                event["usageMetadata"] = usage
+            await response.write(f"data: {json.dumps(event)}\r\n\r\n".encode("utf-8"))
+        await response.write_eof()
+        return response
+
+    async def _handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats.to_dict())
+
+
+async def start_mock_server(config: MockServerConfig = None, host: str = "127.0.0.1",
+                            port: int = 8900) -> Tuple[MockLLMServer, web.AppRunner]:
+    """
+    Start the mock server inside the running event loop.
+
+    Returns (server, runner); call `await runner.cleanup()` to stop it.
+    """
+    server = MockLLMServer(config)
+    runner = web.AppRunner(server.create_app())
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return server, runner
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local deterministic stand-in for the LLM provider APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", choices=["fixed", "uniform", "normal", "lognormal"], default="fixed")
+    parser.add_argument("--mean", type=float, default=0.5, help="Mean/median latency to first byte (s)")
+    parser.add_argument("--jitter", type=float, default=0.25, help="Latency spread")
+    parser.add_argument("--chunk-chars", type=int, default=40, help="Characters per streamed chunk")
+    parser.add_argument("--chunk-interval", type=float, default=0.02, help="Seconds between chunks")
+    parser.add_argument("--output-chars", type=int, default=2000, help="Response length")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--loop-rate", type=float, default=0.0, help="Fraction of loop-back verdicts")
+    parser.add_argument("--cached-fraction", type=float, default=0.0, help="Share of prompt tokens reported cached")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    config = MockServerConfig(
+        latency=args.latency,
+        latency_mean=args.mean,
+        latency_jitter=args.jitter,
+        chunk_chars=args.chunk_chars,
+        chunk_interval=args.chunk_interval,
+        output_chars=args.output_chars,
+        rate_429=args.rate_429,
+        loop_rate=args.loop_rate,
+        cached_fraction=args.cached_fraction,
+        seed=args.seed
+    )
+
+    print(f"Mock LLM server on http://{args.host}:{args.port} "
+          f"(latency={config.latency} mean={config.latency_mean}s, 429 rate={config.rate_429:.0%})")
+    print(f"Point providers at it with LLM_BASE_URL=http://{args.host}:{args.port}")
+    web.run_app(MockLLMServer(config).create_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -169,6 +169,41 @@ class VisualizerBridge:
 
         self._save_state()
 
+    def node_stream_delta(self, node_id: str, delta: str, output_length: int, is_final: bool = False):
+        """
+        Append newly streamed text to a node's live preview.
+
+        Unlike node_stream, callers pass only the text received since the
+        last update, so the cost per update is bounded by the preview size
+        rather than growing with the full output.
+        """
+        if node_id not in self._state["agents"]:
+            return
+
+        agent = self._state["agents"][node_id]
+        if output_length <= len(delta):
+            # First update of this execution - drop any earlier output
+            previous = ""
+        else:
+            previous = agent.get("output") or ""
+            if (agent.get("output_length") or 0) > 2000:
+                previous = previous[3:]  # strip the "..." truncation marker
+
+        # Keep the last 2000 chars for live preview
+        preview = previous + delta
+        if output_length > 2000:
+            preview = "..." + preview[-1997:]
+
+        agent["output"] = preview
+        agent["output_length"] = output_length
+
+        if is_final:
+            agent["message"] = "Completing..."
+        else:
+            agent["message"] = f"Generating... ({output_length} chars)"
+
+        self._save_state()
+
     def node_complete(self, node_id: str, output_length: int = 0, output: str = None):
         """Mark node as complete"""
         if node_id in self._state["agents"]:
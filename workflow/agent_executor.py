@@ -21,16 +21,12 @@ from .node_executor import Message, NodeConfig
 
 # Import AI providers
 try:
-    from agents.ai_providers import (
-        OpenAIProvider, GeminiProvider, GrokProvider, QwenProvider
-    )
+    from agents.ai_providers import PROVIDER_ALIASES, create_provider
     AI_PROVIDERS_AVAILABLE = True
 except ImportError as e:
     AI_PROVIDERS_AVAILABLE = False
-    OpenAIProvider = None
-    GeminiProvider = None
-    GrokProvider = None
-    QwenProvider = None
+    PROVIDER_ALIASES = {}
+    create_provider = None
     print(f"[WARNING] AI providers not available: {e}")
 
 # Import agent classes
@@ -250,30 +246,26 @@ def get_ai_provider(provider_name: str, api_keys: Dict[str, str]):
     if not AI_PROVIDERS_AVAILABLE:
         return None
 
+    # Canonical provider -> (display name, API key name)
     provider_map = {
-        "openai": ("OpenAI", "OPENAI_API_KEY", OpenAIProvider),
-        "gpt": ("OpenAI", "OPENAI_API_KEY", OpenAIProvider),
-        "gemini": ("Gemini", "GOOGLE_API_KEY", GeminiProvider),
-        "google": ("Gemini", "GOOGLE_API_KEY", GeminiProvider),
-        "grok": ("Grok", "XAI_API_KEY", GrokProvider),
-        "xai": ("Grok", "XAI_API_KEY", GrokProvider),
-        "qwen": ("Qwen", "DASHSCOPE_API_KEY", QwenProvider),
-        "dashscope": ("Qwen", "DASHSCOPE_API_KEY", QwenProvider),
+        "openai": ("OpenAI", "OPENAI_API_KEY"),
+        "google": ("Gemini", "GOOGLE_API_KEY"),
+        "xai": ("Grok", "XAI_API_KEY"),
+        "dashscope": ("Qwen", "DASHSCOPE_API_KEY"),
+        "deepseek": ("DeepSeek", "DEEPSEEK_API_KEY"),
     }
 
-    provider_name = provider_name.lower()
-    if provider_name not in provider_map:
-        provider_name = "openai"  # Default
+    provider = PROVIDER_ALIASES.get(provider_name.lower(), "openai")  # Default
 
-    name, key_name, provider_class = provider_map[provider_name]
+    name, key_name = provider_map[provider]
     api_key = api_keys.get(key_name) or api_keys.get(key_name.lower())
 
     if not api_key:
         print(f"[WARNING] No API key for {name}, falling back to OpenAI")
         api_key = api_keys.get("OPENAI_API_KEY") or api_keys.get("openai")
-        provider_class = OpenAIProvider
+        provider = "openai"
 
-    return provider_class(api_key) if api_key else None
+    return create_provider(provider, api_key) if api_key else None
 
 
 class AgentExecutor:
@@ -70,6 +70,11 @@ class WorkflowResult:
         }
 
 
+# Largest single-input change (absolute) quoted from the DCF sensitivities;
+# beyond this the first-order estimate is not meaningful
+MAX_SENSITIVITY_STEP = 0.05
+
+
 class GraphExecutor:
     """Executes a workflow graph with support for parallel execution and feedback loops"""
 
@@ -94,6 +99,8 @@ class GraphExecutor:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.context = context or {}  # Context for valuation nodes (ticker, market_data, etc.)
+        # Saved results in output_dir are the history "max_tokens: auto" budgets learn from
+        self.context.setdefault("history_dir", str(self.output_dir))
 
         # Initialize node states
         self.node_states: Dict[str, NodeState] = {}
@@ -109,6 +116,7 @@ class GraphExecutor:
 
         # Loop prevention tracking
         self.parameter_history: List[Dict[str, Any]] = []  # Track DCF parameters tried
+        self.last_valuation: Optional[Dict[str, Any]] = None  # Financial Modeler result (DCF sensitivities)
         self.node_loop_counts: Dict[str, int] = {}  # Track per-node execution counts for loop detection
 
     def _build_execution_layers(self) -> List[List[str]]:
@@ -166,10 +174,12 @@ class GraphExecutor:
             self.log("workflow_start", details={"task": task_prompt[:100]})
 
             # Initialize start nodes with task prompt
+            # Flagged as shared context so providers send it as a stable, cacheable prefix
             initial_message = Message(
                 role="user",
                 content=task_prompt,
-                source="TASK"
+                source="TASK",
+                metadata={"shared_context": True}
             )
 
             for start_node in self.config.start_nodes:
@@ -318,6 +328,8 @@ class GraphExecutor:
             if isinstance(executor, PythonValuationExecutor):
                 prior_outputs = self._get_prior_outputs()
                 result = await executor.execute(state.inputs, prior_outputs)
+                if result.metadata.get("valuation_result"):
+                    self.last_valuation = result.metadata["valuation_result"]
             else:
                 result = await executor.execute(state.inputs)
 
@@ -352,7 +364,13 @@ class GraphExecutor:
                 "output_length": len(result.content),
                 "execution_count": state.execution_count,
                 "output_preview": output_preview,
-                "provider": result.metadata.get("provider", "unknown")
+                "provider": result.metadata.get("provider", "unknown"),
+                "is_error": result.metadata.get("is_error", False),
+                "max_tokens": result.metadata.get("max_tokens"),
+                "tokens_in": result.metadata.get("tokens_in", 0),
+                "cached_tokens": result.metadata.get("cached_tokens", 0),
+                "time_to_first_token": result.metadata.get("time_to_first_token"),
+                "valuation_cache": result.metadata.get("valuation_cache")
             })
 
             # Process outgoing edges
@@ -480,12 +498,71 @@ class GraphExecutor:
             lines.append(f"Attempt #{attempt.get('attempt', '?')}: Growth={attempt.get('growth_y1_3', '?')}%, WACC={attempt.get('wacc', '?')}%")
 
         lines.append("")
-        lines.append("You MUST try DIFFERENT values. If previous attempts failed,")
-        lines.append("try values BETWEEN what you tried before (binary search).")
+        sensitivity_lines = self._get_sensitivity_prompt_lines()
+        if sensitivity_lines:
+            lines.extend(sensitivity_lines)
+        else:
+            lines.append("You MUST try DIFFERENT values. If previous attempts failed,")
+            lines.append("try values BETWEEN what you tried before (binary search).")
         lines.append("============================================\n")
 
         return "\n".join(lines)
 
+    def _get_sensitivity_prompt_lines(self) -> List[str]:
+        """
+        DCF sensitivities of the last valuation as direct parameter changes:
+        for each input, the shift (applied to every scenario) that alone moves
+        the PWV to the broker consensus / current price (first order), so one
+        revision can land on a target instead of bisecting over several attempts.
+        Values are quoted from the base scenario, or as probability-weighted
+        averages when there is none.
+        """
+        valuation = self.last_valuation or {}
+        greeks = (valuation.get("dcf") or {}).get("sensitivities") or {}
+        sensitivities = greeks.get("pwv")
+        if not sensitivities:
+            return []
+        base = (greeks.get("scenarios") or {}).get("base")
+        quoted, basis = (base["inputs"], "base") if base else (sensitivities["inputs"], "prob-weighted avg")
+
+        currency = valuation.get("currency", "")
+        fair_value = sensitivities["fair_value_per_share"]
+        targets = []
+        if valuation.get("broker_target_avg"):
+            targets.append(("broker consensus", valuation["broker_target_avg"]))
+        if valuation.get("current_price"):
+            targets.append(("current price", valuation["current_price"]))
+
+        lines = [
+            f"DCF SENSITIVITIES (last valuation: PWV {currency} {fair_value:.2f}):"
+        ]
+        for name, label in (
+            ("revenue_growth_y1_3", "REVENUE_GROWTH_Y1_3"),
+            ("revenue_growth_y4_5", "REVENUE_GROWTH_Y4_5"),
+            ("revenue_growth_y6_10", "REVENUE_GROWTH_Y6_10"),
+            ("target_ebit_margin", "TARGET_EBIT_MARGIN"),
+            ("terminal_growth", "TERMINAL_GROWTH"),
+            ("wacc", "WACC"),
+        ):
+            value = quoted[name]
+            partial = sensitivities["partials"][name]
+            line = f"  {label} ({basis}) = {value*100:.2f}%: +1pp -> {partial * 0.01:+.2f} per share"
+            for target_name, target in targets:
+                change = (target - fair_value) / partial if partial else float("inf")
+                if abs(change) <= MAX_SENSITIVITY_STEP:
+                    line += (f"; {target_name} {target:.2f} needs {change*100:+.2f}pp"
+                             f" ({basis} {(value + change)*100:.2f}%)")
+                else:
+                    line += f"; {target_name} out of reach via this input alone"
+            lines.append(line)
+
+        lines.append("")
+        lines.append("Each shift above moves the PWV to that target with ONLY that input changed,")
+        lines.append("by the same pp in every scenario (first order). Change the input your research")
+        lines.append("supports to the value it justifies - compute the effect from these")
+        lines.append("sensitivities instead of guessing or bisecting between attempts.")
+        return lines
+
     def _check_loop_limit(self, node_id: str) -> bool:
         """Check if a node has exceeded its loop limit. Returns True if should force exit."""
         # Track this execution
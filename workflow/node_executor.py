@@ -7,78 +7,54 @@ which uses real mathematical calculations instead of AI hallucination.
 """
 
 import asyncio
+import copy
+import hashlib
 import json
 import re
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
 from .workflow_loader import NodeConfig
+from .output_budget import resolve_max_tokens
+from agents.ai_providers import PROVIDER_ALIASES, create_provider
+
+# Visualizer stream updates are sent every this many characters
+STREAM_UPDATE_INTERVAL = 100
+
+# Valuation outputs / extracted inputs kept for Quality Supervisor loop re-runs
+MAX_CACHED_VALUATIONS = 32
+
+# DCF inputs shown with their fair value sensitivity (output key, label)
+SENSITIVITY_LABELS = (
+    ('revenue_growth_y1_3', 'Revenue growth Y1-3'),
+    ('revenue_growth_y4_5', 'Revenue growth Y4-5'),
+    ('revenue_growth_y6_10', 'Revenue growth Y6-10'),
+    ('target_ebit_margin', 'Target EBIT margin'),
+    ('terminal_growth', 'Terminal growth'),
+    ('wacc', 'WACC'),
+    ('capex_pct', 'CapEx % of revenue'),
+)
+
+# Raw market data fields that reach the valuation output without going through ValuationInputs
+BROKER_FIELDS = ('broker_target_avg', 'broker_target_low', 'broker_target_high', 'broker_count')
 
 # Import valuation module for Python-based calculations
 try:
-    from agents.valuation import ValuationOrchestrator, run_valuation_node
+    from agents.valuation import (
+        ValuationOrchestrator,
+        run_valuation_node,
+        fingerprint_valuation_inputs,
+        get_last_valuation_state,
+        restore_valuation_state
+    )
     VALUATION_AVAILABLE = True
 except ImportError:
     VALUATION_AVAILABLE = False
     print("[WARNING] Valuation module not available. Financial Modeler will use AI fallback.")
 
 
-# Retry configuration
-MAX_RETRIES = 3
-BASE_DELAY = 2.0  # seconds
-MAX_DELAY = 60.0  # seconds
-
-
-async def retry_with_backoff(func, max_retries=MAX_RETRIES, base_delay=BASE_DELAY):
-    """
-    Retry an async function with exponential backoff for rate limits.
-    Parses retry-after from error messages when available.
-    """
-    last_exception = None
-
-    for attempt in range(max_retries + 1):
-        try:
-            return await func()
-        except Exception as e:
-            error_str = str(e)
-            last_exception = e
-
-            # Check if this is a rate limit error (429)
-            is_rate_limit = (
-                "429" in error_str or
-                "rate_limit" in error_str.lower() or
-                "rate limit" in error_str.lower() or
-                "too many requests" in error_str.lower()
-            )
-
-            if not is_rate_limit:
-                # Not a rate limit error, don't retry
-                raise e
-
-            if attempt >= max_retries:
-                # Max retries exceeded
-                raise e
-
-            # Try to parse retry-after time from error message
-            delay = base_delay * (2 ** attempt)  # Exponential backoff
-
-            # Look for "Please try again in X.Xs" pattern
-            retry_match = re.search(r'try again in ([\d.]+)s', error_str, re.IGNORECASE)
-            if retry_match:
-                suggested_delay = float(retry_match.group(1))
-                delay = max(delay, suggested_delay + 0.5)  # Add small buffer
-
-            delay = min(delay, MAX_DELAY)
-
-            print(f"    [RATE LIMIT] Attempt {attempt + 1}/{max_retries + 1} failed. "
-                  f"Retrying in {delay:.1f}s...", flush=True)
-
-            await asyncio.sleep(delay)
-
-    raise last_exception
-
-
 @dataclass
 class Message:
     """Message passed between nodes"""
@@ -117,59 +93,75 @@ class Message:
 class NodeExecutor:
     """Executes a single node in the workflow graph"""
 
-    # Provider-specific client mappings
+    # Canonical provider -> (display name, API key name)
     PROVIDERS = {
-        "openai": "_execute_openai",
-        "google": "_execute_google",
-        "gemini": "_execute_google",
-        "xai": "_execute_xai",
-        "grok": "_execute_xai",
-        "dashscope": "_execute_dashscope",
-        "qwen": "_execute_dashscope",
-        "deepseek": "_execute_deepseek",
+        "openai": ("OpenAI", "OPENAI_API_KEY"),
+        "google": ("Google", "GOOGLE_API_KEY"),
+        "xai": ("xAI", "XAI_API_KEY"),
+        "dashscope": ("DashScope", "DASHSCOPE_API_KEY"),
+        "deepseek": ("DeepSeek", "DEEPSEEK_API_KEY"),
     }
 
-    def __init__(self, node_config: NodeConfig, api_keys: Dict[str, str]):
+    def __init__(self, node_config: NodeConfig, api_keys: Dict[str, str], batch_collector=None,
+                 max_tokens: Optional[int] = None):
         self.config = node_config
         self.api_keys = api_keys
+        self.batch_collector = batch_collector  # agents.batch_backend.BatchCollector for offline runs
+        self.max_tokens = max_tokens  # None = provider default
         self.execution_history: List[Message] = []
 
     async def execute(self, input_messages: List[Message]) -> Message:
         """Execute the node with given input messages"""
-        provider = self.config.provider.lower()
-
-        # Get the appropriate execution method
-        method_name = self.PROVIDERS.get(provider)
-        if not method_name:
-            raise ValueError(f"Unsupported provider: {provider}")
-
-        method = getattr(self, method_name)
+        provider = PROVIDER_ALIASES.get(self.config.provider.lower())
+        if provider not in self.PROVIDERS:
+            raise ValueError(f"Unsupported provider: {self.config.provider}")
 
         # Build the prompt from input messages
-        context = self._build_context(input_messages)
+        shared_prefix, context = self._build_context(input_messages)
 
         # Execute and return result
-        result = await method(context)
+        if self.batch_collector and self.batch_collector.supports(provider):
+            result = await self._execute_batched(provider, context, shared_prefix)
+        else:
+            result = await self._execute_provider(provider, context, shared_prefix)
 
         # Record execution
         self.execution_history.append(result)
 
         return result
 
-    def _build_context(self, messages: List[Message]) -> str:
-        """Build context string from input messages"""
-        parts = []
+    def _build_context(self, messages: List[Message]) -> Tuple[str, str]:
+        """
+        Build (shared_prefix, context) strings from input messages.
 
-        # Add the system role/instructions
-        if self.config.role:
-            parts.append(f"[INSTRUCTIONS]\n{self.config.role}\n")
+        Messages flagged as shared context (the workflow task prompt) go into
+        the shared prefix, which the provider sends ahead of the node role so
+        every node starts with the same cacheable bytes. Each distinct message
+        is sent once, however many edges delivered it. The node role is not
+        repeated here since it is already sent as the system prompt.
+        """
+        shared_parts = []
+        parts = []
+        seen = set()
 
-        # Add input messages
         for msg in messages:
             source = msg.source or msg.role
-            parts.append(f"[{source.upper()}]\n{msg.content}\n")
+            key = (source, msg.content)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            block = f"[{source.upper()}]\n{msg.content}\n"
+            if msg.metadata.get("shared_context"):
+                shared_parts.append(block)
+            else:
+                parts.append(block)
 
-        return "\n".join(parts)
+        if not parts:
+            # Nothing node-specific to append; send the task as the user turn
+            return "", "\n".join(shared_parts)
+
+        return "\n".join(shared_parts), "\n".join(parts)
 
     def _get_api_key(self, key_name: str) -> str:
         """Get API key from available sources"""
@@ -192,303 +184,124 @@ class NodeExecutor:
 
         return ""
 
-    async def _execute_openai(self, context: str) -> Message:
-        """Execute using OpenAI API with streaming for real-time output"""
-        import openai
-
-        api_key = self._get_api_key("openai") or self._get_api_key("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OpenAI API key not found")
-
-        client = openai.AsyncOpenAI(api_key=api_key)
-
-        try:
-            # Use streaming to show real-time output
-            stream = await client.chat.completions.create(
-                model=self.config.model,
-                messages=[
-                    {"role": "system", "content": self.config.role},
-                    {"role": "user", "content": context}
-                ],
-                temperature=0.7,
-                max_tokens=4096,
-                stream=True
-            )
-
-            # Collect streamed content and send updates to visualizer
-            content_parts = []
-            last_update_len = 0
-            update_interval = 100  # Update visualizer every 100 chars
-
-            async for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    content_parts.append(chunk.choices[0].delta.content)
-
-                    # Send periodic updates to visualizer
-                    current_len = sum(len(p) for p in content_parts)
-                    if current_len - last_update_len >= update_interval:
-                        partial_content = "".join(content_parts)
-                        self._send_stream_update(partial_content)
-                        last_update_len = current_len
-
-            content = "".join(content_parts)
-
-            # Send final update
-            self._send_stream_update(content, is_final=True)
-
-            return Message(
-                role="assistant",
-                content=content,
-                source=self.config.id,
-                metadata={
-                    "provider": "openai",
-                    "model": self.config.model,
-                    "streamed": True
-                }
-            )
-        except Exception as e:
-            return Message(
-                role="assistant",
-                content=f"Error executing OpenAI node: {str(e)}",
-                source=self.config.id,
-                metadata={"error": str(e), "is_error": True}
-            )
-
-    def _send_stream_update(self, content: str, is_final: bool = False):
-        """Send streaming update to visualizer"""
-        try:
-            from visualizer.visualizer_bridge import VisualizerBridge
-            visualizer = VisualizerBridge.get_instance()
-            if visualizer:
-                # Update the agent's output in real-time
-                visualizer.node_stream(self.config.id, content, is_final)
-        except Exception:
-            pass  # Silently ignore if visualizer not available
+    async def _execute_provider(self, provider: str, context: str, shared_prefix: str = "") -> Message:
+        """
+        Execute through the shared provider layer (agents.ai_providers).
 
-    async def _execute_google(self, context: str) -> Message:
-        """Execute using Google Gemini API with streaming"""
-        import google.generativeai as genai
+        Streams the response so the visualizer shows real-time output, and
+        goes through the same rate limiters, retries and pooled sessions as
+        the agent hierarchy.
+        """
+        display_name, key_name = self.PROVIDERS[provider]
 
-        api_key = self._get_api_key("google") or self._get_api_key("GOOGLE_API_KEY")
+        api_key = self._get_api_key(provider) or self._get_api_key(key_name)
         if not api_key:
-            raise ValueError("Google API key not found")
-
-        genai.configure(api_key=api_key)
+            raise ValueError(f"{display_name} API key not found")
 
         try:
-            model = genai.GenerativeModel(self.config.model)
-
-            # Build prompt with system instructions
-            full_prompt = f"{self.config.role}\n\n{context}"
-
-            # Use streaming for real-time output
-            def stream_generate():
-                content_parts = []
-                last_update_len = 0
-                update_interval = 100
-
-                for chunk in model.generate_content(full_prompt, stream=True):
-                    if chunk.text:
-                        content_parts.append(chunk.text)
-                        current_len = sum(len(p) for p in content_parts)
-                        if current_len - last_update_len >= update_interval:
-                            partial_content = "".join(content_parts)
-                            self._send_stream_update(partial_content)
-                            last_update_len = current_len
-
-                return "".join(content_parts)
-
-            content = await asyncio.to_thread(stream_generate)
-
-            # Send final update
-            self._send_stream_update(content, is_final=True)
-
-            return Message(
-                role="assistant",
-                content=content,
-                source=self.config.id,
-                metadata={
-                    "provider": "google",
-                    "model": self.config.model,
-                    "streamed": True
-                }
+            ai_provider = create_provider(provider, api_key, self.config.model)
+            result = await ai_provider.generate_with_usage(
+                context,
+                system_prompt=self.config.role,
+                agent_id=self.config.id,
+                agent_role="workflow_node",
+                stream=True,
+                on_delta=self._send_stream_delta,
+                delta_interval=STREAM_UPDATE_INTERVAL,
+                max_tokens=self.max_tokens,
+                shared_prefix=shared_prefix or None
             )
-        except Exception as e:
-            return Message(
-                role="assistant",
-                content=f"Error executing Google node: {str(e)}",
-                source=self.config.id,
-                metadata={"error": str(e)}
-            )
-
-    async def _execute_xai(self, context: str) -> Message:
-        """Execute using xAI (Grok) API with retry logic"""
-        import httpx
-
-        api_key = self._get_api_key("xai") or self._get_api_key("XAI_API_KEY")
-        if not api_key:
-            raise ValueError("xAI API key not found")
-
-        async def make_request():
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.x.ai/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": self.config.model or "grok-2",
-                        "messages": [
-                            {"role": "system", "content": self.config.role},
-                            {"role": "user", "content": context}
-                        ],
-                        "temperature": 0.7
-                    },
-                    timeout=120.0
-                )
-
-                if response.status_code == 429:
-                    raise Exception(f"xAI API rate limit: 429 - {response.text}")
-                if response.status_code != 200:
-                    raise Exception(f"xAI API error: {response.status_code} - {response.text}")
-
-                data = response.json()
-                return data
-
-        try:
-            data = await retry_with_backoff(make_request)
-            content = data["choices"][0]["message"]["content"]
-
-            # Send output to visualizer
-            self._send_stream_update(content, is_final=True)
+            content = result.text
 
             return Message(
                 role="assistant",
                 content=content,
                 source=self.config.id,
                 metadata={
-                    "provider": "xai",
-                    "model": self.config.model
+                    "provider": provider,
+                    "model": result.model,
+                    "streamed": result.streamed,
+                    "max_tokens": self.max_tokens or ai_provider.max_output_tokens,
+                    "tokens_in": result.tokens_in,
+                    "tokens_out": result.tokens_out,
+                    "cached_tokens": result.cached_tokens,
+                    "latency": round(result.latency, 2),
+                    "time_to_first_token": round(result.time_to_first_token, 2)
                 }
             )
         except Exception as e:
             return Message(
                 role="assistant",
-                content=f"Error executing xAI node: {str(e)}",
+                content=f"Error executing {display_name} node: {str(e)}",
                 source=self.config.id,
                 metadata={"error": str(e), "is_error": True}
             )
 
-    async def _execute_dashscope(self, context: str) -> Message:
-        """Execute using Alibaba DashScope (Qwen) API with retry logic"""
-        import httpx
+    async def _execute_batched(self, provider: str, context: str, shared_prefix: str = "") -> Message:
+        """Execute through a provider batch job (non-interactive runs)"""
+        from agents.batch_backend import BatchRequest
 
-        api_key = self._get_api_key("dashscope") or self._get_api_key("DASHSCOPE_API_KEY")
-        if not api_key:
-            raise ValueError("DashScope API key not found")
-
-        async def make_request():
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://dashscope-intl.aliyuncs.com/compatible-mode/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": self.config.model or "qwen-plus",
-                        "messages": [
-                            {"role": "system", "content": self.config.role},
-                            {"role": "user", "content": context}
-                        ]
-                    },
-                    timeout=120.0
-                )
+        display_name, _ = self.PROVIDERS[provider]
 
-                if response.status_code == 429:
-                    raise Exception(f"DashScope API rate limit: 429 - {response.text}")
-                if response.status_code != 200:
-                    raise Exception(f"DashScope API error: {response.status_code} - {response.text}")
-
-                data = response.json()
-                return data
+        request = BatchRequest(
+            provider=provider,
+            model=self.config.model,
+            prompt=context,
+            system_prompt=self.config.role,
+            shared_prefix=shared_prefix or None,
+            agent_id=self.config.id
+        )
+        if self.max_tokens:
+            request.max_tokens = self.max_tokens
 
         try:
-            data = await retry_with_backoff(make_request)
-            content = data["choices"][0]["message"]["content"]
+            result = await self.batch_collector.submit(request)
 
-            # Send output to visualizer
-            self._send_stream_update(content, is_final=True)
+            self._send_stream_update(result.text, is_final=True)
 
             return Message(
                 role="assistant",
-                content=content,
+                content=result.text,
                 source=self.config.id,
                 metadata={
-                    "provider": "dashscope",
-                    "model": self.config.model
+                    "provider": provider,
+                    "model": result.model,
+                    "batched": True,
+                    "max_tokens": request.max_tokens,
+                    "tokens_in": result.tokens_in,
+                    "tokens_out": result.tokens_out,
+                    "cached_tokens": result.cached_tokens,
+                    "latency": round(result.latency, 2)
                 }
             )
         except Exception as e:
             return Message(
                 role="assistant",
-                content=f"Error executing DashScope node: {str(e)}",
+                content=f"Error executing {display_name} node: {str(e)}",
                 source=self.config.id,
                 metadata={"error": str(e), "is_error": True}
             )
 
-    async def _execute_deepseek(self, context: str) -> Message:
-        """Execute using DeepSeek API"""
-        import httpx
-
-        api_key = self._get_api_key("deepseek") or self._get_api_key("DEEPSEEK_API_KEY")
-        if not api_key:
-            raise ValueError("DeepSeek API key not found")
-
+    def _send_stream_delta(self, delta: str, total_length: int, is_final: bool = False):
+        """Send newly streamed text to the visualizer (deltas, not full snapshots)"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.deepseek.com/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": self.config.model or "deepseek-chat",
-                        "messages": [
-                            {"role": "system", "content": self.config.role},
-                            {"role": "user", "content": context}
-                        ]
-                    },
-                    timeout=120.0
-                )
-
-                if response.status_code != 200:
-                    raise Exception(f"DeepSeek API error: {response.status_code}")
-
-                data = response.json()
-                content = data["choices"][0]["message"]["content"]
-
-                # Send output to visualizer
-                self._send_stream_update(content, is_final=True)
+            from visualizer.visualizer_bridge import VisualizerBridge
+            visualizer = VisualizerBridge.get_instance()
+            if visualizer:
+                visualizer.node_stream_delta(self.config.id, delta, total_length, is_final)
+        except Exception:
+            pass  # Silently ignore if visualizer not available
 
-                return Message(
-                    role="assistant",
-                    content=content,
-                    source=self.config.id,
-                    metadata={
-                        "provider": "deepseek",
-                        "model": self.config.model
-                    }
-                )
-        except Exception as e:
-            return Message(
-                role="assistant",
-                content=f"Error executing DeepSeek node: {str(e)}",
-                source=self.config.id,
-                metadata={"error": str(e)}
-            )
+    def _send_stream_update(self, content: str, is_final: bool = False):
+        """Send streaming update to visualizer"""
+        try:
+            from visualizer.visualizer_bridge import VisualizerBridge
+            visualizer = VisualizerBridge.get_instance()
+            if visualizer:
+                # Update the agent's output in real-time
+                visualizer.node_stream(self.config.id, content, is_final)
+        except Exception:
+            pass  # Silently ignore if visualizer not available
 
 
 class PassthroughExecutor:
@@ -516,6 +329,99 @@ class PassthroughExecutor:
         )
 
 
+class ValuationResultCache:
+    """
+    Bounded LRU caches for the Financial Modeler node.
+
+    - inputs:  hash of the upstream texts and market data -> extracted
+               ValuationInputs (skips the AI extraction)
+    - outputs: ValuationInputs fingerprint (+ broker fields) -> valuation
+               output and engine state (skips every engine)
+
+    A Quality Supervisor loop that re-triggers the node with unchanged Dot
+    Connector parameters therefore returns the previous result immediately.
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHED_VALUATIONS):
+        self.max_entries = max(1, max_entries)
+        self._inputs: "OrderedDict[str, Any]" = OrderedDict()
+        self._outputs: "OrderedDict[str, Tuple[Dict[str, Any], Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.extraction_hits = 0
+        self.extraction_misses = 0
+
+    @staticmethod
+    def source_key(**sources: Any) -> str:
+        payload = json.dumps(sources, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def output_key(fingerprint: str, market_data_raw: Dict[str, Any]) -> str:
+        broker = {k: market_data_raw.get(k) for k in BROKER_FIELDS} if market_data_raw else {}
+        return f"{fingerprint}:{ValuationResultCache.source_key(**broker)}"
+
+    def _lookup(self, entries: OrderedDict, key: str):
+        value = entries.get(key)
+        if value is not None:
+            entries.move_to_end(key)
+        return value
+
+    def _store(self, entries: OrderedDict, key: str, value: Any):
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def get_inputs(self, key: str):
+        inputs = self._lookup(self._inputs, key)
+        if inputs is None:
+            self.extraction_misses += 1
+        else:
+            self.extraction_hits += 1
+        return inputs
+
+    def put_inputs(self, key: str, inputs: Any):
+        self._store(self._inputs, key, inputs)
+
+    def get_output(self, key: str) -> Optional[Tuple[Dict[str, Any], Any]]:
+        """(output copy, engine state) or None"""
+        entry = self._lookup(self._outputs, key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        output, state = entry
+        return copy.deepcopy(output), state
+
+    def put_output(self, key: str, output: Dict[str, Any], state: Any):
+        self._store(self._outputs, key, (copy.deepcopy(output), state))
+
+    def clear(self):
+        self._inputs.clear()
+        self._outputs.clear()
+        self.hits = self.misses = self.extraction_hits = self.extraction_misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'extraction_hits': self.extraction_hits,
+            'extraction_misses': self.extraction_misses,
+            'entries': len(self._outputs),
+            'max_entries': self.max_entries
+        }
+
+
+# Global cache (executors are created per node run)
+_valuation_cache = ValuationResultCache()
+
+
+def get_valuation_cache() -> ValuationResultCache:
+    """The process-wide Financial Modeler result cache"""
+    return _valuation_cache
+
+
 class PythonValuationExecutor:
     """
     Executor for valuation nodes using Python math instead of AI.
@@ -626,18 +532,56 @@ class PythonValuationExecutor:
                 if msg.metadata and "market_data" in msg.metadata:
                     market_data.update(msg.metadata["market_data"])
 
-            # Run valuation with multi-AI extraction (if enabled)
+            # Extract inputs with multi-AI extraction (if enabled) - skipped when
+            # the upstream outputs are unchanged since an earlier attempt
             # Pass dot_connector_output for parameter priority
-            result = await asyncio.to_thread(
-                self.orchestrator.run_valuation,
+            cache = get_valuation_cache()
+            source_key = cache.source_key(
                 ticker=ticker,
+                company_name=company_name,
+                use_multi_ai=self.use_multi_ai,
                 debate_outputs=debate_outputs,
-                market_data_raw=market_data,
                 industry_researcher_output=industry_researcher_output,
                 business_model_output=business_model_output,
-                company_name=company_name,
-                dot_connector_output=dot_connector_output
+                dot_connector_output=dot_connector_output,
+                market_data=market_data
             )
+            valuation_inputs = cache.get_inputs(source_key)
+            extraction_hit = valuation_inputs is not None
+            if not extraction_hit:
+                valuation_inputs = await asyncio.to_thread(
+                    self.orchestrator.extract_inputs,
+                    ticker=ticker,
+                    debate_outputs=debate_outputs,
+                    market_data_raw=market_data,
+                    industry_researcher_output=industry_researcher_output,
+                    business_model_output=business_model_output,
+                    company_name=company_name,
+                    dot_connector_output=dot_connector_output
+                )
+                cache.put_inputs(source_key, valuation_inputs)
+
+            # Run the engines - skipped when the extracted parameters match an earlier attempt
+            fingerprint = fingerprint_valuation_inputs(valuation_inputs)
+            output_key = cache.output_key(fingerprint, market_data)
+            cached = cache.get_output(output_key)
+            if cached is not None:
+                result, state = cached
+                # The fingerprint ignores free text - carry this attempt's rationale through
+                scenarios_used = result.get('assumptions_used', {}).get('scenarios', {})
+                for name, scenario in valuation_inputs.scenarios.items():
+                    if name in scenarios_used:
+                        scenarios_used[name]['rationale'] = scenario.rationale
+                restore_valuation_state(valuation_inputs.ticker, {**state, 'inputs': valuation_inputs})
+                print(f"  [Python Valuation Engine] Parameters unchanged (inputs {fingerprint}) - "
+                      f"reusing cached valuation")
+            else:
+                result = await asyncio.to_thread(
+                    self.orchestrator.value_inputs,
+                    valuation_inputs,
+                    market_data_raw=market_data
+                )
+                cache.put_output(output_key, result, get_last_valuation_state(valuation_inputs.ticker))
 
             # Build formatted output
             output_text = self._format_valuation_output(result)
@@ -651,7 +595,13 @@ class PythonValuationExecutor:
                     "engine": "multi_method_dcf",
                     "valuation_result": result,
                     "methods_used": list(result.get("cross_check", {}).get("method_values", {}).keys()),
-                    "convergence": result.get("cross_check", {}).get("convergence_level", "UNKNOWN")
+                    "convergence": result.get("cross_check", {}).get("convergence_level", "UNKNOWN"),
+                    "valuation_cache": {
+                        "hit": cached is not None,
+                        "extraction_hit": extraction_hit,
+                        "inputs_fingerprint": fingerprint,
+                        **cache.stats()
+                    }
                 }
             )
 
@@ -847,6 +797,21 @@ class PythonValuationExecutor:
             for name, scenario in scenarios.items():
                 lines.append(f"    - {name}: {result.get('currency', '')} {scenario.get('fair_value', 0):.2f} "
                            f"({scenario.get('probability', 0)*100:.0f}% prob)")
+            monte_carlo = dcf.get("monte_carlo")
+            if monte_carlo:
+                pct = monte_carlo.get("percentiles", {})
+                lines.append(f"    Monte Carlo ({monte_carlo.get('paths', 0):,} paths): "
+                             f"mean {result.get('currency', '')} {monte_carlo.get('mean_fair_value', 0):.2f}, "
+                             f"P5 {pct.get('p5', 0):.2f} / P50 {pct.get('p50', 0):.2f} / P95 {pct.get('p95', 0):.2f}, "
+                             f"P(upside) {monte_carlo.get('prob_upside', 0)*100:.0f}%")
+            sensitivities = (dcf.get("sensitivities") or {}).get("pwv")
+            if sensitivities:
+                lines.append("    Sensitivities (PWV per share, per +1pp of each input):")
+                for name, label in SENSITIVITY_LABELS:
+                    value = sensitivities['inputs'][name]
+                    partial = sensitivities['partials'][name]
+                    lines.append(f"      {label} ({value*100:.2f}%): {partial * 0.01:+.2f}")
+                lines.append(f"      Net debt (+100): {sensitivities['partials']['net_debt'] * 100:+.2f}")
 
         # Comps
         comps = result.get("comps", {})
@@ -873,6 +838,10 @@ class PythonValuationExecutor:
             lines.append(f"    Implied Growth: {rdcf.get('implied_growth_rate', 0)*100:.1f}%")
             lines.append(f"    Our Base Case: {rdcf.get('our_base_growth', 0)*100:.1f}%")
             lines.append(f"    Market View: {rdcf.get('market_view', 'N/A')}")
+            if rdcf.get('implied_ebit_margin') is not None:
+                lines.append(f"    Implied EBIT Margin (at our growth): {rdcf['implied_ebit_margin']*100:.1f}%")
+            if rdcf.get('implied_wacc') is not None:
+                lines.append(f"    Implied WACC (at our growth): {rdcf['implied_wacc']*100:.2f}%")
 
         # Key insights
         lines.append("")
@@ -920,5 +889,14 @@ def get_executor(node_config: NodeConfig, api_keys: Dict[str, str], context: Dic
     except ImportError:
         pass  # AgentExecutor not available, fall through to default
 
+    # Nodes listed in context["batch_nodes"] go through the batch collector when one is set
+    context = context or {}
+    batch_collector = None
+    if node_config.id in context.get("batch_nodes", []):
+        batch_collector = context.get("batch_collector")
+
+    # Output budget from the YAML (fixed or learned from saved results)
+    max_tokens = resolve_max_tokens(node_config, context.get("history_dir", "context"))
+
     # Default to AI-based executor
-    return NodeExecutor(node_config, api_keys)
+    return NodeExecutor(node_config, api_keys, batch_collector, max_tokens)
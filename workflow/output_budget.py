@@ -0,0 +1,106 @@
+"""
+Output Budget - Per-node max_tokens budgets for workflow nodes
+
+Every provider call used to ask for 4096 output tokens. That reservation is
+what the rate limiters hold against the TPM budget, and it lets short
+verdict nodes (Data Checkpoint, Pre-Model Validator, ...) ramble, so both
+throughput and tail latency suffer.
+
+Nodes can set an output budget in the YAML node config:
+
+    config:
+      provider: openai
+      max_tokens: 1024      # fixed budget
+      max_tokens: auto      # learned from previous runs
+
+"auto" takes the p95 of the node's output_length over the node_complete
+events in saved *_workflow_result.json files, converts it to tokens and adds
+headroom. Nodes without enough history fall back to the provider default.
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .workflow_loader import NodeConfig
+
+
+CHARS_PER_TOKEN = 4           # same heuristic as agents.ai_providers.estimate_tokens
+BUDGET_PERCENTILE = 95        # percentile of historical output length to cover
+BUDGET_HEADROOM = 1.5         # multiplier over the percentile so outputs are not cut off
+MIN_OUTPUT_BUDGET = 512       # never learn a budget below this
+MAX_OUTPUT_BUDGET = 4096      # never learn a budget above the provider default
+MIN_HISTORY_SAMPLES = 5       # runs needed before a learned budget is trusted
+
+# Learned budgets per history directory (computed once per process)
+_learned_budgets: Dict[str, Dict[str, int]] = {}
+
+
+def load_output_lengths(history_dir: str = "context") -> Dict[str, List[int]]:
+    """Collect output_length per node from saved workflow results"""
+    lengths: Dict[str, List[int]] = {}
+    for result_file in Path(history_dir).glob("*_workflow_result.json"):
+        try:
+            with open(result_file, 'r', encoding='utf-8') as f:
+                execution_log = json.load(f).get("execution_log", [])
+        except (OSError, ValueError):
+            continue
+
+        for entry in execution_log:
+            if entry.get("event") != "node_complete":
+                continue
+            details = entry.get("details") or {}
+            output_length = details.get("output_length")
+            # Rejected/error outputs are short and would drag the budget down
+            if output_length and not details.get("is_error"):
+                lengths.setdefault(entry.get("node_id", ""), []).append(output_length)
+    return lengths
+
+
+def _percentile(values: List[int], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(math.ceil(pct / 100 * len(ordered))) - 1)
+    return ordered[max(0, index)]
+
+
+def learn_output_budgets(history_dir: str = "context",
+                         percentile: float = BUDGET_PERCENTILE) -> Dict[str, int]:
+    """Learn a max_tokens budget for every node with enough history"""
+    budgets = {}
+    for node_id, lengths in load_output_lengths(history_dir).items():
+        if len(lengths) < MIN_HISTORY_SAMPLES:
+            continue
+        tokens = _percentile(lengths, percentile) / CHARS_PER_TOKEN * BUDGET_HEADROOM
+        budgets[node_id] = int(min(MAX_OUTPUT_BUDGET, max(MIN_OUTPUT_BUDGET, math.ceil(tokens))))
+    return budgets
+
+
+def get_learned_budgets(history_dir: str = "context") -> Dict[str, int]:
+    """Learned budgets for a history directory (cached for the process)"""
+    key = str(Path(history_dir).resolve())
+    if key not in _learned_budgets:
+        _learned_budgets[key] = learn_output_budgets(history_dir)
+    return _learned_budgets[key]
+
+
+def resolve_max_tokens(node_config: NodeConfig, history_dir: str = "context") -> Optional[int]:
+    """
+    Output budget for a node: the YAML value, a learned one for "auto",
+    or None to use the provider default.
+    """
+    budget = node_config.max_tokens
+    if budget is None:
+        return None
+
+    if isinstance(budget, str) and budget.strip().lower() == "auto":
+        learned = get_learned_budgets(history_dir).get(node_config.id)
+        if learned is None:
+            print(f"  [OutputBudget] {node_config.id}: not enough history, using provider default")
+        return learned
+
+    try:
+        return max(1, int(budget))
+    except (TypeError, ValueError):
+        print(f"  [OutputBudget] {node_config.id}: invalid max_tokens {budget!r}, using provider default")
+        return None
@@ -32,6 +32,11 @@ class NodeConfig:
     def role(self) -> str:
         return self.config.get("role", "")
 
+    @property
+    def max_tokens(self) -> Any:
+        """Output budget: an int, "auto" (learned from history) or None for the provider default"""
+        return self.config.get("max_tokens")
+
     @property
     def api_key_var(self) -> str:
         """Get the API key variable name"""